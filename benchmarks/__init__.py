@@ -0,0 +1,7 @@
+"""
+DomainBench self-benchmarks - throughput, peak memory and per-stage time of the framework itself
+
+Run from the repository root:
+    python -m benchmarks                     # 1k cases per stage
+    python -m benchmarks --sizes 1000 100000 1000000
+"""
@@ -0,0 +1,8 @@
+"""
+Run the self-benchmark suite: python -m benchmarks --help
+"""
+
+from benchmarks.suite import main
+
+
+main()
@@ -0,0 +1,293 @@
+"""
+Self-benchmark suite - times each pipeline stage against the simulated provider
+
+Each benchmark runs in a fresh process so its peak RSS is its own. Results
+are appended to a JSON history file and compared with the median of the
+previous runs; a stage whose throughput drops (or whose peak RSS grows) by
+more than the threshold is flagged as a regression.
+"""
+
+import argparse
+import copy
+import json
+import multiprocessing
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+DEFAULT_SIZES = [1000]
+DEFAULT_HISTORY = str(Path(__file__).parent / "history.json")
+DEFAULT_THRESHOLD = 0.10  # Flag changes worse than 10%
+DEFAULT_WINDOW = 5  # Compare with the median of this many previous runs
+
+# Cases in flight for the engine benchmark (async, instant simulated replies)
+ENGINE_CONCURRENCY = 100
+
+
+def _write_dataset(path: Path, size: int) -> None:
+    from domainbench.domains.builtin.restaurant_waiter import generate_test_cases
+    
+    with open(path, "w", encoding="utf-8") as f:
+        for item in generate_test_cases(size, 42):
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+def bench_generate(size: int, workdir: Path) -> float:
+    """generate_test_cases: build `size` restaurant_waiter cases in memory"""
+    from domainbench.domains.builtin.restaurant_waiter import generate_test_cases
+    
+    started = time.perf_counter()
+    generate_test_cases(size, 42)
+    return time.perf_counter() - started
+
+
+def bench_load(size: int, workdir: Path) -> float:
+    """load_dataset: parse a `size`-case JSONL file"""
+    from domainbench.domains.loader import load_dataset
+    
+    path = workdir / "dataset.jsonl"
+    _write_dataset(path, size)
+    started = time.perf_counter()
+    load_dataset(str(path))
+    return time.perf_counter() - started
+
+
+def bench_judge(size: int, workdir: Path) -> float:
+    """JudgeEvaluator.evaluate_pair: `size` swap-judged pairs (prompt building, verdict parsing)"""
+    from domainbench.core.evaluator import JudgeEvaluator
+    from domainbench.domains.builtin.restaurant_waiter import generate_test_cases
+    from domainbench.providers.simulated_provider import SimulatedProvider
+    
+    evaluator = JudgeEvaluator(SimulatedProvider(), "judge", strategy="swap")
+    cases = generate_test_cases(min(size, 1000), 42)
+    started = time.perf_counter()
+    for i in range(size):
+        turns = cases[i % len(cases)]["turns"]
+        evaluator.evaluate_pair(turns, f"Response A to case {i}", f"Response B to case {i}")
+    seconds = time.perf_counter() - started
+    evaluator.close()
+    return seconds
+
+
+def bench_engine(size: int, workdir: Path) -> float:
+    """BenchmarkEngine.run: `size` cases, two simulated models and a simulated judge"""
+    from domainbench.core.engine import BenchmarkEngine
+    from domainbench.testing.loadtest import load_test_config
+    
+    path = workdir / "dataset.jsonl"
+    _write_dataset(path, size)
+    engine = BenchmarkEngine(load_test_config(ENGINE_CONCURRENCY, str(workdir / "results")))
+    started = time.perf_counter()
+    engine.run(str(path), verbose=False)
+    return time.perf_counter() - started
+
+
+def bench_report(size: int, workdir: Path) -> float:
+    """Reporter.save: `size` detailed results as JSON, JSONL and Markdown"""
+    from domainbench.core.engine import BenchmarkEngine
+    from domainbench.core.reporter import Reporter
+    from domainbench.testing.loadtest import load_test_config
+    
+    # Real results from a small run, repeated up to size
+    path = workdir / "dataset.jsonl"
+    _write_dataset(path, min(size, 100))
+    config = load_test_config(ENGINE_CONCURRENCY, str(workdir / "results"))
+    config.output.keep_results_in_memory = True
+    config.output.checkpoint = False
+    engine = BenchmarkEngine(config)
+    engine.run(str(path), verbose=False)
+    results = engine.get_full_results()
+    template = results["detailed_results"]
+    detailed = []
+    for i in range(size):
+        result = copy.copy(template[i % len(template)])
+        result["test_case_id"] = f"case_{i}"
+        detailed.append(result)
+    results["detailed_results"] = detailed
+    
+    reporter = Reporter(config.output)
+    started = time.perf_counter()
+    reporter.save(results, formats=["json", "jsonl", "markdown"], base_name="report")
+    return time.perf_counter() - started
+
+
+BENCHMARKS: Dict[str, Callable[[int, Path], float]] = {
+    "generate": bench_generate,
+    "load": bench_load,
+    "judge": bench_judge,
+    "engine": bench_engine,
+    "report": bench_report,
+}
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _run_one(name: str, size: int) -> Dict[str, Any]:
+    """Run one benchmark (in a child process) and measure it"""
+    with tempfile.TemporaryDirectory(prefix=f"domainbench-bench-{name}-") as workdir:
+        seconds = BENCHMARKS[name](size, Path(workdir))
+    return {
+        "items": size,
+        "seconds": round(seconds, 4),
+        "items_per_sec": round(size / seconds, 2) if seconds else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_suite(names: List[str], sizes: List[int], log=None) -> Dict[str, Dict[str, Any]]:
+    """
+    Run each benchmark at each size in its own process.
+    
+    Returns:
+        Dict mapping "name@size" to items, seconds, items_per_sec and peak_rss_mb
+    """
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for size in sizes:
+        for name in names:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(_run_one, name, size).result()
+            results[f"{name}@{size}"] = result
+            if log is not None:
+                log(f"{name}@{size}", result)
+    return results
+
+
+def find_regressions(
+    history: List[Dict[str, Any]],
+    results: Dict[str, Dict[str, Any]],
+    threshold: float = DEFAULT_THRESHOLD,
+    window: int = DEFAULT_WINDOW,
+) -> List[Dict[str, Any]]:
+    """
+    Compare results with the median of the last `window` history runs.
+    
+    Returns:
+        One entry per regressed metric with key, metric, baseline, value and change
+    """
+    regressions = []
+    for key, result in results.items():
+        previous = [run["results"][key] for run in history if key in run.get("results", {})]
+        previous = previous[-window:]
+        if not previous:
+            continue
+        
+        # (metric, sign): +1 where higher is better, -1 where lower is better
+        for metric, sign in (("items_per_sec", 1), ("peak_rss_mb", -1)):
+            values = [entry[metric] for entry in previous if entry.get(metric)]
+            value = result.get(metric)
+            if not values or not value:
+                continue
+            baseline = statistics.median(values)
+            change = (value - baseline) / baseline
+            if sign * change < -threshold:
+                regressions.append({
+                    "key": key,
+                    "metric": metric,
+                    "baseline": baseline,
+                    "value": value,
+                    "change": round(change, 4),
+                })
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).parent, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    if not Path(path).exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("runs", [])
+
+
+def save_history(path: str, runs: List[Dict[str, Any]]) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"runs": runs}, f, indent=2)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from domainbench import __version__
+    
+    parser = argparse.ArgumentParser(description="Benchmark DomainBench's own pipeline stages")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+        help="Dataset sizes to run each stage at (e.g. 1000 100000 1000000)",
+    )
+    parser.add_argument(
+        "--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS),
+        help="Stages to run",
+    )
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON history file")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="Relative change that counts as a regression",
+    )
+    parser.add_argument(
+        "--window", type=int, default=DEFAULT_WINDOW,
+        help="Previous runs whose median is the baseline",
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="Do not append this run to the history"
+    )
+    args = parser.parse_args(argv)
+    
+    def log(key: str, result: Dict[str, Any]) -> None:
+        print(
+            f"{key:<20} {result['seconds']:>10.3f}s {result['items_per_sec'] or 0:>14,.1f} items/s "
+            f"{result['peak_rss_mb'] or 0:>9.1f} MB peak"
+        )
+    
+    results = run_suite(args.only, args.sizes, log=log)
+    history = load_history(args.history)
+    regressions = find_regressions(history, results, threshold=args.threshold, window=args.window)
+    
+    if not args.no_save:
+        history.append({
+            "timestamp": datetime.now().isoformat(),
+            "version": __version__,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+            "regressions": regressions,
+        })
+        save_history(args.history, history)
+    
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for entry in regressions:
+            print(
+                f"  {entry['key']} {entry['metric']}: {entry['baseline']:,.1f} -> "
+                f"{entry['value']:,.1f} ({entry['change']:+.1%})"
+            )
+        sys.exit(1)
+    print("\nNo regressions")
@@ -22,8 +22,8 @@ def run(
         None, "--config", "-c",
         help="Path to benchmark configuration YAML file"
     ),
-    dataset: Path = typer.Option(
-        ..., "--dataset", "-d",
+    dataset: Optional[Path] = typer.Option(
+        None, "--dataset", "-d",
         help="Path to dataset JSONL file"
     ),
     domain: str = typer.Option(
@@ -42,16 +42,102 @@ def run(
         None, "--max-items",
         help="Maximum number of test cases to run"
     ),
+    offset: Optional[int] = typer.Option(
+        None, "--offset",
+        help="Skip this many leading test cases"
+    ),
+    shard: Optional[str] = typer.Option(
+        None, "--shard",
+        help="Run only shard i of N (format: i/N, 0-based) of the dataset"
+    ),
+    index_dir: Optional[Path] = typer.Option(
+        None, "--index-dir",
+        help="Persist the dataset's line-count index in this directory (default: memory only)"
+    ),
     judge_model: str = typer.Option(
         "gpt-4o", "--judge",
         help="Model to use as judge"
     ),
+    judge_strategy: Optional[str] = typer.Option(
+        None, "--judge-strategy",
+        help="How both judge orderings are run: swap (two calls), concurrent or single (one call)"
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w",
+        help="Run test cases in parallel with this many workers"
+    ),
+    max_retries: Optional[int] = typer.Option(
+        None, "--max-retries",
+        help="Retries per provider call on transient errors (429/5xx/timeouts)"
+    ),
+    stream: bool = typer.Option(
+        False, "--stream",
+        help="Stream candidate responses to measure time-to-first-token and inter-token latency"
+    ),
+    use_async: bool = typer.Option(
+        False, "--async",
+        help="Drive providers through their asyncio clients (--workers sets cases in flight)"
+    ),
+    cache: Optional[bool] = typer.Option(
+        None, "--cache/--no-cache",
+        help="Reuse cached model completions and judge verdicts from earlier runs"
+    ),
+    cache_read_only: bool = typer.Option(
+        False, "--cache-read-only",
+        help="Serve cache hits but never write to the cache (e.g. in CI)"
+    ),
+    pairing: Optional[str] = typer.Option(
+        None, "--pairing",
+        help="Which model pairs to judge: round_robin (all pairs) or sampled"
+    ),
+    pairs_per_case: Optional[int] = typer.Option(
+        None, "--pairs-per-case",
+        help="Pairs judged per test case with --pairing sampled"
+    ),
+    adaptive: bool = typer.Option(
+        False, "--adaptive",
+        help="Stop judging a model pair once its win rate is settled at --confidence"
+    ),
+    confidence: Optional[float] = typer.Option(
+        None, "--confidence",
+        help="Confidence level for --adaptive (default 0.95)"
+    ),
+    batch: bool = typer.Option(
+        False, "--batch",
+        help="Submit generations and judge prompts through the providers' batch APIs"
+    ),
+    budget: Optional[float] = typer.Option(
+        None, "--budget",
+        help="Spending cap in USD: stop scheduling test cases once projected cost would exceed it"
+    ),
+    store: Optional[Path] = typer.Option(
+        None, "--store",
+        help="Also record the run in this SQLite result store"
+    ),
+    trace: Optional[Path] = typer.Option(
+        None, "--trace",
+        help="Write per-stage spans to this Chrome-trace JSON file (open in ui.perfetto.dev)"
+    ),
+    otlp_endpoint: Optional[str] = typer.Option(
+        None, "--otlp-endpoint",
+        help="Also send spans to an OpenTelemetry collector (e.g. http://localhost:4318/v1/traces)"
+    ),
+    resume: Optional[Path] = typer.Option(
+        None, "--resume",
+        help="Resume an interrupted run from its checkpoint directory"
+    ),
+    plan: bool = typer.Option(
+        False, "--plan",
+        help="Project calls, tokens, cost and wall time without calling any provider, then exit"
+    ),
 ):
     """
     Run a benchmark comparing LLM models.
     
     Example:
         domainbench run -d waiterbench.jsonl -m openai/gpt-4o -m gemini/gemini-2.0-flash
+        domainbench run --resume results/runs/20250101_120000_1a2b3c4d
+        domainbench run -c config.yaml -d waiterbench.jsonl --plan
     """
     from dotenv import load_dotenv
     load_dotenv()
@@ -60,58 +146,135 @@ def run(
         BenchmarkConfig, ModelConfig, JudgeConfig, 
         BenchmarkSettings, OutputConfig, ProviderType
     )
+    from domainbench.core.checkpoint import CheckpointJournal, CheckpointMismatchError
     from domainbench.core.engine import BenchmarkEngine
     from domainbench.domains import load_domain
+    from domainbench.domains.loader import parse_shard
     
-    # Build config from options or load from file
-    if config and config.exists():
-        bench_config = BenchmarkConfig.from_yaml(str(config))
-    else:
-        # Parse model specs
-        if not models or len(models) < 2:
-            console.print("[red]Error: At least 2 models required for comparison[/red]")
-            console.print("Use: -m provider/model -m provider/model")
+    if resume is not None:
+        # Command-line overrides apply on top of this config before the resume is validated
+        try:
+            manifest = CheckpointJournal(str(resume)).read_manifest()
+            if config and config.exists():
+                bench_config = BenchmarkConfig.from_yaml(str(config))
+            else:
+                bench_config = BenchmarkConfig(**manifest["config"])
+        except ValueError as e:
+            console.print(f"[red]Cannot resume: {e}[/red]")
             raise typer.Exit(1)
-        
-        model_configs = []
-        for model_spec in models:
-            parts = model_spec.split("/", 1)
-            if len(parts) != 2:
-                console.print(f"[red]Invalid model spec: {model_spec}[/red]")
-                console.print("Expected format: provider/model (e.g., openai/gpt-4o)")
+        dataset = dataset or Path(manifest["dataset_path"])
+    elif dataset is None:
+        console.print("[red]Error: --dataset is required unless resuming with --resume[/red]")
+        raise typer.Exit(1)
+    else:
+        # Build config from options or load from file
+        if config and config.exists():
+            bench_config = BenchmarkConfig.from_yaml(str(config))
+        else:
+            # Parse model specs
+            if not models or len(models) < 2:
+                console.print("[red]Error: At least 2 models required for comparison[/red]")
+                console.print("Use: -m provider/model -m provider/model [-m provider/model ...]")
                 raise typer.Exit(1)
             
-            provider_str, model_name = parts
+            model_configs = []
+            for model_spec in models:
+                parts = model_spec.split("/", 1)
+                if len(parts) != 2:
+                    console.print(f"[red]Invalid model spec: {model_spec}[/red]")
+                    console.print("Expected format: provider/model (e.g., openai/gpt-4o)")
+                    raise typer.Exit(1)
+                
+                provider_str, model_name = parts
+                try:
+                    provider = ProviderType(provider_str.lower())
+                except ValueError:
+                    console.print(f"[red]Unknown provider: {provider_str}[/red]")
+                    console.print(f"Available: {[p.value for p in ProviderType]}")
+                    raise typer.Exit(1)
+                
+                model_configs.append(ModelConfig(
+                    provider=provider,
+                    model=model_name,
+                    alias=f"{provider_str}/{model_name}",
+                ))
+            
+            # Load domain
             try:
-                provider = ProviderType(provider_str.lower())
-            except ValueError:
-                console.print(f"[red]Unknown provider: {provider_str}[/red]")
-                console.print(f"Available: {[p.value for p in ProviderType]}")
+                domain_config = load_domain(domain)
+            except ValueError as e:
+                console.print(f"[red]Error loading domain: {e}[/red]")
                 raise typer.Exit(1)
             
-            model_configs.append(ModelConfig(
-                provider=provider,
-                model=model_name,
-                alias=f"{provider_str}/{model_name}",
-            ))
+            # Build benchmark config
+            bench_config = BenchmarkConfig(
+                name=f"Benchmark: {' vs '.join([m.display_name for m in model_configs])}",
+                models=model_configs,
+                domain=domain,
+                domain_config=domain_config,
+                judge=JudgeConfig(model=judge_model),
+                settings=BenchmarkSettings(max_items=max_items),
+                output=OutputConfig(directory=str(output)),
+            )
         
-        # Load domain
+    if judge_strategy is not None:
+        bench_config.judge.strategy = judge_strategy
+    if workers is not None:
+        bench_config.settings.parallel_execution = workers > 1
+        bench_config.settings.max_workers = max(1, workers)
+    if use_async:
+        bench_config.settings.async_execution = True
+    if stream:
+        bench_config.settings.stream = True
+    if max_retries is not None:
+        bench_config.settings.retry.max_retries = max_retries
+    if pairing is not None:
+        bench_config.settings.pairing = pairing
+    if pairs_per_case is not None:
+        bench_config.settings.pairs_per_case = pairs_per_case
+    if offset is not None:
+        bench_config.settings.offset = offset
+    if shard is not None:
         try:
-            domain_config = load_domain(domain)
+            parse_shard(shard)
         except ValueError as e:
-            console.print(f"[red]Error loading domain: {e}[/red]")
+            console.print(f"[red]Error: {e}[/red]")
             raise typer.Exit(1)
-        
-        # Build benchmark config
-        bench_config = BenchmarkConfig(
-            name=f"Benchmark: {' vs '.join([m.display_name for m in model_configs])}",
-            models=model_configs,
-            domain=domain,
-            domain_config=domain_config,
-            judge=JudgeConfig(model=judge_model),
-            settings=BenchmarkSettings(max_items=max_items),
-            output=OutputConfig(directory=str(output)),
-        )
+        bench_config.settings.shard = shard
+    if index_dir is not None:
+        bench_config.settings.index_dir = str(index_dir)
+    if batch:
+        bench_config.settings.batch.enabled = True
+    if adaptive:
+        bench_config.settings.adaptive.enabled = True
+    if confidence is not None:
+        bench_config.settings.adaptive.confidence = confidence
+    if budget is not None:
+        bench_config.settings.budget = budget
+    if store is not None:
+        bench_config.output.store = str(store)
+    if trace is not None:
+        bench_config.tracing.chrome_trace = str(trace)
+    if otlp_endpoint is not None:
+        bench_config.tracing.otlp_endpoint = otlp_endpoint
+    if "keep_results_in_memory" not in bench_config.output.model_fields_set:
+        # The CLI only needs the streamed files, so large runs stay in constant memory
+        bench_config.output.keep_results_in_memory = False
+    if cache is not None:
+        bench_config.cache.enabled = cache
+        bench_config.cache.judge = cache
+    if cache_read_only:
+        bench_config.cache.enabled = True
+        bench_config.cache.judge = True
+        bench_config.cache.read_only = True
+    
+    if plan:
+        try:
+            _print_plan(bench_config, dataset)
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+        return
     
     # Create and run engine
     console.print(f"\n[bold]Starting benchmark...[/bold]")
@@ -120,17 +283,28 @@ def run(
     console.print(f"Models: {', '.join([m.display_name for m in bench_config.models])}")
     console.print(f"Judge: {bench_config.judge.model}\n")
     
-    engine = BenchmarkEngine(bench_config)
+    if resume is not None:
+        engine, _ = BenchmarkEngine.from_checkpoint(str(resume), config=bench_config)
+    else:
+        engine = BenchmarkEngine(bench_config)
     
     try:
         results = engine.run(str(dataset), verbose=True)
         
-        # Save results
-        output_path = engine.save_results()
-        console.print(f"\n[green]Results saved to: {output_path}[/green]")
+        # Results are streamed to the output formats during the run
+        output_paths = engine.output_paths or [engine.save_results()]
+        console.print()
+        for output_path in output_paths:
+            console.print(f"[green]Results saved to: {output_path}[/green]")
         
+    except CheckpointMismatchError as e:
+        console.print(f"\n[red]Cannot resume: {e}[/red]")
+        raise typer.Exit(1)
     except Exception as e:
         console.print(f"\n[red]Benchmark failed: {e}[/red]")
+        if engine.run_dir:
+            console.print("Completed results are checkpointed. Resume with:")
+            console.print(f"  domainbench run --resume {engine.run_dir}")
         raise typer.Exit(1)
 
 
@@ -184,6 +358,131 @@ def generate(
     console.print(f"\n[green]Generated {len(items)} test cases to: {output}[/green]")
 
 
+@app.command("mock-server")
+def mock_server(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to listen on"),
+    port: int = typer.Option(8089, "--port", "-p", help="Port to listen on"),
+    latency: Optional[List[str]] = typer.Option(
+        None, "--latency", "-l",
+        help="Reply latency as SPEC or MODEL=SPEC, where SPEC is 0.5, uniform:LOW,HIGH, "
+             "normal:MEAN,STD, lognormal:MEDIAN,SIGMA or exponential:MEAN (seconds)"
+    ),
+    seed: int = typer.Option(0, "--seed", "-s", help="Seed for sampled latencies"),
+    first_token_delay: float = typer.Option(
+        0.0, "--first-token-delay",
+        help="Seconds before a stream's first piece"
+    ),
+    token_delay: float = typer.Option(0.0, "--token-delay", help="Seconds between streamed pieces"),
+    batch_delay: float = typer.Option(
+        5.0, "--batch-delay",
+        help="Seconds until a submitted batch ends"
+    ),
+):
+    """
+    Serve a local stand-in for the OpenAI, Anthropic and OpenAI-compatible APIs.
+    
+    Replies are deterministic and need no API keys, so runs can be
+    benchmarked fully offline.
+    
+    Example:
+        domainbench mock-server --latency lognormal:0.8,0.5 --latency custom-fast=0.1
+    """
+    from domainbench.testing.mock_server import MockLLMServer, parse_latency_options, serve
+    
+    try:
+        latency_specs = parse_latency_options(latency or [])
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    
+    serve(MockLLMServer(
+        host=host,
+        port=port,
+        batch_delay=batch_delay,
+        first_token_delay=first_token_delay,
+        token_delay=token_delay,
+        latency=latency_specs,
+        seed=seed,
+    ))
+
+
+@app.command()
+def loadtest(
+    dataset: Optional[Path] = typer.Option(
+        None, "--dataset", "-d",
+        help="Dataset JSONL file (default: generated restaurant_waiter cases)"
+    ),
+    count: int = typer.Option(
+        1000, "--count", "-n",
+        help="Test cases to generate when no dataset is given"
+    ),
+    concurrency: Optional[List[int]] = typer.Option(
+        None, "--concurrency", "-c",
+        help="Cases in flight per level (repeatable, default: 1 10 100 1000)"
+    ),
+    profile: str = typer.Option(
+        "instant", "--profile", "-p",
+        help="Simulated profile: instant, fast, typical, slow or flaky, plus key=value overrides"
+    ),
+    models: int = typer.Option(2, "--models", "-m", help="Number of simulated candidate models"),
+    mode: str = typer.Option(
+        "async", "--mode",
+        help="async (one event loop) or threads (worker pool)"
+    ),
+    judge_strategy: str = typer.Option(
+        "swap", "--judge-strategy",
+        help="swap, concurrent or single"
+    ),
+):
+    """
+    Measure the cases/sec the engine sustains against a simulated provider.
+    
+    No network calls are made, so the results show the framework's own
+    overhead at each concurrency level.
+    
+    Example:
+        domainbench loadtest -n 5000 -c 1 -c 10 -c 100 -c 1000 --profile fast
+    """
+    from rich.table import Table
+    from domainbench.testing.loadtest import DEFAULT_CONCURRENCY, run_load_test
+    
+    levels = concurrency or list(DEFAULT_CONCURRENCY)
+    console.print(
+        f"\n[bold]Load test[/bold]: {models} simulated models, profile {profile}, {mode} mode"
+    )
+    
+    table = Table(title="Engine throughput")
+    table.add_column("Concurrency", justify="right")
+    table.add_column("Cases", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Cases/sec", justify="right", style="green")
+    table.add_column("CPU ms/case", justify="right")
+    table.add_column("Retries", justify="right")
+    
+    def log(row):
+        console.print(f"  concurrency {row['concurrency']}: {row['cases_per_sec']} cases/sec")
+        table.add_row(
+            str(row["concurrency"]), str(row["cases"]), f"{row['seconds']:.2f}",
+            f"{row['cases_per_sec']:,.1f}", f"{row['cpu_ms_per_case']:.2f}", str(row["retries"]),
+        )
+    
+    try:
+        run_load_test(
+            dataset_path=str(dataset) if dataset else None,
+            cases=count,
+            concurrency=levels,
+            profile=profile,
+            models=models,
+            mode=mode,
+            judge_strategy=judge_strategy,
+            log=log,
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    console.print(table)
+
+
 @app.command()
 def domains():
     """
@@ -223,9 +522,10 @@ def capabilities():
 
 @app.command()
 def compare(
-    results: List[Path] = typer.Argument(
-        ...,
-        help="Result JSON files to compare"
+    results: Optional[List[Path]] = typer.Argument(
+        None,
+        help="Result JSON files to compare (JSONL too with --store, which defaults to the "
+             "latest runs)"
     ),
     output: Optional[Path] = typer.Option(
         None, "--output", "-o",
@@ -235,24 +535,53 @@ def compare(
         "table", "--format", "-f",
         help="Output format: table, json, markdown"
     ),
+    store: Optional[Path] = typer.Option(
+        None, "--store",
+        help="Index the files in this SQLite result store and read summaries from it"
+    ),
+    last: int = typer.Option(
+        10, "--last",
+        help="Number of latest stored runs to compare when no files are given"
+    ),
+    name: Optional[str] = typer.Option(
+        None, "--name",
+        help="Only stored runs of this benchmark name"
+    ),
 ):
     """
     Compare benchmark results.
     
     Example:
         domainbench compare results1.json results2.json
+        domainbench compare results/*.jsonl --store results/domainbench.db
+        domainbench compare --store results/domainbench.db --last 5
     """
     import json
     from rich.table import Table
     
-    all_results = []
-    for result_path in results:
+    for result_path in results or []:
         if not result_path.exists():
             console.print(f"[red]File not found: {result_path}[/red]")
             raise typer.Exit(1)
+    
+    if store is not None:
+        from domainbench.core.store import ResultStore
         
-        with open(result_path, 'r', encoding='utf-8') as f:
-            all_results.append(json.load(f))
+        # Only new or changed files are parsed; summaries come from the index
+        with ResultStore(str(store)) as result_store:
+            if results:
+                run_ids = [_ingest_result(result_store, result_path) for result_path in results]
+            else:
+                run_ids = [run["id"] for run in reversed(result_store.runs(name=name, last=last))]
+            all_results = result_store.summaries(run_ids)
+    elif results:
+        all_results = []
+        for result_path in results:
+            with open(result_path, 'r', encoding='utf-8') as f:
+                all_results.append(json.load(f))
+    else:
+        console.print("[red]Error: give result files or --store[/red]")
+        raise typer.Exit(1)
     
     if format == "table":
         table = Table(title="Benchmark Comparison")
@@ -290,6 +619,187 @@ def compare(
             console.print(json.dumps(comparison, indent=2))
 
 
+@app.command()
+def ingest(
+    results: List[Path] = typer.Argument(
+        ...,
+        help="Result JSON/JSONL files to index"
+    ),
+    store: Path = typer.Option(
+        Path("results/domainbench.db"), "--store",
+        help="SQLite result store"
+    ),
+):
+    """
+    Index result files in the result store.
+    
+    Files already indexed and unchanged are skipped.
+    
+    Example:
+        domainbench ingest results/results_*.jsonl
+    """
+    from domainbench.core.store import ResultStore
+    
+    added = 0
+    with ResultStore(str(store)) as result_store:
+        for result_path in results:
+            if not result_path.exists():
+                console.print(f"[red]File not found: {result_path}[/red]")
+                raise typer.Exit(1)
+            if result_store.ingest(str(result_path)) is not None:
+                added += 1
+    
+    unchanged = len(results) - added
+    console.print(
+        f"[green]Indexed {added} new result files ({unchanged} unchanged) in {store}[/green]"
+    )
+
+
+@app.command()
+def history(
+    model: str = typer.Argument(
+        ...,
+        help="Model display name (e.g. openai/gpt-4o)"
+    ),
+    category: Optional[str] = typer.Option(
+        None, "--category",
+        help="Only test cases of this category"
+    ),
+    capability: Optional[str] = typer.Option(
+        None, "--capability",
+        help="Only results of this capability"
+    ),
+    last: int = typer.Option(
+        30, "--last",
+        help="Number of latest runs including the model"
+    ),
+    name: Optional[str] = typer.Option(
+        None, "--name",
+        help="Only runs of this benchmark name"
+    ),
+    store: Path = typer.Option(
+        Path("results/domainbench.db"), "--store",
+        help="SQLite result store"
+    ),
+):
+    """
+    Show a model's win rate across stored runs.
+    
+    Example:
+        domainbench history openai/gpt-4o --category allergy_safety --last 30
+    """
+    from rich.table import Table
+    from domainbench.core.store import ResultStore
+    
+    if not store.exists():
+        console.print(f"[red]Result store not found: {store}[/red]")
+        console.print("Record runs with `domainbench run --store` or `domainbench ingest`")
+        raise typer.Exit(1)
+    
+    with ResultStore(str(store)) as result_store:
+        rows = result_store.model_history(
+            model, category=category, capability=capability, name=name, last=last
+        )
+    
+    if not rows:
+        console.print(f"[yellow]No stored results for {model}[/yellow]")
+        return
+    
+    scope = " / ".join(filter(None, [category, capability])) or "all"
+    table = Table(title=f"{model} ({scope}, last {len(rows)} runs)")
+    table.add_column("Run", style="cyan")
+    table.add_column("Timestamp")
+    table.add_column("Wins", justify="right")
+    table.add_column("Ties", justify="right")
+    table.add_column("Losses", justify="right")
+    table.add_column("Win Rate", justify="right", style="green")
+    
+    for row in rows:
+        table.add_row(
+            row["name"] or "Unknown",
+            row["timestamp"] or "",
+            str(row["wins"]),
+            str(row["ties"]),
+            str(row["losses"]),
+            f"{row['win_rate']:.1%}" if row["win_rate"] is not None else "-",
+        )
+    
+    wins = sum(row["wins"] for row in rows)
+    ties = sum(row["ties"] for row in rows)
+    losses = sum(row["losses"] for row in rows)
+    total = wins + ties + losses
+    overall = f"{(wins + ties / 2) / total:.1%}" if total else "-"
+    table.add_row(
+        "[bold]Total[/bold]", "", str(wins), str(ties), str(losses), f"[bold]{overall}[/bold]"
+    )
+    
+    console.print(table)
+
+
+def _print_plan(bench_config, dataset: Path) -> None:
+    """Print the projected calls, tokens, cost and wall time of a run"""
+    from rich.table import Table
+    from domainbench.core.planner import plan_run
+    from domainbench.core.store import DEFAULT_STORE_PATH, ResultStore
+    
+    # Mean latencies from earlier runs, when a result store exists
+    history = {}
+    store_path = Path(bench_config.output.store or DEFAULT_STORE_PATH)
+    if store_path.exists():
+        names = [m.display_name for m in bench_config.models]
+        names.append(f"{bench_config.judge.provider.value}/{bench_config.judge.model}")
+        with ResultStore(str(store_path)) as result_store:
+            history = result_store.latency_by_model(names)
+    
+    projection = plan_run(bench_config, str(dataset), history=history)
+    
+    table = Table(title=f"Plan: {projection['cases']} test cases")
+    table.add_column("Role", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Prompt tokens", justify="right")
+    table.add_column("Completion tokens", justify="right")
+    table.add_column("Cost", justify="right", style="green")
+    table.add_column("Latency/call", justify="right")
+    
+    judge_role = f"Judge ({projection['judge']['strategy']})"
+    roles = [*projection["models"].items(), (judge_role, projection["judge"])]
+    for role, entry in roles:
+        table.add_row(
+            role,
+            f"{entry['calls']:,}",
+            f"{entry['prompt_tokens']:,}",
+            f"{entry['completion_tokens']:,}",
+            f"${entry['cost_usd']:.2f}" if entry["cost_usd"] is not None else "-",
+            f"{entry['latency_ms']:,} ms ({entry['latency_source']})",
+        )
+    
+    total = projection["total"]
+    table.add_row(
+        "[bold]Total[/bold]", f"{total['calls']:,}", "", f"{total['tokens']:,} total",
+        f"[bold]${total['cost_usd']:.2f}[/bold]", "",
+    )
+    console.print(table)
+    
+    wall_time = projection["wall_time"]
+    if wall_time["seconds"] is not None:
+        hours, rest = divmod(int(wall_time["seconds"]), 3600)
+        console.print(
+            f"Wall time: ~{hours}h {rest // 60}m {rest % 60}s (bound by {wall_time['bound']}, "
+            f"{wall_time['cases_in_flight']} cases in flight)"
+        )
+    console.print(f"Prices: table {projection['price_table']}")
+    for note in projection["notes"]:
+        console.print(f"[yellow]{note}[/yellow]")
+
+
+def _ingest_result(result_store, result_path: Path) -> int:
+    """Index a result file if needed and return its run id"""
+    run_id = result_store.ingest(str(result_path))
+    if run_id is None:
+        run_id = result_store.run_for_source(str(result_path))
+    return run_id
+
+
 @app.command()
 def version():
     """
@@ -0,0 +1,308 @@
+"""
+Batch - Run generation and judging through provider batch APIs
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable, Iterator
+
+from domainbench.core.config import BatchConfig
+from domainbench.core.engine import BenchmarkEngine, BenchmarkResult
+from domainbench.core.evaluator import (
+    DEFAULT_JUDGE_ROLE,
+    build_judge_messages,
+    combine_swapped_verdicts,
+    format_conversation,
+)
+from domainbench.providers.base import BaseProvider
+
+
+BATCH_STATE_FILE = "batches.json"
+
+
+class BatchState:
+    """
+    Submitted batch IDs per phase and group.
+    
+    Saved atomically to the run directory after every submission, so a run
+    that exits while a batch is pending picks the same batch up on resume
+    instead of paying for it twice. Without a run directory it is kept in
+    memory only.
+    """
+    
+    def __init__(self, run_dir: Optional[str] = None):
+        self.path = Path(run_dir) / BATCH_STATE_FILE if run_dir else None
+        self._state: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if self.path is not None and self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._state = json.load(f)
+    
+    def get(self, phase: str, group: str) -> Optional[Dict[str, Any]]:
+        return self._state.get(phase, {}).get(group)
+    
+    def set(self, phase: str, group: str, entry: Dict[str, Any]) -> None:
+        self._state.setdefault(phase, {})[group] = entry
+        if self.path is None:
+            return
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class BatchRunner:
+    """
+    Drives a benchmark run through provider batch APIs instead of interactive calls.
+    
+    Runs in two phases. First every candidate generation is submitted, one
+    batch per model. Once those batches end, every judge prompt (both
+    orderings of each scheduled pair) goes to the judge provider as a single
+    batch. Cache hits are served locally and never submitted. Requests a
+    batch failed to answer are retried interactively, so a run always
+    completes. Results are yielded per test case in dataset order, like
+    BenchmarkEngine._execute. Unlike the interactive path, the selected
+    test cases are held in memory until the judge batch ends.
+    
+    Adaptive pairing has no effect here, since no verdict is known until
+    the judge batch ends. Judging always uses the two-ordering swap prompts,
+    whatever judge.strategy says.
+    """
+    
+    def __init__(
+        self,
+        engine: BenchmarkEngine,
+        config: Optional[BatchConfig] = None,
+        log: Optional[Callable[[str], None]] = None,
+    ):
+        self.engine = engine
+        self.config = config or BatchConfig()
+        self.log = log or (lambda message: None)
+        self.state = BatchState(engine.run_dir)
+    
+    def execute(
+        self, cases: Iterable[Tuple[int, Dict[str, Any]]]
+    ) -> Iterator[List[BenchmarkResult]]:
+        """Run both phases, then yield each test case's results in order"""
+        engine = self.engine
+        dataset = dict(cases)
+        plan = self._plan(dataset)
+        generations = self._generation_phase(dataset, plan)
+        verdicts = self._judge_phase(dataset, plan, generations)
+        
+        for idx, test_case in dataset.items():
+            case_id = str(test_case.get("id", f"case_{idx}"))
+            results = []
+            for cap_name in engine.capabilities:
+                if (case_id, cap_name) in engine._completed:
+                    results.append(BenchmarkResult(engine._completed[(case_id, cap_name)]))
+                    continue
+                
+                pairs = plan.get((idx, cap_name))
+                if not pairs:
+                    continue
+                
+                comparisons = []
+                for pair_idx, (name_a, name_b) in enumerate(pairs):
+                    j_ab = verdicts[(idx, cap_name, pair_idx, "ab")]
+                    j_ba = verdicts[(idx, cap_name, pair_idx, "ba")]
+                    engine.evaluator.stats.record("swap", j_ab, j_ba, 2)
+                    judge_result = combine_swapped_verdicts(j_ab, j_ba)
+                    comparisons.append(engine._comparison_record(name_a, name_b, judge_result))
+                
+                case_generations = {
+                    name: generations[(idx, cap_name, name)]
+                    for name in engine.scheduler.models_for(pairs)
+                }
+                result = engine._build_result(
+                    idx, test_case, cap_name, case_generations, comparisons
+                )
+                engine._checkpoint_result(result)
+                results.append(result)
+            
+            yield results
+    
+    def _plan(
+        self, dataset: Dict[int, Dict[str, Any]]
+    ) -> Dict[Tuple[int, str], List[Tuple[str, str]]]:
+        """Scheduled pairs for every (item number, capability) still to be run"""
+        engine = self.engine
+        plan = {}
+        for idx, test_case in dataset.items():
+            case_id = str(test_case.get("id", f"case_{idx}"))
+            category = test_case.get("category", "unknown")
+            for cap_name in engine.capabilities:
+                if (case_id, cap_name) in engine._completed:
+                    continue
+                pairs = engine.scheduler.pairs_for(case_id, cap_name, category)
+                if pairs:
+                    plan[(idx, cap_name)] = pairs
+        return plan
+    
+    def _generation_phase(
+        self,
+        dataset: Dict[int, Dict[str, Any]],
+        plan: Dict[Tuple[int, str], List[Tuple[str, str]]],
+    ) -> Dict[Tuple[int, str, str], Dict[str, Any]]:
+        """Generate every scheduled response, keyed by (item number, capability, model)"""
+        engine = self.engine
+        model_names = list(engine.model_configs)
+        cap_names = list(engine.capabilities)
+        system_prompt = engine.config.domain_config.system_prompt
+        
+        generations = {}
+        requests: Dict[str, List[Dict[str, Any]]] = {}
+        pending: Dict[str, Tuple[int, str, str, Optional[str]]] = {}
+        
+        for (idx, cap_name), pairs in plan.items():
+            capability = engine.capabilities[cap_name]
+            for name in engine.scheduler.models_for(pairs):
+                model_config = engine.model_configs[name]
+                messages = capability.build_messages(
+                    test_case=dataset[idx], system_prompt=system_prompt
+                )
+                
+                key = engine._response_cache_key(model_config, messages)
+                cached = engine._cached_generation(key, model_config)
+                if cached is not None:
+                    generations[(idx, cap_name, name)] = cached
+                    continue
+                
+                # Index-based IDs stay within provider limits and are stable across resumes
+                custom_id = f"gen-{idx}-{cap_names.index(cap_name)}-{model_names.index(name)}"
+                requests.setdefault(name, []).append({
+                    "custom_id": custom_id,
+                    "model": model_config.model,
+                    "messages": messages,
+                    "temperature": model_config.temperature,
+                    "max_tokens": model_config.max_tokens,
+                })
+                pending[custom_id] = (idx, cap_name, name, key)
+        
+        responses = self._run_batches("generation", {
+            name: (engine.providers[name], group) for name, group in requests.items()
+        })
+        
+        fallbacks = 0
+        for custom_id, (idx, cap_name, name, key) in pending.items():
+            response = responses.get(custom_id)
+            if response is None or "error" in response:
+                fallbacks += 1
+                generations[(idx, cap_name, name)] = engine._generate_response(
+                    engine.providers[name],
+                    engine.model_configs[name],
+                    engine.capabilities[cap_name],
+                    dataset[idx],
+                )
+                continue
+            
+            # Batch jobs have no per-request latency
+            engine._store_generation(key, response, None)
+            record = engine._generation_record(
+                response, None, engine.model_configs[name], batch=True
+            )
+            generations[(idx, cap_name, name)] = {**record, "batch": True}
+        
+        if fallbacks:
+            self.log(f"{fallbacks} generations missing from batch results were run interactively")
+        return generations
+    
+    def _judge_phase(
+        self,
+        dataset: Dict[int, Dict[str, Any]],
+        plan: Dict[Tuple[int, str], List[Tuple[str, str]]],
+        generations: Dict[Tuple[int, str, str], Dict[str, Any]],
+    ) -> Dict[Tuple[int, str, int, str], Dict[str, Any]]:
+        """Judge both orderings of every scheduled pair, keyed by (case, capability, pair, order)"""
+        engine = self.engine
+        evaluator = engine.evaluator
+        cap_names = list(engine.capabilities)
+        
+        verdicts = {}
+        requests = []
+        pending: Dict[str, Tuple[Tuple[int, str, int, str], str, str, str]] = {}
+        
+        for (idx, cap_name), pairs in plan.items():
+            conversation = format_conversation(dataset[idx].get("turns", []))
+            for pair_idx, (name_a, name_b) in enumerate(pairs):
+                response_a = generations[(idx, cap_name, name_a)]["response"]
+                response_b = generations[(idx, cap_name, name_b)]["response"]
+                
+                for order, first, second in (
+                    ("ab", response_a, response_b),
+                    ("ba", response_b, response_a),
+                ):
+                    slot = (idx, cap_name, pair_idx, order)
+                    cached = evaluator.cached_judgement(
+                        conversation, first, second, DEFAULT_JUDGE_ROLE
+                    )
+                    if cached is not None:
+                        verdicts[slot] = cached
+                        continue
+                    
+                    custom_id = f"judge-{idx}-{cap_names.index(cap_name)}-{pair_idx}-{order}"
+                    messages = build_judge_messages(conversation, first, second, DEFAULT_JUDGE_ROLE)
+                    requests.append({
+                        "custom_id": custom_id,
+                        "model": evaluator.model,
+                        "messages": messages,
+                        "temperature": 0.0,
+                        "max_tokens": None,
+                    })
+                    pending[custom_id] = (slot, conversation, first, second)
+        
+        responses = self._run_batches("judge", {"judge": (evaluator.provider, requests)})
+        
+        for custom_id, (slot, conversation, first, second) in pending.items():
+            verdicts[slot] = evaluator.judgement_from_response(
+                conversation, first, second, DEFAULT_JUDGE_ROLE, responses.get(custom_id)
+            )
+        return verdicts
+    
+    def _run_batches(
+        self,
+        phase: str,
+        groups: Dict[str, Tuple[BaseProvider, List[Dict[str, Any]]]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Submit (or pick up) one batch per group, wait for all to end, and merge their results"""
+        batch_ids = {}
+        for group, (provider, requests) in groups.items():
+            if not requests:
+                continue
+            
+            entry = self.state.get(phase, group)
+            if entry is not None:
+                self.log(f"Resuming {phase} batch for {group}: {entry['batch_id']}")
+            else:
+                if not provider.supports("batch"):
+                    raise ValueError(f"{provider.name} does not support batch mode ({group})")
+                batch_id = provider.submit_batch(requests)
+                entry = {"batch_id": batch_id, "provider": provider.name, "requests": len(requests)}
+                self.state.set(phase, group, entry)
+                self.log(
+                    f"Submitted {phase} batch for {group}: {batch_id} ({len(requests)} requests)"
+                )
+            batch_ids[group] = entry["batch_id"]
+        
+        # Poll until every batch has ended
+        deadline = time.monotonic() + self.config.max_wait_hours * 3600
+        pending = dict(batch_ids)
+        while pending:
+            for group, batch_id in list(pending.items()):
+                if groups[group][0].batch_status(batch_id) == "ended":
+                    del pending[group]
+            if not pending:
+                break
+            if time.monotonic() >= deadline:
+                hours = self.config.max_wait_hours
+                raise RuntimeError(
+                    f"{phase.capitalize()} batches still pending after {hours}h: "
+                    f"{', '.join(pending.values())}"
+                )
+            time.sleep(self.config.poll_interval)
+        
+        results = {}
+        for group, batch_id in batch_ids.items():
+            results.update(groups[group][0].batch_results(batch_id))
+        return results
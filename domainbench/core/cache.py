@@ -0,0 +1,139 @@
+"""
+Cache - Persistent content-addressed cache for provider completions
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+def cache_key(*parts: Any) -> str:
+    """Stable SHA-256 key over JSON-serializable parts"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Content-addressed JSON cache on the local filesystem.
+    
+    Entries live at <directory>/<key[:2]>/<key>.json and are written
+    atomically, so concurrent workers and processes can share a directory.
+    A hit refreshes the entry's mtime, which makes size eviction LRU.
+    In read-only mode (e.g. CI against a committed cache) nothing is
+    written, touched or evicted.
+    """
+    
+    def __init__(
+        self,
+        directory: str,
+        read_only: bool = False,
+        max_size_mb: Optional[float] = None,
+        max_age_days: Optional[float] = None,
+    ):
+        self.directory = Path(directory)
+        self.read_only = read_only
+        self.max_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self.max_age = max_age_days * 86400 if max_age_days else None
+        
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.saved_tokens = 0
+        self._lock = threading.Lock()
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up an entry; returns None on a miss or an expired entry"""
+        path = self._path(key)
+        try:
+            if self.max_age is not None and time.time() - path.stat().st_mtime > self.max_age:
+                raise FileNotFoundError
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        if not self.read_only:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        
+        with self._lock:
+            self.hits += 1
+            self.saved_tokens += value.get("usage", {}).get("total_tokens", 0) or 0
+        return value
+    
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store an entry (no-op in read-only mode)"""
+        if self.read_only:
+            return
+        
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            self.writes += 1
+    
+    def evict(self) -> int:
+        """
+        Drop expired entries, then least recently used ones until under max size.
+        
+        Returns:
+            Number of entries removed
+        """
+        if self.read_only or not self.directory.exists():
+            return 0
+        if self.max_age is None and self.max_bytes is None:
+            return 0
+        
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if self.max_age is not None and now - stat.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+        
+        if self.max_bytes is not None:
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+        
+        return removed
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the run summary"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "writes": self.writes,
+                "saved_tokens": self.saved_tokens,
+            }
@@ -0,0 +1,238 @@
+"""
+Checkpoint - Append-only result journal for crash-safe, resumable runs
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Tuple
+
+
+MANIFEST_FILE = "manifest.json"
+JOURNAL_FILE = "journal.jsonl"
+
+# Journal lines are flushed as written and fsynced in groups of this many,
+# or once this many seconds have passed since the last fsync
+FSYNC_EVERY = 100
+FSYNC_INTERVAL = 1.0
+
+# Config fields that decide which results a run produces; a resumed run must match them.
+# Throughput knobs (workers, rate limits, endpoints, retries) may change.
+RESUME_CONFIG_FIELDS = ("domain", "capabilities")
+RESUME_MODEL_FIELDS = ("provider", "model", "alias", "temperature", "max_tokens")
+RESUME_JUDGE_FIELDS = ("provider", "model", "temperature", "strategy")
+RESUME_SETTINGS_FIELDS = ("seed", "pairing", "pairs_per_case", "offset", "max_items", "shard")
+
+
+class CheckpointMismatchError(ValueError):
+    """The checkpoint being resumed does not match the dataset or config it is resumed with"""
+
+
+def dataset_fingerprint(path: str) -> Dict[str, Any]:
+    """Size and SHA-256 of a dataset file, so a resume can tell it is unchanged"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return {"size": os.path.getsize(path), "sha256": digest.hexdigest()}
+
+
+def resume_identity(config: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a (JSON-dumped) config that must not change across a resume"""
+    settings = config.get("settings") or {}
+    judge = config.get("judge") or {}
+    return {
+        **{field: config.get(field) for field in RESUME_CONFIG_FIELDS},
+        "models": [
+            {field: model.get(field) for field in RESUME_MODEL_FIELDS}
+            for model in config.get("models") or []
+        ],
+        "judge": {field: judge.get(field) for field in RESUME_JUDGE_FIELDS},
+        "settings": {field: settings.get(field) for field in RESUME_SETTINGS_FIELDS},
+    }
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of completed (test_id, capability) results.
+    
+    A run directory holds:
+    - manifest.json: benchmark id, full config and dataset path
+    - journal.jsonl: one line per finished result, flushed to the OS as
+      soon as the result completes and fsynced in groups
+    
+    A crashed process loses nothing that was flushed; a power loss loses at
+    most the last fsync group. Loading tolerates a torn final line, so a
+    crash mid-write only loses the result that was being written.
+    """
+    
+    def __init__(
+        self,
+        run_dir: str,
+        fsync_every: int = FSYNC_EVERY,
+        fsync_interval: float = FSYNC_INTERVAL,
+    ):
+        self.run_dir = Path(run_dir)
+        self.journal_path = self.run_dir / JOURNAL_FILE
+        self.manifest_path = self.run_dir / MANIFEST_FILE
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+    
+    @classmethod
+    def create(
+        cls,
+        run_dir: str,
+        benchmark_id: str,
+        config: Dict[str, Any],
+        dataset_path: str,
+    ) -> "CheckpointJournal":
+        """Start a new run directory with its manifest"""
+        journal = cls(run_dir)
+        journal.run_dir.mkdir(parents=True, exist_ok=True)
+        journal.write_manifest({
+            "benchmark_id": benchmark_id,
+            "created": datetime.now().isoformat(),
+            "dataset_path": str(Path(dataset_path).resolve()),
+            "dataset": dataset_fingerprint(dataset_path),
+            "config": config,
+            "completed": False,
+        })
+        return journal
+    
+    def read_manifest(self) -> Dict[str, Any]:
+        """Load the run manifest"""
+        if not self.manifest_path.exists():
+            raise ValueError(f"Not a checkpoint directory (no {MANIFEST_FILE}): {self.run_dir}")
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Corrupt checkpoint manifest {self.manifest_path}: {e}")
+        missing = [key for key in ("benchmark_id", "config", "dataset_path") if key not in manifest]
+        if missing:
+            raise ValueError(
+                f"Checkpoint manifest {self.manifest_path} is missing {', '.join(missing)}"
+            )
+        return manifest
+    
+    def check_resume(self, config: Dict[str, Any], dataset_path: str) -> None:
+        """
+        Refuse to resume with a different dataset or result-affecting config.
+        
+        Raises:
+            CheckpointMismatchError: naming what changed
+        """
+        manifest = self.read_manifest()
+        
+        # Round-trip the stored config so fields added since it was written take their defaults
+        from domainbench.core.config import BenchmarkConfig
+        
+        expected = resume_identity(BenchmarkConfig(**manifest["config"]).model_dump(mode="json"))
+        actual = resume_identity(config)
+        changed = [field for field in RESUME_CONFIG_FIELDS if expected[field] != actual[field]]
+        if expected["models"] != actual["models"]:
+            changed.append("models")
+        changed += [
+            f"judge.{field}" for field in RESUME_JUDGE_FIELDS
+            if expected["judge"][field] != actual["judge"][field]
+        ]
+        changed += [
+            f"settings.{field}" for field in RESUME_SETTINGS_FIELDS
+            if expected["settings"][field] != actual["settings"][field]
+        ]
+        if changed:
+            raise CheckpointMismatchError(
+                f"Config differs from the checkpoint in {', '.join(changed)}; "
+                "start a new run instead"
+            )
+        
+        # Checkpoints written before fingerprints were recorded skip this check
+        recorded = manifest.get("dataset")
+        if recorded is not None and dataset_fingerprint(dataset_path) != recorded:
+            raise CheckpointMismatchError(
+                f"Dataset {dataset_path} differs from the one checkpointed "
+                f"({manifest['dataset_path']})"
+            )
+    
+    def write_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Atomically replace the run manifest"""
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def mark_completed(self) -> None:
+        """Record that every work item finished"""
+        manifest = self.read_manifest()
+        manifest["completed"] = True
+        manifest["finished"] = datetime.now().isoformat()
+        self.write_manifest(manifest)
+    
+    def load(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Load journaled results.
+        
+        Returns:
+            Dict mapping (test_id, capability) to the stored result
+        """
+        completed = {}
+        if not self.journal_path.exists():
+            return completed
+        
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn write from a crash; everything before it is intact
+                    continue
+                result = entry.get("result", {})
+                completed[(str(result.get("test_id")), result.get("capability"))] = result
+        
+        return completed
+    
+    def append(self, result: Dict[str, Any]) -> None:
+        """Append one finished result (safe to call from worker threads)"""
+        line = json.dumps({"result": result}, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.journal_path, 'a', encoding='utf-8')
+                # Terminate a torn final line so the next record stays parseable
+                if self._file.tell() > 0 and not self._ends_with_newline():
+                    self._file.write('\n')
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced += 1
+            overdue = time.monotonic() - self._synced_at >= self.fsync_interval
+            if self._unsynced >= self.fsync_every or overdue:
+                self._sync()
+    
+    def _sync(self) -> None:
+        """fsync the journal (called with the lock held)"""
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+    
+    def _ends_with_newline(self) -> bool:
+        with open(self.journal_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                if self._unsynced:
+                    self._sync()
+                self._file.close()
+                self._file = None
@@ -0,0 +1,168 @@
+"""
+Columnar - Parquet / Arrow IPC export of detailed results (requires pyarrow)
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from domainbench.core.sinks import ResultSink
+
+
+# Arrow IPC supports only these codecs
+ARROW_COMPRESSIONS = ("lz4", "zstd")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Parquet/Arrow export requires pyarrow: pip install 'domainbench[parquet]'"
+        )
+    return pyarrow
+
+
+def result_schema():
+    """Arrow schema of the flattened results table"""
+    pa = _require_pyarrow()
+    return pa.schema([
+        ("test_id", pa.string()),
+        ("category", pa.string()),
+        ("capability", pa.string()),
+        ("model", pa.string()),
+        ("latency_ms", pa.float64()),
+        ("tokens", pa.int64()),
+        ("score", pa.float64()),
+        ("wins", pa.int32()),
+        ("ties", pa.int32()),
+        ("losses", pa.int32()),
+        ("winner", pa.string()),
+        ("judge_reasons", pa.list_(pa.string())),
+        ("cached", pa.bool_()),
+        ("retries", pa.int32()),
+    ])
+
+
+def flatten_result(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Flatten one detailed result into one row per model response.
+    
+    wins/ties/losses count the model's comparisons within this result, and
+    winner is the model with the most wins in it ("tie" when shared), which
+    for two models is simply the judged winner. judge_reasons collects the
+    reasons from every comparison the model took part in.
+    """
+    comparisons = result.get("comparisons", [])
+    win_counts = Counter(c["winner_model"] for c in comparisons if c["winner_model"] != "tie")
+    top = win_counts.most_common(2)
+    if top and (len(top) == 1 or top[0][1] > top[1][1]):
+        winner = top[0][0]
+    else:
+        winner = "tie"
+    
+    rows = []
+    for model, response in result.get("responses", {}).items():
+        wins = ties = losses = 0
+        reasons: List[str] = []
+        for c in comparisons:
+            if model not in (c["model_a"], c["model_b"]):
+                continue
+            if c["winner_model"] == model:
+                wins += 1
+            elif c["winner_model"] == "tie":
+                ties += 1
+            else:
+                losses += 1
+            reasons.extend(c.get("reasons", []))
+        
+        rows.append({
+            "test_id": str(result.get("test_id")),
+            "category": result.get("category"),
+            "capability": result.get("capability"),
+            "model": model,
+            "latency_ms": response.get("latency_ms"),
+            "tokens": response.get("tokens"),
+            "score": response.get("score"),
+            "wins": wins,
+            "ties": ties,
+            "losses": losses,
+            "winner": winner,
+            "judge_reasons": list(dict.fromkeys(reasons)),
+            "cached": bool(response.get("cached", False)),
+            "retries": response.get("retries", 0),
+        })
+    return rows
+
+
+class ColumnarSink(ResultSink):
+    """
+    Streams flattened results to a Parquet or Arrow IPC file.
+    
+    Rows are buffered per (capability, category) and written once a buffer
+    reaches row_group_size, so every Parquet row group (or Arrow record
+    batch) holds a single capability/category. Row-group statistics then let
+    readers filtering on those columns skip everything else.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        fmt: str = "parquet",
+        compression: Optional[str] = "zstd",
+        row_group_size: int = 10000,
+    ):
+        if fmt not in ("parquet", "arrow"):
+            raise ValueError(f"Unknown columnar format: {fmt}")
+        self.path = Path(path)
+        self.fmt = fmt
+        self.compression = compression
+        self.row_group_size = max(1, row_group_size)
+        self._buffers: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._writer = None
+        self._schema = None
+    
+    def open(self, header: Dict[str, Any]) -> None:
+        pa = _require_pyarrow()
+        self._schema = result_schema().with_metadata({
+            "benchmark_id": str(header.get("benchmark_id")),
+            "benchmark_name": str(header.get("benchmark_name")),
+            "timestamp": str(header.get("timestamp")),
+        })
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        if self.fmt == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(
+                str(self.path), self._schema, compression=self.compression or "none"
+            )
+        else:
+            codec = self.compression if self.compression in ARROW_COMPRESSIONS else None
+            self._writer = pa.ipc.new_file(
+                str(self.path), self._schema, options=pa.ipc.IpcWriteOptions(compression=codec)
+            )
+    
+    def write(self, result: Dict[str, Any]) -> None:
+        key = (result.get("capability"), result.get("category"))
+        buffer = self._buffers.setdefault(key, [])
+        buffer.extend(flatten_result(result))
+        if len(buffer) >= self.row_group_size:
+            self._flush(key)
+    
+    def _flush(self, key: Tuple[str, str]) -> None:
+        rows = self._buffers.pop(key, [])
+        if not rows:
+            return
+        pa = _require_pyarrow()
+        table = pa.Table.from_pylist(rows, schema=self._schema)
+        if self.fmt == "parquet":
+            self._writer.write_table(table, row_group_size=len(rows))
+        else:
+            self._writer.write_table(table, max_chunksize=len(rows))
+    
+    def close(self, footer: Dict[str, Any]) -> Optional[str]:
+        for key in sorted(self._buffers, key=lambda k: (str(k[0]), str(k[1]))):
+            self._flush(key)
+        self._writer.close()
+        self._writer = None
+        return str(self.path)
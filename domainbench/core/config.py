@@ -14,6 +14,7 @@ class ProviderType(str, Enum):
     GEMINI = "gemini"
     OLLAMA = "ollama"
     CUSTOM = "custom"
+    SIMULATED = "simulated"  # In-process stand-in for load-testing the engine
 
 
 class ModelConfig(BaseModel):
@@ -24,6 +25,11 @@ class ModelConfig(BaseModel):
     temperature: float = 0.2
     max_tokens: Optional[int] = None
     api_key_env: Optional[str] = None  # Environment variable name for API key
+    base_url: Optional[str] = None  # Override the API endpoint (proxy, gateway, compatible server)
+    rpm: Optional[int] = None  # Requests-per-minute budget for this provider/model
+    tpm: Optional[int] = None  # Tokens-per-minute budget for this provider/model
+    # Requests in flight to this provider/model at once (e.g. a local server's slots)
+    max_concurrency: Optional[int] = None
     
     @property
     def display_name(self) -> str:
@@ -36,6 +42,13 @@ class JudgeConfig(BaseModel):
     model: str = "gpt-4o"
     temperature: float = 0.0
     api_key_env: Optional[str] = None
+    base_url: Optional[str] = None
+    rpm: Optional[int] = None  # Shared with candidates using the same provider/model
+    tpm: Optional[int] = None
+    max_concurrency: Optional[int] = None
+    # swap (two serial calls), concurrent (both orderings at once) or single (one call)
+    strategy: str = "swap"
+    calibration_rate: float = 0.0  # With single: share of pairs also judged with two calls
 
 
 class MetricsConfig(BaseModel):
@@ -44,6 +57,8 @@ class MetricsConfig(BaseModel):
     latency: bool = True
     cost: bool = True
     tokens: bool = True
+    # "provider/model" -> input/output/cached_input USD per 1M tokens
+    prices: Dict[str, Dict[str, float]] = Field(default_factory=dict)
 
 
 class DomainConfig(BaseModel):
@@ -59,21 +74,97 @@ class DomainConfig(BaseModel):
     functions: List[Dict[str, Any]] = Field(default_factory=list)  # For function calling tests
 
 
+class RetryConfig(BaseModel):
+    """Retry policy for transient provider errors (429, 5xx, timeouts)"""
+    max_retries: int = 5
+    initial_backoff: float = 1.0  # Seconds before the first retry
+    max_backoff: float = 60.0  # Cap on any single wait, including a server's Retry-After
+    backoff_multiplier: float = 2.0
+    jitter: bool = True
+
+
+class AdaptiveConfig(BaseModel):
+    """Configuration for adaptive judging that stops once pairwise outcomes are settled"""
+    enabled: bool = False
+    confidence: float = 0.95  # Overall confidence, split evenly across the looks (Bonferroni)
+    min_comparisons: int = 10  # First look; later looks come at 2x, 4x, ... this many comparisons
+    max_looks: int = 8  # Interim checks per pair; an unsettled pair is judged to the end
+    scope: str = "pair"  # pair (settle across all categories) or category (settle per category)
+
+
+class BatchConfig(BaseModel):
+    """Configuration for submitting requests through provider batch APIs"""
+    enabled: bool = False
+    poll_interval: float = 30.0  # Seconds between batch status checks
+    max_wait_hours: float = 24.0  # Stop polling (the run can be resumed later)
+
+
+class HttpConfig(BaseModel):
+    """HTTP connection pools shared by every provider client in a run"""
+    max_connections: int = 100  # Open connections per provider, across all roles and workers
+    max_keepalive_connections: int = 20  # Idle connections kept open for reuse
+    keepalive_expiry: float = 30.0  # Seconds an idle connection stays in the pool
+    http2: bool = False  # Multiplex requests over HTTP/2 (requires httpx[http2])
+
+
 class BenchmarkSettings(BaseModel):
     """Runtime settings for benchmark execution"""
     runs_per_test: int = 1
     parallel_execution: bool = False
+    max_workers: int = 8  # Worker pool width (or in-flight cases when async_execution is enabled)
+    async_execution: bool = False  # Drive providers through their asyncio clients
+    fan_out: bool = True  # Overlap a case's candidate generations, then its judge calls
+    stream: bool = False  # Stream responses to measure time-to-first-token and inter-token latency
     save_raw_responses: bool = True
     seed: Optional[int] = None
-    sleep_between_calls: float = 0.2
+    sleep_between_calls: float = 0.2  # Legacy fixed throttle, ignored once rpm/tpm limits are set
     max_items: Optional[int] = None
+    offset: int = 0  # Skip this many leading dataset items
+    shard: Optional[str] = None  # "i/N": run only the i-th of N contiguous dataset shards
+    index_dir: Optional[str] = None  # Persist dataset line-count indexes here (default: memory)
+    pairing: str = "round_robin"  # round_robin (every model pair) or sampled
+    pairs_per_case: Optional[int] = None  # Pairs judged per case when pairing is sampled
+    budget: Optional[float] = None  # USD; stop scheduling cases once projected spend exceeds it
+    adaptive: AdaptiveConfig = Field(default_factory=AdaptiveConfig)
+    batch: BatchConfig = Field(default_factory=BatchConfig)
+    retry: RetryConfig = Field(default_factory=RetryConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
 
 
 class OutputConfig(BaseModel):
     """Configuration for benchmark output"""
     formats: List[str] = Field(default_factory=lambda: ["json"])
     directory: str = "./results"
-    include_raw_responses: bool = True
+    include_raw_responses: bool = True  # Keep candidate response text in the detailed results
+    keep_results_in_memory: bool = True  # Also keep detailed results in engine.results (CLI: off)
+    checkpoint: bool = True  # Journal results under <directory>/runs/ so runs can be resumed
+    compression: Optional[str] = "zstd"  # Parquet/Arrow codec (Arrow supports only zstd and lz4)
+    row_group_size: int = 10000  # Max rows per Parquet row group / Arrow record batch
+    store: Optional[str] = None  # Also record each run in this SQLite store (`domainbench history`)
+
+
+class CacheConfig(BaseModel):
+    """Configuration for the persistent on-disk response and judge caches"""
+    enabled: bool = False  # Cache model completions
+    judge: bool = False  # Cache judge verdicts per ordered response pair
+    directory: str = ".domainbench_cache"
+    read_only: bool = False  # Serve hits but never write (e.g. in CI)
+    max_size_mb: Optional[float] = None  # Evict least recently used entries beyond this
+    max_age_days: Optional[float] = None  # Treat older entries as misses and evict them
+
+
+class TracingConfig(BaseModel):
+    """Configuration for trace spans around the run pipeline (off unless an export is set)"""
+    chrome_trace: Optional[str] = None  # Write spans to this Chrome-trace/Perfetto JSON file
+    # POST spans as OTLP/HTTP JSON to this collector (e.g. http://localhost:4318/v1/traces)
+    otlp_endpoint: Optional[str] = None
+    otlp_headers: Dict[str, str] = Field(default_factory=dict)  # Extra collector headers (auth)
+    service_name: str = "domainbench"  # OpenTelemetry service.name of the exported spans
+    max_spans: int = 1000000  # Spans kept per run; later ones are dropped and counted
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.chrome_trace or self.otlp_endpoint)
 
 
 class BenchmarkConfig(BaseModel):
@@ -91,6 +182,8 @@ class BenchmarkConfig(BaseModel):
     metrics: MetricsConfig = Field(default_factory=MetricsConfig)
     settings: BenchmarkSettings = Field(default_factory=BenchmarkSettings)
     output: OutputConfig = Field(default_factory=OutputConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
     
     @classmethod
     def from_yaml(cls, path: str) -> "BenchmarkConfig":
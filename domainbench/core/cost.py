@@ -0,0 +1,204 @@
+"""
+Cost - Price table and spend per call, model, category and judge
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+
+
+# Bump when prices change so stored summaries record which table priced them
+PRICE_TABLE_VERSION = "2025-06-01"
+
+
+# (input, output, cached input) in USD per million tokens; cached input is the
+# prompt-cache read price (None = billed as input). Model ids match by longest
+# prefix, so dated snapshots (gpt-4o-2024-08-06) price as their family
+PRICES: Dict[str, Dict[str, Tuple[float, float, Optional[float]]]] = {
+    "openai": {
+        "gpt-4o": (2.50, 10.00, 1.25),
+        "gpt-4o-mini": (0.15, 0.60, 0.075),
+        "gpt-4.1": (2.00, 8.00, 0.50),
+        "gpt-4.1-mini": (0.40, 1.60, 0.10),
+        "gpt-4.1-nano": (0.10, 0.40, 0.025),
+        "gpt-4-turbo": (10.00, 30.00, None),
+        "gpt-3.5-turbo": (0.50, 1.50, None),
+        "o3": (2.00, 8.00, 0.50),
+        "o3-mini": (1.10, 4.40, 0.55),
+        "o4-mini": (1.10, 4.40, 0.275),
+    },
+    "anthropic": {
+        "claude-opus-4": (15.00, 75.00, 1.50),
+        "claude-sonnet-4": (3.00, 15.00, 0.30),
+        "claude-3-7-sonnet": (3.00, 15.00, 0.30),
+        "claude-3-5-sonnet": (3.00, 15.00, 0.30),
+        "claude-3-5-haiku": (0.80, 4.00, 0.08),
+        "claude-3-haiku": (0.25, 1.25, 0.03),
+    },
+    "gemini": {
+        "gemini-2.5-pro": (1.25, 10.00, 0.31),
+        "gemini-2.5-flash": (0.30, 2.50, 0.075),
+        "gemini-2.0-flash": (0.10, 0.40, 0.025),
+        "gemini-2.0-flash-lite": (0.075, 0.30, None),
+        "gemini-1.5-pro": (1.25, 5.00, None),
+        "gemini-1.5-flash": (0.075, 0.30, None),
+    },
+}
+
+# Batch APIs bill at a fraction of the interactive price
+BATCH_DISCOUNT = {"openai": 0.5, "anthropic": 0.5}
+
+
+class PriceTable:
+    """
+    Looks up per-token prices and turns provider usage dicts into dollars.
+    
+    overrides maps "provider/model" to {"input", "output", "cached_input"}
+    (USD per million tokens) and takes precedence over the built-in table,
+    e.g. for negotiated rates or models the table does not know yet.
+    """
+    
+    def __init__(self, overrides: Optional[Dict[str, Dict[str, float]]] = None):
+        self.prices = {provider: dict(models) for provider, models in PRICES.items()}
+        for name, price in (overrides or {}).items():
+            provider, _, model = name.partition("/")
+            self.prices.setdefault(provider, {})[model] = (
+                price["input"], price["output"], price.get("cached_input")
+            )
+        self.version = PRICE_TABLE_VERSION + ("+custom" if overrides else "")
+    
+    def lookup(self, provider: str, model: str) -> Optional[Tuple[float, float, Optional[float]]]:
+        """Price for a model, by exact id or else the longest matching prefix"""
+        models = self.prices.get(provider, {})
+        if model in models:
+            return models[model]
+        matches = [name for name in models if model.startswith(name)]
+        return models[max(matches, key=len)] if matches else None
+    
+    def estimate_cost(
+        self,
+        provider: str,
+        model: str,
+        usage: Dict[str, int],
+        batch: bool = False,
+    ) -> Optional[float]:
+        """
+        Dollars for one call's usage, or None if the model has no price.
+        
+        cached_tokens are the part of prompt_tokens read from the provider's
+        prompt cache and are billed at the cached-input price.
+        """
+        price = self.lookup(provider, model)
+        if price is None:
+            return None
+        input_price, output_price, cached_price = price
+        cached = usage.get("cached_tokens", 0) or 0
+        prompt = (usage.get("prompt_tokens", 0) or 0) - cached
+        cost = (
+            prompt * input_price
+            + cached * (cached_price if cached_price is not None else input_price)
+            + (usage.get("completion_tokens", 0) or 0) * output_price
+        ) / 1_000_000
+        if batch:
+            cost *= BATCH_DISCOUNT.get(provider, 1.0)
+        return cost
+
+
+class CostStats:
+    """
+    Spend per model, per category and for the judge, and the run budget.
+    
+    Costs are read from the cost_usd of each response and judge_cost_usd of
+    each comparison in the recorded results; cache hits cost nothing. With a
+    budget, allows() projects the spend of the cases still in flight, at
+    their pre-run estimates until a case has finished and at the average
+    cost per finished case after that, so a run stops scheduling new cases
+    before the projection would exceed it.
+    """
+    
+    def __init__(self, version: str, budget: Optional[float] = None):
+        self.version = version
+        self.budget = budget
+        self.total = 0.0
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self.categories: Dict[str, Dict[str, Any]] = {}
+        self.judge = {"comparisons": 0, "usd": 0.0}
+        self.unpriced: List[str] = []
+        self.scheduled = 0
+        self.estimated = 0.0  # Pre-run estimate of every case scheduled so far
+        self.finished = 0
+        self.stopped = False
+    
+    def record(self, result: Dict[str, Any]) -> None:
+        """Fold one result's response and judge costs into the totals"""
+        by_category = self.categories.setdefault(
+            result.get("category", "unknown"), {"models": {}, "judge": 0.0}
+        )
+        for name, response in result.get("responses", {}).items():
+            stats = self.models.setdefault(name, {"calls": 0, "usd": 0.0})
+            cost = response.get("cost_usd")
+            if response.get("cached"):
+                continue
+            stats["calls"] += 1
+            if cost is None:
+                if name not in self.unpriced:
+                    self.unpriced.append(name)
+                continue
+            stats["usd"] += cost
+            by_category["models"][name] = by_category["models"].get(name, 0.0) + cost
+            self.total += cost
+        
+        for comparison in result.get("comparisons", []):
+            if comparison.get("cached"):
+                continue
+            self.judge["comparisons"] += 1
+            cost = comparison.get("judge_cost_usd")
+            if cost is None:
+                if "judge" not in self.unpriced:
+                    self.unpriced.append("judge")
+                continue
+            self.judge["usd"] += cost
+            by_category["judge"] += cost
+            self.total += cost
+    
+    def schedule(self, estimate: float = 0.0) -> None:
+        """Count one more case in flight, with its pre-run cost estimate"""
+        self.scheduled += 1
+        self.estimated += estimate
+    
+    def allows(self, estimate: float = 0.0) -> bool:
+        """Whether one more case costing about `estimate` fits, given the cases in flight"""
+        if self.budget is None:
+            return True
+        if not self.finished:
+            # Nothing has been spent yet, and every scheduled case is still in flight
+            return self.estimated + estimate <= self.budget
+        per_case = self.total / self.finished
+        in_flight = self.scheduled - self.finished
+        return self.total + per_case * (in_flight + 1) <= self.budget
+    
+    def summary(self) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "price_table": self.version,
+            "total_usd": round(self.total, 6),
+            "models": {
+                name: {"calls": stats["calls"], "usd": round(stats["usd"], 6)}
+                for name, stats in self.models.items()
+            },
+            "by_category": {
+                category: {
+                    "models": {name: round(usd, 6) for name, usd in spend["models"].items()},
+                    "judge": round(spend["judge"], 6),
+                    "total_usd": round(sum(spend["models"].values()) + spend["judge"], 6),
+                }
+                for category, spend in self.categories.items()
+            },
+            "judge": {"comparisons": self.judge["comparisons"], "usd": round(self.judge["usd"], 6)},
+        }
+        if self.unpriced:
+            summary["unpriced"] = self.unpriced
+        if self.budget is not None:
+            summary["budget"] = {
+                "limit_usd": self.budget,
+                "stopped": self.stopped,
+                "cases_run": self.finished,
+            }
+        return summary
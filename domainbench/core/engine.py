@@ -2,20 +2,50 @@
 Benchmark Engine - Main orchestrator for running benchmarks
 """
 
+import asyncio
 import json
 import time
 import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import (
+    List, Dict, Any, Optional, Tuple, Callable, Awaitable, Iterable, Iterator, AsyncIterator, Deque
+)
 from pathlib import Path
 
 from domainbench.core.config import BenchmarkConfig, ModelConfig
-from domainbench.core.evaluator import JudgeEvaluator
-from domainbench.core.reporter import Reporter
-from domainbench.providers import get_provider, BaseProvider
+from domainbench.core.cache import DiskCache, cache_key
+from domainbench.core.checkpoint import CheckpointJournal
+from domainbench.core.cost import CostStats, PriceTable
+from domainbench.core.evaluator import JudgeEvaluator, resolve_judge_strategy
+from domainbench.core.metrics import DistributionStats, StreamStats, stream_metrics
+from domainbench.core.planner import CaseCostEstimator
+from domainbench.core.reporter import Reporter, STREAMING_FORMATS
+from domainbench.core.sinks import ResultSink, MemorySink, strip_raw_responses
+from domainbench.core.store import StoreSink
+from domainbench.core.tournament import PairScheduler, Tournament
+from domainbench.core.tracing import span, tracer, write_chrome_trace, export_otlp
+from domainbench.providers import get_provider, BaseProvider, ClientRegistry
+from domainbench.providers.base import async_chat_completion, async_stream_chat_completion
+from domainbench.providers.ratelimit import RateLimiterRegistry, RateLimitedProvider
+from domainbench.providers.retry import RetryingProvider, RetryStats
 from domainbench.capabilities import get_capability, BaseCapability
 
 
+def _request_latency_ms(response: Dict[str, Any], start: float) -> float:
+    """
+    Milliseconds the answered request took at the provider.
+    
+    Rate-limit queueing and retry backoff are reported separately (queue_ms,
+    backoff_ms); unwrapped providers fall back to the wall time since start.
+    """
+    seconds = response.get("latency_seconds")
+    if seconds is None:
+        seconds = time.perf_counter() - start
+    return seconds * 1000
+
+
 class BenchmarkResult(Dict[str, Any]):
     """Container for a single test case result"""
     pass
@@ -33,7 +63,7 @@ class BenchmarkEngine:
     - Reporter (output)
     """
     
-    def __init__(self, config: BenchmarkConfig):
+    def __init__(self, config: BenchmarkConfig, run_dir: Optional[str] = None):
         self.config = config
         self.benchmark_id = str(uuid.uuid4())
         self.start_time: Optional[datetime] = None
@@ -41,13 +71,53 @@ class BenchmarkEngine:
         
         # Initialize components
         self.providers: Dict[str, BaseProvider] = {}
+        self.model_configs: Dict[str, ModelConfig] = {}
+        self.scheduler: Optional[PairScheduler] = None
+        self.tournament: Optional[Tournament] = None
         self.capabilities: Dict[str, BaseCapability] = {}
         self.evaluator: Optional[JudgeEvaluator] = None
         self.reporter = Reporter(config.output)
+        self.rate_limiters = RateLimiterRegistry()
+        self.clients: Optional[ClientRegistry] = None
+        self.retry_stats = RetryStats()
+        self.response_cache: Optional[DiskCache] = None
+        self.judge_cache: Optional[DiskCache] = None
+        self.prices = PriceTable(config.metrics.prices)
+        self._case_cost: Optional[CaseCostEstimator] = None
         
-        # Results storage
+        # Results storage: detailed results stream to sinks, only aggregates stay in memory
         self.results: List[BenchmarkResult] = []
         self.summary: Dict[str, Any] = {}
+        self.sinks: List[ResultSink] = []
+        self.output_paths: List[str] = []
+        self._fan_out_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Checkpointing: run_dir is set up front only when resuming
+        self.run_dir = run_dir
+        self.checkpoint: Optional[CheckpointJournal] = None
+        self._completed: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    
+    @classmethod
+    def from_checkpoint(
+        cls,
+        run_dir: str,
+        config: Optional[BenchmarkConfig] = None,
+    ) -> Tuple["BenchmarkEngine", str]:
+        """
+        Recreate an engine from a checkpoint directory to resume its run.
+        
+        Args:
+            run_dir: Checkpoint directory
+            config: Config to resume with (default: the one in the manifest);
+                running refuses it if it would produce different results
+        
+        Returns:
+            Tuple of (engine, dataset path recorded in the manifest)
+        """
+        manifest = CheckpointJournal(run_dir).read_manifest()
+        engine = cls(config or BenchmarkConfig(**manifest["config"]), run_dir=run_dir)
+        engine.benchmark_id = manifest["benchmark_id"]
+        return engine, manifest["dataset_path"]
     
     def setup(self) -> None:
         """Initialize all components before running"""
@@ -58,10 +128,40 @@ class BenchmarkEngine:
         if self.config.domain_config is None:
             self.config.domain_config = load_domain(self.config.domain)
         
+        # Rate limits and concurrency caps are shared by every role using the same provider/model
+        for limited in [*self.config.models, self.config.judge]:
+            self.rate_limiters.configure(
+                limited.provider.value, limited.model, rpm=limited.rpm, tpm=limited.tpm
+            )
+            self.rate_limiters.configure_concurrency(
+                limited.provider.value, limited.model, limited.max_concurrency
+            )
+        
+        if self.config.cache.enabled:
+            self.response_cache = self._open_cache("responses")
+        if self.config.cache.judge:
+            self.judge_cache = self._open_cache("judge")
+        
+        # Providers and connection pools are shared by roles on the same account and endpoint
+        if self.clients is not None:
+            self.clients.close()
+        self.clients = ClientRegistry(self.config.settings.http)
+        
         # Initialize providers for each model
         for model_config in self.config.models:
-            provider = get_provider(model_config)
+            provider = self._wrap_provider(get_provider(model_config, self.clients), model_config)
             self.providers[model_config.display_name] = provider
+            self.model_configs[model_config.display_name] = model_config
+        
+        # Schedule which model pairs the judge compares
+        settings = self.config.settings
+        self.scheduler = PairScheduler(
+            list(self.model_configs),
+            schedule=settings.pairing,
+            pairs_per_case=settings.pairs_per_case,
+            seed=settings.seed,
+            adaptive=settings.adaptive,
+        )
         
         # Initialize capabilities
         for cap_name in self.config.capabilities:
@@ -69,13 +169,68 @@ class BenchmarkEngine:
             self.capabilities[cap_name] = capability
         
         # Initialize evaluator (judge)
-        judge_provider = get_provider(ModelConfig(
+        judge_config = ModelConfig(
             provider=self.config.judge.provider,
             model=self.config.judge.model,
             temperature=self.config.judge.temperature,
             api_key_env=self.config.judge.api_key_env,
-        ))
-        self.evaluator = JudgeEvaluator(judge_provider, self.config.judge.model)
+            base_url=self.config.judge.base_url,
+        )
+        judge_provider = self._wrap_provider(get_provider(judge_config, self.clients), judge_config)
+        # Per-case fan-out pool: one slot per model for every case in flight
+        if self._fan_out_pool is not None:
+            self._fan_out_pool.shutdown(wait=False)
+        cases_in_flight = settings.max_workers if settings.parallel_execution else 1
+        fan_out_slots = max(1, len(self.model_configs) * cases_in_flight)
+        self._fan_out_pool = ThreadPoolExecutor(
+            max_workers=fan_out_slots,
+            thread_name_prefix="domainbench-case",
+        )
+        
+        # Every pair judged at once may hand its swapped ordering to the judge pool
+        self.evaluator = JudgeEvaluator(
+            judge_provider,
+            self.config.judge.model,
+            cache=self.judge_cache,
+            strategy=resolve_judge_strategy(self.config.judge.strategy, settings.fan_out),
+            calibration_rate=self.config.judge.calibration_rate,
+            max_workers=fan_out_slots if settings.fan_out else cases_in_flight,
+        )
+        
+        # An unpriced model would count as free, so a budget could not hold
+        if settings.budget is not None and not settings.batch.enabled:
+            unpriced = [
+                f"{role.provider.value}/{role.model}"
+                for role in [*self.config.models, self.config.judge]
+                if self.prices.lookup(role.provider.value, role.model) is None
+            ]
+            if unpriced:
+                raise ValueError(
+                    f"Cannot enforce a ${settings.budget:.2f} budget without prices for "
+                    f"{', '.join(sorted(set(unpriced)))} (add them under metrics.prices)"
+                )
+    
+    def _open_cache(self, name: str) -> DiskCache:
+        """Open one namespace of the on-disk cache"""
+        cache_config = self.config.cache
+        return DiskCache(
+            str(Path(cache_config.directory) / name),
+            read_only=cache_config.read_only,
+            max_size_mb=cache_config.max_size_mb,
+            max_age_days=cache_config.max_age_days,
+        )
+    
+    def _wrap_provider(self, provider: BaseProvider, model_config: ModelConfig) -> BaseProvider:
+        """
+        Layer shared request policies around a raw provider.
+        
+        Retries sit outside the rate limiter so every attempt waits for budget.
+        """
+        provider_key = model_config.provider.value
+        provider = RateLimitedProvider(provider, self.rate_limiters, provider_key=provider_key)
+        return RetryingProvider(
+            provider, self.config.settings.retry, stats=self.retry_stats, provider_key=provider_key
+        )
     
     def run(self, dataset_path: str, verbose: bool = True) -> Dict[str, Any]:
         """
@@ -88,170 +243,763 @@ class BenchmarkEngine:
         Returns:
             Complete benchmark results dictionary
         """
+        batch = self.config.settings.batch
+        if self.config.settings.async_execution and not batch.enabled:
+            return asyncio.run(self.arun(dataset_path, verbose=verbose))
+        
         from rich.console import Console
-        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
-        from domainbench.domains.loader import load_dataset
         
         console = Console()
+        cases, total, model_stats, category_stats = self._prepare_run(
+            dataset_path, verbose, console
+        )
+        
+        if batch.enabled:
+            from domainbench.core.batch import BatchRunner
+            log = console.print if verbose else None
+            # Batch jobs are submitted whole, so the budget only gates interactive runs
+            case_iter = BatchRunner(self, batch, log=log).execute(cases)
+        else:
+            case_iter = self._execute(self._within_budget(cases))
+        
+        with self._progress(console, verbose) as progress:
+            task = progress.add_task("Running benchmark...", total=total)
+            
+            for case_results in case_iter:
+                for result in case_results:
+                    self._record_result(result, model_stats, category_stats)
+                self.cost_stats.finished += 1
+                
+                progress.update(task, advance=1)
+        
+        return self._finish_run(model_stats, category_stats, total, verbose, console)
+    
+    async def arun(self, dataset_path: str, verbose: bool = True) -> Dict[str, Any]:
+        """
+        Run the benchmark on a dataset using the asyncio provider path.
+        
+        Up to settings.max_workers test cases are in flight at once on the
+        current event loop. Providers implementing AsyncBaseProvider use their
+        native async clients; others fall back to worker threads.
+        
+        Args:
+            dataset_path: Path to JSONL dataset file
+            verbose: Print progress to console
+        
+        Returns:
+            Complete benchmark results dictionary
+        """
+        from rich.console import Console
+        
+        console = Console()
+        cases, total, model_stats, category_stats = self._prepare_run(
+            dataset_path, verbose, console
+        )
+        
+        try:
+            with self._progress(console, verbose) as progress:
+                task = progress.add_task("Running benchmark...", total=total)
+                
+                async for case_results in self._aexecute(self._within_budget(cases)):
+                    for result in case_results:
+                        self._record_result(result, model_stats, category_stats)
+                    self.cost_stats.finished += 1
+                    
+                    progress.update(task, advance=1)
+        finally:
+            # Async pools belong to this event loop, so they are closed before it ends
+            await self.clients.aclose()
+        return self._finish_run(model_stats, category_stats, total, verbose, console)
+    
+    def _prepare_run(
+        self,
+        dataset_path: str,
+        verbose: bool,
+        console,
+    ) -> Tuple[
+        Iterator[Tuple[int, Dict[str, Any]]],
+        int,
+        Dict[str, Dict[str, Dict[str, Any]]],
+        Dict[str, Dict[str, Dict[str, int]]],
+    ]:
+        """Set up components, open the dataset stream and initialize stats"""
+        from domainbench.domains.loader import dataset_range, iter_dataset
         
         self.setup()
         self.start_time = datetime.now()
+        self._open_checkpoint(dataset_path)
+        if self.config.tracing.enabled:
+            tracer.start(max_spans=self.config.tracing.max_spans)
+        self._open_sinks()
         
-        # Load dataset
-        dataset = load_dataset(dataset_path)
-        if self.config.settings.max_items:
-            dataset = dataset[:self.config.settings.max_items]
+        # Stream the dataset; the total comes from the line-count index
+        settings = self.config.settings
+        start, stop = dataset_range(
+            dataset_path, settings.offset, settings.max_items, settings.shard, settings.index_dir
+        )
+        cases = iter_dataset(
+            dataset_path,
+            offset=settings.offset,
+            max_items=settings.max_items,
+            shard=settings.shard,
+            with_index=True,
+            index_dir=settings.index_dir,
+        )
+        total = stop - start
         
         if verbose:
             console.print(f"\n[bold blue]DomainBench[/bold blue] - {self.config.name}")
-            console.print(f"Running {len(dataset)} test cases across {len(self.config.models)} models\n")
+            console.print(f"Running {total} test cases across {len(self.config.models)} models")
+            if settings.shard or settings.offset:
+                console.print(
+                    f"Dataset items {start}-{stop - 1}"
+                    + (f" (shard {settings.shard})" if settings.shard else "")
+                )
+            if self.config.settings.batch.enabled:
+                console.print("Batch mode: requests are submitted through provider batch APIs")
+            elif self.config.settings.async_execution:
+                console.print(
+                    f"Async execution with up to {self.config.settings.max_workers} cases in flight"
+                )
+            elif self.config.settings.parallel_execution:
+                console.print(f"Parallel execution with {self.config.settings.max_workers} workers")
+            if self.evaluator.strategy != self.config.judge.strategy and not settings.batch.enabled:
+                console.print(
+                    f"Judge strategy: {self.config.judge.strategy} runs as "
+                    f"{self.evaluator.strategy} (fan_out overlaps both orderings; "
+                    "verdicts are unchanged)"
+                )
+            if self.checkpoint is not None:
+                console.print(f"Checkpoint: {self.run_dir}")
+            if self._completed:
+                console.print(f"Resuming: {len(self._completed)} results already completed")
+            console.print()
         
         # Track wins/scores per model per capability
         model_stats: Dict[str, Dict[str, Dict[str, Any]]] = {
-            model.display_name: {cap: {"wins": 0, "ties": 0, "losses": 0, "scores": []} 
-                                  for cap in self.config.capabilities}
+            model.display_name: {
+                cap: {"wins": 0, "ties": 0, "losses": 0, "score_sum": 0.0, "score_count": 0}
+                for cap in self.config.capabilities
+            }
             for model in self.config.models
         }
         
         # Category-level tracking
         category_stats: Dict[str, Dict[str, Dict[str, int]]] = {}
         
-        # We need exactly 2 models for comparison
-        if len(self.config.models) != 2:
-            raise ValueError("Currently only 2-model comparison is supported")
+        # Pairwise records and ratings across all models
+        self.tournament = Tournament(list(self.model_configs))
+        
+        # Time-to-first-token and inter-token latency of streamed responses
+        self.stream_stats = StreamStats()
         
-        model_a = self.config.models[0]
-        model_b = self.config.models[1]
-        provider_a = self.providers[model_a.display_name]
-        provider_b = self.providers[model_b.display_name]
+        # Spend per model, category and judge, checked against the budget
+        self.cost_stats = CostStats(self.prices.version, budget=self.config.settings.budget)
+        if settings.budget is not None:
+            self._case_cost = CaseCostEstimator(self.config, self.prices)
         
-        with Progress(
+        # Latency and token percentiles per model, capability and category
+        self.distribution_stats = DistributionStats(
+            latency=self.config.metrics.latency, tokens=self.config.metrics.tokens
+        )
+        
+        return cases, total, model_stats, category_stats
+    
+    def _open_checkpoint(self, dataset_path: str) -> None:
+        """Create a new checkpoint journal, or load the one being resumed"""
+        if self.run_dir is not None:
+            self.checkpoint = CheckpointJournal(self.run_dir)
+            self.checkpoint.check_resume(self.config.model_dump(mode="json"), dataset_path)
+            self._completed = self.checkpoint.load()
+            return
+        
+        if not self.config.output.checkpoint:
+            return
+        
+        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
+        self.run_dir = str(
+            Path(self.config.output.directory) / "runs" / f"{timestamp}_{self.benchmark_id[:8]}"
+        )
+        self.checkpoint = CheckpointJournal.create(
+            self.run_dir,
+            benchmark_id=self.benchmark_id,
+            config=self.config.model_dump(mode="json"),
+            dataset_path=dataset_path,
+        )
+    
+    def _checkpoint_result(self, result: BenchmarkResult) -> None:
+        """Journal a freshly computed result as soon as it completes"""
+        if self.checkpoint is not None:
+            self.checkpoint.append(result)
+    
+    def _progress(self, console, verbose: bool):
+        """Create the progress bar used while running"""
+        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+        
+        return Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
             console=console,
             disable=not verbose,
-        ) as progress:
-            task = progress.add_task("Running benchmark...", total=len(dataset))
-            
-            for idx, test_case in enumerate(dataset):
-                case_id = test_case.get("id", f"case_{idx}")
-                category = test_case.get("category", "unknown")
-                
-                if category not in category_stats:
-                    category_stats[category] = {
-                        model_a.display_name: {"wins": 0, "ties": 0},
-                        model_b.display_name: {"wins": 0, "ties": 0},
-                    }
-                
-                for cap_name, capability in self.capabilities.items():
-                    # Generate responses from both models
-                    response_a, latency_a, tokens_a = self._generate_response(
-                        provider_a, model_a, capability, test_case
-                    )
-                    response_b, latency_b, tokens_b = self._generate_response(
-                        provider_b, model_b, capability, test_case
-                    )
-                    
-                    # Judge evaluation with swap mitigation
-                    judge_result = self.evaluator.evaluate_pair(
-                        conversation=test_case.get("turns", []),
-                        response_a=response_a,
-                        response_b=response_b,
-                        system_prompt=self.config.domain_config.system_prompt,
-                    )
-                    
-                    winner = judge_result["winner"]
-                    
-                    # Update stats
-                    if winner == "A":
-                        model_stats[model_a.display_name][cap_name]["wins"] += 1
-                        model_stats[model_b.display_name][cap_name]["losses"] += 1
-                        category_stats[category][model_a.display_name]["wins"] += 1
-                    elif winner == "B":
-                        model_stats[model_b.display_name][cap_name]["wins"] += 1
-                        model_stats[model_a.display_name][cap_name]["losses"] += 1
-                        category_stats[category][model_b.display_name]["wins"] += 1
-                    else:
-                        model_stats[model_a.display_name][cap_name]["ties"] += 1
-                        model_stats[model_b.display_name][cap_name]["ties"] += 1
-                        category_stats[category][model_a.display_name]["ties"] += 1
-                        category_stats[category][model_b.display_name]["ties"] += 1
-                    
-                    model_stats[model_a.display_name][cap_name]["scores"].append(judge_result["score_A"])
-                    model_stats[model_b.display_name][cap_name]["scores"].append(judge_result["score_B"])
-                    
-                    # Store detailed result
-                    result = BenchmarkResult({
-                        "test_id": case_id,
-                        "category": category,
-                        "capability": cap_name,
-                        "input": test_case,
-                        "responses": {
-                            model_a.display_name: {
-                                "response": response_a,
-                                "latency_ms": latency_a,
-                                "tokens": tokens_a,
-                                "score": judge_result["score_A"],
-                            },
-                            model_b.display_name: {
-                                "response": response_b,
-                                "latency_ms": latency_b,
-                                "tokens": tokens_b,
-                                "score": judge_result["score_B"],
-                            },
-                        },
-                        "winner": winner,
-                        "judge_reasons": judge_result.get("reasons", []),
-                    })
-                    self.results.append(result)
-                
-                progress.update(task, advance=1)
-                
-                # Sleep between calls
-                if self.config.settings.sleep_between_calls > 0:
-                    time.sleep(self.config.settings.sleep_between_calls)
-        
+        )
+    
+    def _finish_run(
+        self,
+        model_stats: Dict[str, Dict[str, Dict[str, Any]]],
+        category_stats: Dict[str, Dict[str, Dict[str, int]]],
+        total_cases: int,
+        verbose: bool,
+        console,
+    ) -> Dict[str, Any]:
+        """Build the summary once every test case has been recorded"""
         self.end_time = datetime.now()
         
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+            # A run stopped by its budget stays resumable
+            if not self.cost_stats.stopped:
+                self.checkpoint.mark_completed()
+        
         # Build summary
-        self.summary = self._build_summary(model_stats, category_stats, len(dataset))
+        self.summary = self._build_summary(model_stats, category_stats, total_cases)
+        if self.rate_limiters.configured:
+            self.summary["rate_limits"] = self.rate_limiters.stats()
+        if self.retry_stats.any_retries:
+            self.summary["retries"] = self.retry_stats.summary()
+        adaptive = self.scheduler.adaptive_summary()
+        if adaptive is not None:
+            self.summary["adaptive"] = adaptive
+        if self._track_cost:
+            self.summary["cost"] = self.cost_stats.summary()
+        distributions = self.distribution_stats.summary()
+        if distributions is not None:
+            self.summary["distributions"] = distributions
+        streaming = self.stream_stats.summary()
+        if streaming is not None:
+            self.summary["streaming"] = streaming
+        judge = self.evaluator.stats.summary(self.evaluator.strategy)
+        if judge is not None:
+            if self.evaluator.strategy != self.config.judge.strategy:
+                judge["requested_strategy"] = self.config.judge.strategy
+            self.summary["judge"] = judge
+        self.evaluator.close()
+        self.clients.close()
+        self._fan_out_pool.shutdown(wait=False)
+        self._fan_out_pool = None
+        caches = {"responses": self.response_cache, "judge": self.judge_cache}
+        for cache_name, cache in caches.items():
+            if cache is not None:
+                cache.evict()
+                self.summary.setdefault("cache", {})[cache_name] = cache.stats()
+        
+        # Tracing stops first so its summary reaches the streamed outputs
+        if self.config.tracing.enabled:
+            self._export_trace()
+        self._close_sinks()
+        if "chrome_trace" in self.summary.get("tracing", {}):
+            self.output_paths.append(self.summary["tracing"]["chrome_trace"])
         
         if verbose:
             self._print_summary(console)
         
         return self.get_full_results()
     
+    def _export_trace(self) -> None:
+        """Stop tracing and write the spans to the configured exporters"""
+        import httpx
+        
+        tracing = self.config.tracing
+        spans = tracer.stop()
+        self.summary["tracing"] = {
+            "trace_id": tracer.trace_id,
+            "spans": len(spans),
+            "dropped": tracer.dropped,
+        }
+        
+        if tracing.chrome_trace:
+            path = write_chrome_trace(spans, tracing.chrome_trace, tracer.trace_id, tracer.dropped)
+            self.summary["tracing"]["chrome_trace"] = path
+        if tracing.otlp_endpoint:
+            # A collector being down should not fail a finished run
+            try:
+                export_otlp(
+                    spans,
+                    tracing.otlp_endpoint,
+                    tracer.trace_id,
+                    service_name=tracing.service_name,
+                    headers=tracing.otlp_headers,
+                )
+            except httpx.HTTPError as e:
+                self.summary["tracing"]["otlp_error"] = str(e)
+    
+    def _within_budget(
+        self, cases: Iterable[Tuple[int, Dict[str, Any]]]
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Pass cases through until the projected spend would exceed settings.budget.
+        
+        Cases already scheduled still finish, so the run ends cleanly with
+        every started case recorded.
+        """
+        for case in cases:
+            estimate = self._case_cost(*case) if self._case_cost is not None else 0.0
+            if not self.cost_stats.allows(estimate):
+                self.cost_stats.stopped = True
+                return
+            self.cost_stats.schedule(estimate)
+            yield case
+    
+    def _execute(
+        self, cases: Iterable[Tuple[int, Dict[str, Any]]]
+    ) -> Iterator[List[BenchmarkResult]]:
+        """
+        Run every (item number, test case) and yield its results in dataset order.
+        
+        Cases are pulled from the stream only as workers free up, so the
+        dataset is never held in memory.
+        
+        In parallel mode, cases are submitted to a bounded thread pool so that
+        network-bound provider and judge calls overlap. At most twice the pool
+        width is in flight at once, and results are yielded strictly in
+        submission order regardless of completion order.
+        """
+        settings = self.config.settings
+        
+        if not settings.parallel_execution:
+            for idx, test_case in cases:
+                yield self._run_case(idx, test_case)
+                
+                # Legacy fixed sleep, superseded by per-provider rate limits
+                if settings.sleep_between_calls > 0 and not self.rate_limiters.configured:
+                    time.sleep(settings.sleep_between_calls)
+            return
+        
+        width = max(1, settings.max_workers)
+        executor = ThreadPoolExecutor(max_workers=width, thread_name_prefix="domainbench")
+        pending: Deque[Future] = deque()
+        try:
+            for idx, test_case in cases:
+                pending.append(executor.submit(self._run_case, idx, test_case))
+                if len(pending) >= width * 2:
+                    yield pending.popleft().result()
+            
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    async def _aexecute(
+        self, cases: Iterable[Tuple[int, Dict[str, Any]]]
+    ) -> AsyncIterator[List[BenchmarkResult]]:
+        """
+        Async counterpart of _execute.
+        
+        Keeps at most settings.max_workers cases in flight as tasks on the
+        running loop and yields their results in dataset order.
+        """
+        width = max(1, self.config.settings.max_workers)
+        pending: Deque[asyncio.Task] = deque()
+        try:
+            for idx, test_case in cases:
+                pending.append(asyncio.create_task(self._arun_case(idx, test_case)))
+                if len(pending) >= width:
+                    yield await pending.popleft()
+            
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    def _run_case(self, idx: int, test_case: Dict[str, Any]) -> List[BenchmarkResult]:
+        """
+        Generate and judge responses for one test case across all capabilities.
+        
+        Each scheduled model generates once per capability; the judge then
+        compares every scheduled pair using those shared responses.
+        """
+        case_id = str(test_case.get("id", f"case_{idx}"))
+        category = test_case.get("category", "unknown")
+        
+        results = []
+        for cap_name, capability in self.capabilities.items():
+            # Reuse results journaled by an earlier, interrupted run
+            if (case_id, cap_name) in self._completed:
+                results.append(BenchmarkResult(self._completed[(case_id, cap_name)]))
+                continue
+            
+            pairs = self.scheduler.pairs_for(case_id, cap_name, category)
+            if not pairs:
+                # Every pair is already settled (adaptive mode)
+                continue
+            
+            # Generate one response per scheduled model
+            names = self.scheduler.models_for(pairs)
+            generated = self._fan_out(
+                lambda name: self._generate_response(
+                    self.providers[name], self.model_configs[name], capability, test_case
+                ),
+                names,
+            )
+            generations = dict(zip(names, generated))
+            
+            # Judge evaluation with swap mitigation, per pair
+            judge_results = self._fan_out(
+                lambda pair: self.evaluator.evaluate_pair(
+                    conversation=test_case.get("turns", []),
+                    response_a=generations[pair[0]]["response"],
+                    response_b=generations[pair[1]]["response"],
+                ),
+                pairs,
+            )
+            comparisons = [
+                self._comparison_record(name_a, name_b, judge_result)
+                for (name_a, name_b), judge_result in zip(pairs, judge_results)
+            ]
+            
+            result = self._build_result(idx, test_case, cap_name, generations, comparisons)
+            self._checkpoint_result(result)
+            results.append(result)
+        
+        return results
+    
+    async def _arun_case(self, idx: int, test_case: Dict[str, Any]) -> List[BenchmarkResult]:
+        """Async counterpart of _run_case"""
+        case_id = str(test_case.get("id", f"case_{idx}"))
+        category = test_case.get("category", "unknown")
+        
+        results = []
+        for cap_name, capability in self.capabilities.items():
+            if (case_id, cap_name) in self._completed:
+                results.append(BenchmarkResult(self._completed[(case_id, cap_name)]))
+                continue
+            
+            pairs = self.scheduler.pairs_for(case_id, cap_name, category)
+            if not pairs:
+                continue
+            
+            names = self.scheduler.models_for(pairs)
+            generated = await self._afan_out([
+                self._agenerate_response(
+                    self.providers[name], self.model_configs[name], capability, test_case
+                )
+                for name in names
+            ])
+            generations = dict(zip(names, generated))
+            
+            judge_results = await self._afan_out([
+                self.evaluator.aevaluate_pair(
+                    conversation=test_case.get("turns", []),
+                    response_a=generations[name_a]["response"],
+                    response_b=generations[name_b]["response"],
+                )
+                for name_a, name_b in pairs
+            ])
+            comparisons = [
+                self._comparison_record(name_a, name_b, judge_result)
+                for (name_a, name_b), judge_result in zip(pairs, judge_results)
+            ]
+            
+            result = self._build_result(idx, test_case, cap_name, generations, comparisons)
+            self._checkpoint_result(result)
+            results.append(result)
+        
+        return results
+    
+    def _fan_out(self, fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """
+        Apply fn to every item concurrently and return the results in order.
+        
+        The first item runs on the calling thread and the rest on the fan-out
+        pool, so a case takes as long as its slowest call rather than the sum.
+        Runs serially when settings.fan_out is off.
+        """
+        if not self.config.settings.fan_out or len(items) < 2:
+            return [fn(item) for item in items]
+        futures = [self._fan_out_pool.submit(fn, item) for item in items[1:]]
+        first = fn(items[0])
+        return [first] + [future.result() for future in futures]
+    
+    async def _afan_out(self, calls: List[Awaitable[Any]]) -> List[Any]:
+        """Async counterpart of _fan_out over already created coroutines"""
+        if not self.config.settings.fan_out:
+            return [await call for call in calls]
+        return list(await asyncio.gather(*calls))
+    
+    def _comparison_record(
+        self, name_a: str, name_b: str, judge_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Judge verdict for one model pair as stored in the detailed results"""
+        winner = judge_result["winner"]
+        record = {
+            "model_a": name_a,
+            "model_b": name_b,
+            "winner": winner,
+            "winner_model": {"A": name_a, "B": name_b}.get(winner, "tie"),
+            "score_A": judge_result["score_A"],
+            "score_B": judge_result["score_B"],
+            "reasons": judge_result.get("reasons", []),
+            "retries": judge_result.get("retries", 0),
+            "backoff_ms": judge_result.get("backoff_ms", 0.0),
+            "cached": judge_result.get("cached", False),
+        }
+        if self._track_cost:
+            record["judge_cost_usd"] = 0.0 if record["cached"] else self.prices.estimate_cost(
+                self.config.judge.provider.value,
+                self.config.judge.model,
+                judge_result.get("usage", {}),
+                batch=judge_result.get("batch", False),
+            )
+        return record
+    
+    def _build_result(
+        self,
+        idx: int,
+        test_case: Dict[str, Any],
+        cap_name: str,
+        generations: Dict[str, Dict[str, Any]],
+        comparisons: List[Dict[str, Any]],
+    ) -> BenchmarkResult:
+        """Assemble the detailed result for one test case and capability"""
+        # Each response's score is its mean judge score across its comparisons
+        scores: Dict[str, List[float]] = {name: [] for name in generations}
+        for comparison in comparisons:
+            scores[comparison["model_a"]].append(comparison["score_A"])
+            scores[comparison["model_b"]].append(comparison["score_B"])
+        
+        return BenchmarkResult({
+            "test_id": test_case.get("id", f"case_{idx}"),
+            "category": test_case.get("category", "unknown"),
+            "capability": cap_name,
+            "input": test_case,
+            "responses": {
+                name: {
+                    **generated,
+                    "score": (
+                        round(sum(scores[name]) / len(scores[name]), 2) if scores[name] else None
+                    ),
+                }
+                for name, generated in generations.items()
+            },
+            "comparisons": comparisons,
+        })
+    
+    def _record_result(
+        self,
+        result: BenchmarkResult,
+        model_stats: Dict[str, Dict[str, Dict[str, Any]]],
+        category_stats: Dict[str, Dict[str, Dict[str, int]]],
+    ) -> None:
+        """Fold a finished result into the running stats and store it"""
+        with span("engine.record_stats"):
+            cap_name = result["capability"]
+            category = result["category"]
+            
+            if category not in category_stats:
+                category_stats[category] = {
+                    model.display_name: {"wins": 0, "ties": 0} for model in self.config.models
+                }
+            
+            if self._track_cost:
+                self.cost_stats.record(result)
+            
+            for name, response in result["responses"].items():
+                self.distribution_stats.record(name, cap_name, category, response)
+                self.stream_stats.record(name, category, response)
+            
+            for comparison in result["comparisons"]:
+                name_a = comparison["model_a"]
+                name_b = comparison["model_b"]
+                winner = comparison["winner"]
+                
+                # Update stats
+                if winner == "A":
+                    model_stats[name_a][cap_name]["wins"] += 1
+                    model_stats[name_b][cap_name]["losses"] += 1
+                    category_stats[category][name_a]["wins"] += 1
+                elif winner == "B":
+                    model_stats[name_b][cap_name]["wins"] += 1
+                    model_stats[name_a][cap_name]["losses"] += 1
+                    category_stats[category][name_b]["wins"] += 1
+                else:
+                    model_stats[name_a][cap_name]["ties"] += 1
+                    model_stats[name_b][cap_name]["ties"] += 1
+                    category_stats[category][name_a]["ties"] += 1
+                    category_stats[category][name_b]["ties"] += 1
+                
+                for name, score in (
+                    (name_a, comparison["score_A"]),
+                    (name_b, comparison["score_B"]),
+                ):
+                    model_stats[name][cap_name]["score_sum"] += score
+                    model_stats[name][cap_name]["score_count"] += 1
+                
+                self.tournament.record(name_a, name_b, winner)
+                self.scheduler.observe(name_a, name_b, category, winner)
+        
+        # Every result is persisted; include_raw_responses only decides whether it carries the text
+        with span("engine.write_result"):
+            record = (
+                result if self.config.output.include_raw_responses else strip_raw_responses(result)
+            )
+            for sink in self.sinks:
+                sink.write(record)
+    
     def _generate_response(
         self,
         provider: BaseProvider,
         model_config: ModelConfig,
         capability: BaseCapability,
         test_case: Dict[str, Any],
-    ) -> Tuple[str, float, int]:
+    ) -> Dict[str, Any]:
         """Generate a response from a model and measure metrics"""
-        
-        # Build messages from test case
-        messages = capability.build_messages(
-            test_case=test_case,
-            system_prompt=self.config.domain_config.system_prompt,
-        )
-        
-        start = time.perf_counter()
-        response = provider.chat_completion(
-            model=model_config.model,
-            messages=messages,
-            temperature=model_config.temperature,
-            max_tokens=model_config.max_tokens,
+        with span("engine.generate_response", model=model_config.display_name) as current:
+            # Build messages from test case
+            with span("engine.build_messages"):
+                messages = capability.build_messages(
+                    test_case=test_case,
+                    system_prompt=self.config.domain_config.system_prompt,
+                )
+            
+            key = self._response_cache_key(model_config, messages)
+            cached = self._cached_generation(key, model_config)
+            if cached is not None:
+                current.set(cached=True)
+                return cached
+            
+            # Streaming adds time-to-first-token and inter-token latency
+            stream = self.config.settings.stream and provider.supports("streaming")
+            request = provider.stream_chat_completion if stream else provider.chat_completion
+            
+            start = time.perf_counter()
+            response = request(
+                model=model_config.model,
+                messages=messages,
+                temperature=model_config.temperature,
+                max_tokens=model_config.max_tokens,
+            )
+            latency_ms = _request_latency_ms(response, start)
+            
+            self._store_generation(key, response, latency_ms)
+            return self._generation_record(response, latency_ms, model_config)
+    
+    async def _agenerate_response(
+        self,
+        provider: BaseProvider,
+        model_config: ModelConfig,
+        capability: BaseCapability,
+        test_case: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Async counterpart of _generate_response"""
+        with span("engine.generate_response", model=model_config.display_name) as current:
+            with span("engine.build_messages"):
+                messages = capability.build_messages(
+                    test_case=test_case,
+                    system_prompt=self.config.domain_config.system_prompt,
+                )
+            
+            key = self._response_cache_key(model_config, messages)
+            cached = self._cached_generation(key, model_config)
+            if cached is not None:
+                current.set(cached=True)
+                return cached
+            
+            stream = self.config.settings.stream and provider.supports("streaming")
+            request = async_stream_chat_completion if stream else async_chat_completion
+            
+            start = time.perf_counter()
+            response = await request(
+                provider,
+                model=model_config.model,
+                messages=messages,
+                temperature=model_config.temperature,
+                max_tokens=model_config.max_tokens,
+            )
+            latency_ms = _request_latency_ms(response, start)
+            
+            self._store_generation(key, response, latency_ms)
+            return self._generation_record(response, latency_ms, model_config)
+    
+    def _response_cache_key(
+        self, model_config: ModelConfig, messages: List[Dict[str, str]]
+    ) -> Optional[str]:
+        """Content address of a completion request, or None when caching is off"""
+        if self.response_cache is None:
+            return None
+        return cache_key(
+            model_config.provider.value,
+            model_config.model,
+            messages,
+            model_config.temperature,
+            model_config.max_tokens,
+            self.config.settings.seed,
         )
-        latency_ms = (time.perf_counter() - start) * 1000
-        
-        # Extract token count if available
-        tokens = response.get("usage", {}).get("total_tokens", 0)
-        content = response.get("content", "")
-        
-        return content, latency_ms, tokens
+    
+    def _cached_generation(
+        self, key: Optional[str], model_config: ModelConfig
+    ) -> Optional[Dict[str, Any]]:
+        """Serve a generation record from the response cache"""
+        if key is None:
+            return None
+        entry = self.response_cache.get(key)
+        if entry is None:
+            return None
+        record = self._generation_record(entry, entry.get("latency_ms", 0.0), model_config)
+        if "cost_usd" in record:
+            record["cost_usd"] = 0.0
+        return {**record, "cached": True}
+    
+    def _store_generation(
+        self, key: Optional[str], response: Dict[str, Any], latency_ms: Optional[float]
+    ) -> None:
+        """Write a fresh completion to the response cache"""
+        if key is None:
+            return
+        self.response_cache.put(key, {
+            "content": response.get("content", ""),
+            "usage": response.get("usage", {}),
+            "latency_ms": latency_ms,
+        })
+    
+    @property
+    def _track_cost(self) -> bool:
+        """Price calls when cost metrics are on or a budget needs them"""
+        return self.config.metrics.cost or self.config.settings.budget is not None
+    
+    def _generation_record(
+        self,
+        response: Dict[str, Any],
+        latency_ms: Optional[float],
+        model_config: ModelConfig,
+        batch: bool = False,
+    ) -> Dict[str, Any]:
+        """Per-response metrics stored in the detailed results"""
+        record = {
+            "response": response.get("content", ""),
+            "latency_ms": latency_ms,
+            # Extract token count if available
+            "tokens": response.get("usage", {}).get("total_tokens", 0),
+            "completion_tokens": response.get("usage", {}).get("completion_tokens", 0),
+            "retries": response.get("retries", 0),
+            "backoff_ms": response.get("backoff_seconds", 0.0) * 1000,
+            "queue_ms": response.get("queue_seconds", 0.0) * 1000,
+        }
+        if self._track_cost:
+            record["cost_usd"] = self.prices.estimate_cost(
+                model_config.provider.value,
+                model_config.model,
+                response.get("usage", {}),
+                batch=batch,
+            )
+        if "stream" in response:
+            record.update(
+                stream_metrics(
+                    response["stream"], response.get("usage", {}).get("completion_tokens")
+                )
+            )
+        return record
     
     def _build_summary(
         self,
@@ -277,14 +1025,15 @@ class BenchmarkEngine:
                 "by_capability": {},
             }
             
-            all_scores = []
+            score_sum, score_count = 0.0, 0
             for cap_name, stats in cap_stats.items():
                 model_summary["total_wins"] += stats["wins"]
                 model_summary["total_ties"] += stats["ties"]
                 model_summary["total_losses"] += stats["losses"]
-                all_scores.extend(stats["scores"])
+                score_sum += stats["score_sum"]
+                score_count += stats["score_count"]
                 
-                cap_avg = sum(stats["scores"]) / len(stats["scores"]) if stats["scores"] else 0
+                cap_avg = stats["score_sum"] / stats["score_count"] if stats["score_count"] else 0
                 model_summary["by_capability"][cap_name] = {
                     "wins": stats["wins"],
                     "ties": stats["ties"],
@@ -292,9 +1041,12 @@ class BenchmarkEngine:
                     "avg_score": round(cap_avg, 2),
                 }
             
-            model_summary["avg_score"] = round(sum(all_scores) / len(all_scores), 2) if all_scores else 0
+            model_summary["avg_score"] = round(score_sum / score_count, 2) if score_count else 0
             summary["models"][model_name] = model_summary
         
+        # Pairwise records and Bradley-Terry / Elo ratings
+        summary.update(self.tournament.summary())
+        
         # Determine overall winner
         model_names = list(summary["models"].keys())
         if len(model_names) == 2:
@@ -305,6 +1057,12 @@ class BenchmarkEngine:
                 summary["overall_winner"] = m2
             else:
                 summary["overall_winner"] = "tie"
+        else:
+            # Highest Bradley-Terry rating; a shared top rating is a tie
+            ratings = summary["ratings"]["bradley_terry"]
+            best = max(ratings.values())
+            leaders = [name for name, rating in ratings.items() if rating == best]
+            summary["overall_winner"] = leaders[0] if len(leaders) == 1 else "tie"
         
         return summary
     
@@ -321,7 +1079,9 @@ class BenchmarkEngine:
         table.add_column("Ties", justify="right")
         table.add_column("Losses", justify="right")
         table.add_column("Avg Score", justify="right")
+        table.add_column("Rating", justify="right")
         
+        ratings = self.summary.get("ratings", {}).get("bradley_terry", {})
         for model_name, stats in self.summary["models"].items():
             table.add_row(
                 model_name,
@@ -329,6 +1089,7 @@ class BenchmarkEngine:
                 str(stats["total_ties"]),
                 str(stats["total_losses"]),
                 f"{stats['avg_score']:.2f}",
+                f"{ratings[model_name]:.0f}" if model_name in ratings else "-",
             )
         
         console.print(table)
@@ -339,26 +1100,176 @@ class BenchmarkEngine:
             console.print(f"\n[bold yellow]🏆 Winner: {winner}[/bold yellow]")
         else:
             console.print(f"\n[bold yellow]🤝 Result: Tie[/bold yellow]")
+        
+        adaptive = self.summary.get("adaptive")
+        if adaptive is not None:
+            console.print(
+                f"Adaptive judging: {len(adaptive['settled'])} pairs settled at "
+                f"{adaptive['confidence']:.0%} confidence, "
+                f"{adaptive['skipped_comparisons']} comparisons skipped"
+            )
+        
+        distributions = self.summary.get("distributions")
+        if distributions is not None:
+            latency_table = Table(title="Latency and Tokens")
+            latency_table.add_column("Model", style="cyan")
+            latency_table.add_column("p50 (ms)", justify="right")
+            latency_table.add_column("p90 (ms)", justify="right")
+            latency_table.add_column("p99 (ms)", justify="right")
+            latency_table.add_column("Tok/resp", justify="right")
+            latency_table.add_column("Tok/resp p90", justify="right")
+            latency_table.add_column("Tok/s p50", justify="right")
+            for model_name, stats in distributions["models"].items():
+                columns = (
+                    ("latency_ms", "p50"), ("latency_ms", "p90"), ("latency_ms", "p99"),
+                    ("tokens", "mean"), ("tokens", "p90"), ("tokens_per_sec", "p50"),
+                )
+                latency_table.add_row(model_name, *[
+                    f"{stats[metric][field]:.0f}"
+                    if stats.get(metric, {}).get(field) is not None else "-"
+                    for metric, field in columns
+                ])
+            console.print(latency_table)
+        
+        streaming = self.summary.get("streaming")
+        if streaming is not None:
+            stream_table = Table(title="Streaming Latency")
+            stream_table.add_column("Model", style="cyan")
+            stream_table.add_column("TTFT mean (ms)", justify="right")
+            stream_table.add_column("TTFT p95 (ms)", justify="right")
+            stream_table.add_column("ITL mean (ms)", justify="right")
+            stream_table.add_column("ITL p95 (ms)", justify="right")
+            stream_table.add_column("Decode tok/s", justify="right")
+            for model_name, stats in streaming["models"].items():
+                fields = (
+                    "ttft_ms_mean", "ttft_ms_p95", "itl_ms_mean", "itl_ms_p95",
+                    "decode_tokens_per_sec",
+                )
+                stream_table.add_row(model_name, *[
+                    f"{stats[field]:.1f}" if stats[field] is not None else "-" for field in fields
+                ])
+            console.print(stream_table)
+        
+        judge = self.summary.get("judge")
+        if judge is not None:
+            for method, stats in judge["methods"].items():
+                console.print(
+                    f"Judge ({method}): {stats['position_bias_rate']:.1%} position bias over "
+                    f"{stats['pairs']} pairs, {stats['judge_calls']} calls"
+                )
+            if "calibration" in judge:
+                console.print(
+                    f"Judge calibration: {judge['strategy']} agrees with swap on "
+                    f"{judge['calibration']['agreement_rate']:.0%} of "
+                    f"{judge['calibration']['pairs']} pairs"
+                )
+        
+        for cache_name, stats in self.summary.get("cache", {}).items():
+            lookups = stats["hits"] + stats["misses"]
+            console.print(
+                f"Cache ({cache_name}): {stats['hits']}/{lookups} hits "
+                f"({stats['hit_ratio']:.0%}), {stats['saved_tokens']} tokens saved"
+            )
+        
+        cost = self.summary.get("cost")
+        if cost is not None:
+            parts = [f"{name} ${stats['usd']:.4f}" for name, stats in cost["models"].items()]
+            parts.append(f"judge ${cost['judge']['usd']:.4f}")
+            console.print(f"Cost: ${cost['total_usd']:.4f} ({', '.join(parts)})")
+            if "unpriced" in cost:
+                unpriced = ", ".join(cost["unpriced"])
+                console.print(f"[yellow]No price for {unpriced} (set metrics.prices)[/yellow]")
+            budget = cost.get("budget")
+            if budget is not None and budget["stopped"]:
+                console.print(
+                    f"[yellow]Budget of ${budget['limit_usd']:.2f} reached: stopped after "
+                    f"{budget['cases_run']} cases (resume with a larger --budget)[/yellow]"
+                )
+        
+        tracing = self.summary.get("tracing")
+        if tracing is not None:
+            dropped = f", {tracing['dropped']} dropped" if tracing["dropped"] else ""
+            console.print(f"\nTrace: {tracing['spans']} spans{dropped}")
+            if "otlp_error" in tracing:
+                console.print(
+                    f"[yellow]Could not export spans to {self.config.tracing.otlp_endpoint}: "
+                    f"{tracing['otlp_error']}[/yellow]"
+                )
     
-    def get_full_results(self) -> Dict[str, Any]:
-        """Get complete benchmark results"""
+    def _open_sinks(self) -> None:
+        """Start streaming detailed results to the configured output formats"""
+        self.results = []
+        self.output_paths = []
+        self.sinks = self.reporter.open_sinks(
+            f"results_{self.start_time.strftime('%Y%m%d_%H%M%S')}"
+        )
+        if self.config.output.keep_results_in_memory:
+            self.sinks.append(MemorySink(self.results))
+        if self.config.output.store:
+            self.sinks.append(StoreSink(self.config.output.store))
+        
+        header = self._results_header()
+        for sink in self.sinks:
+            sink.open(header)
+    
+    def _close_sinks(self) -> None:
+        """Finish the streamed outputs and write the non-streaming report formats"""
+        footer = {
+            "duration_seconds": self.get_full_results()["duration_seconds"],
+            "summary": self.summary,
+        }
+        for sink in self.sinks:
+            path = sink.close(footer)
+            if path is not None:
+                self.output_paths.append(path)
+        self.sinks = []
+        
+        other_formats = [fmt for fmt in self.config.output.formats if fmt not in STREAMING_FORMATS]
+        if other_formats:
+            self.output_paths.extend(self.reporter.save(
+                self.get_full_results(),
+                formats=other_formats,
+                base_name=f"results_{self.start_time.strftime('%Y%m%d_%H%M%S')}",
+            ))
+    
+    def _results_header(self) -> Dict[str, Any]:
+        """Run metadata that precedes the detailed results"""
         return {
             "benchmark_id": self.benchmark_id,
             "benchmark_name": self.config.name,
             "timestamp": self.start_time.isoformat() if self.start_time else None,
-            "duration_seconds": (self.end_time - self.start_time).total_seconds() if self.end_time and self.start_time else None,
             "config": {
                 "domain": self.config.domain,
                 "capabilities": self.config.capabilities,
                 "models": [m.model_dump() for m in self.config.models],
                 "judge": self.config.judge.model_dump(),
             },
+        }
+    
+    def get_full_results(self) -> Dict[str, Any]:
+        """
+        Get complete benchmark results.
+        
+        detailed_results is only populated when output.keep_results_in_memory
+        is set (the default); otherwise the detailed results live in the
+        streamed files listed in output_paths.
+        """
+        return {
+            **self._results_header(),
+            "duration_seconds": (
+                (self.end_time - self.start_time).total_seconds()
+                if self.end_time and self.start_time
+                else None
+            ),
             "summary": self.summary,
-            "detailed_results": self.results if self.config.output.include_raw_responses else [],
+            "detailed_results": self.results,
         }
     
     def save_results(self, path: Optional[str] = None) -> str:
-        """Save results to file"""
+        """Save results to file (by default, return the file already streamed during the run)"""
+        if path is None and self.output_paths:
+            return self.output_paths[0]
+        
         if path is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             path = f"{self.config.output.directory}/results_{timestamp}.json"
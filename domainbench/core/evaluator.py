@@ -3,23 +3,32 @@ Evaluator - LLM-as-Judge evaluation with swap mitigation
 Based on the judge logic from waiterbench.py
 """
 
+import asyncio
+import hashlib
 import json
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Callable, Generator
 
-from domainbench.providers.base import BaseProvider
+from domainbench.core.cache import DiskCache, cache_key
+from domainbench.core.tracing import span
+from domainbench.providers.base import BaseProvider, async_chat_completion
 
 
-# Judge prompt returns STRICT JSON for easy parsing
-JUDGE_PROMPT_TEMPLATE = """You are evaluating two assistant responses in the role of: {role}
-
-Pick the better response based on:
+# Criteria shared by the judge prompts
+JUDGE_CRITERIA = """Pick the better response based on:
 1) Task accuracy & completeness
 2) Safe handling of constraints and edge cases
 3) Appropriate clarifying questions (ask when needed; avoid excessive questions)
 4) Natural, helpful tone (polite, concise, professional)
 5) Memory across turns (no contradictions; respects earlier constraints)
 6) Actionability (clear next steps; offers alternatives when needed)
+"""
+
+# Judge prompt returns STRICT JSON for easy parsing
+JUDGE_PROMPT_TEMPLATE = """You are evaluating two assistant responses in the role of: {role}
 
+""" + JUDGE_CRITERIA + """
 Return STRICT JSON (no markdown), schema exactly:
 {{"winner":"A"|"B"|"tie","score_A":0-10,"score_B":0-10,"reasons":[string,...]}}
 
@@ -33,6 +42,61 @@ Response B:
 {response_b}
 """
 
+# Single-call prompt: both orderings of the pair, judged in one structured response
+DUAL_JUDGE_PROMPT_TEMPLATE = """You are evaluating two assistant responses in the role of: {role}
+
+""" + JUDGE_CRITERIA + """
+The same two responses are shown twice with their labels swapped. Judge each comparison
+on its own labels, independently of the order the responses appear in.
+
+Return STRICT JSON (no markdown), schema exactly:
+{{"comparison_1":{{"winner":"A"|"B"|"tie","score_A":0-10,"score_B":0-10}},"comparison_2":{{"winner":"A"|"B"|"tie","score_A":0-10,"score_B":0-10}},"reasons":[string,...]}}
+
+Conversation (multi-turn user messages):
+{conversation}
+
+Comparison 1
+Response A:
+{response_a}
+
+Response B:
+{response_b}
+
+Comparison 2
+Response A:
+{response_b}
+
+Response B:
+{response_a}
+"""
+
+# swap: both orderings as two serial calls; concurrent: the same two calls at once;
+# single: one call that scores both orderings
+JUDGE_STRATEGIES = ("swap", "concurrent", "single")
+
+# A judge exchange yields the messages of each judge call, is sent the provider's
+# response and returns the verdict; _drive and _adrive only differ in how they call
+JudgeExchange = Generator[List[Dict[str, str]], Dict[str, Any], Any]
+
+# Role the judge is told the responses play, unless a caller overrides it
+DEFAULT_JUDGE_ROLE = "a helpful assistant"
+
+# Changing the template invalidates cached verdicts
+JUDGE_TEMPLATE_HASH = hashlib.sha256(JUDGE_PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:16]
+DUAL_JUDGE_TEMPLATE_HASH = hashlib.sha256(
+    DUAL_JUDGE_PROMPT_TEMPLATE.encode("utf-8")
+).hexdigest()[:16]
+
+
+def resolve_judge_strategy(strategy: str, fan_out: bool) -> str:
+    """
+    Strategy a run actually judges with.
+    
+    Fanned-out runs overlap the two swap orderings: the verdicts are those of
+    the swap strategy, only the calls run concurrently.
+    """
+    return "concurrent" if fan_out and strategy == "swap" else strategy
+
 
 def safe_json_loads(s: str) -> Optional[dict]:
     """Best-effort strict JSON parsing; returns None if not parseable."""
@@ -109,6 +173,79 @@ def swap_mitigated_winner(j_ab: dict, j_ba: dict) -> str:
     return w1 if w1 == w2_mapped else "tie"
 
 
+def _parse_verdict(obj: Optional[dict]) -> Optional[dict]:
+    """Normalized single-ordering verdict, or None when the output was not JSON"""
+    return normalize_judge_result(obj) if obj is not None else None
+
+
+def split_dual_verdict(obj: dict) -> Optional[Tuple[dict, dict]]:
+    """Split single-call judge JSON into the A/B and swapped B/A verdicts; None if malformed."""
+    if not isinstance(obj, dict):
+        return None
+    first, second = obj.get("comparison_1"), obj.get("comparison_2")
+    if not isinstance(first, dict) or not isinstance(second, dict):
+        return None
+    reasons = obj.get("reasons", [])
+    return (
+        normalize_judge_result({**first, "reasons": reasons}),
+        normalize_judge_result({**second, "reasons": reasons}),
+    )
+
+
+class JudgeStats:
+    """
+    Position-bias counters per judging method.
+    
+    A pair counts as position-biased when its two orderings, mapped back to
+    the original labels, disagree on the winner. Calibration pairs are
+    judged by both the configured strategy and the two-call swap method, so
+    their rates can be compared on the same pairs.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.methods: Dict[str, Dict[str, int]] = {}
+        self.calibration = {"pairs": 0, "agreements": 0}
+    
+    def record(self, method: str, j_ab: dict, j_ba: dict, calls: int) -> None:
+        # Map the swapped verdict back to the original labels
+        biased = {"A": "B", "B": "A"}.get(j_ba["winner"], "tie") != j_ab["winner"]
+        with self._lock:
+            counts = self.methods.setdefault(method, {"pairs": 0, "biased": 0, "judge_calls": 0})
+            counts["pairs"] += 1
+            counts["biased"] += int(biased)
+            counts["judge_calls"] += calls
+    
+    def record_calibration(self, winner: str, swap_winner: str) -> None:
+        with self._lock:
+            self.calibration["pairs"] += 1
+            self.calibration["agreements"] += int(winner == swap_winner)
+    
+    def summary(self, strategy: str) -> Optional[Dict[str, Any]]:
+        if not self.methods:
+            return None
+        with self._lock:
+            summary = {
+                "strategy": strategy,
+                "methods": {
+                    method: {
+                        "pairs": counts["pairs"],
+                        "judge_calls": counts["judge_calls"],
+                        "position_bias_rate": round(counts["biased"] / counts["pairs"], 4),
+                    }
+                    for method, counts in self.methods.items()
+                },
+            }
+            if self.calibration["pairs"]:
+                summary["calibration"] = {
+                    "pairs": self.calibration["pairs"],
+                    "agreement_rate": round(
+                        self.calibration["agreements"] / self.calibration["pairs"], 4
+                    ),
+                }
+        return summary
+
+
 class Evaluator:
     """Base evaluator interface"""
     
@@ -122,21 +259,42 @@ class JudgeEvaluator(Evaluator):
     LLM-as-Judge evaluator with swap-order mitigation.
     
     Uses another LLM to compare two responses and determine which is better.
-    Runs comparison twice with swapped order to mitigate position bias.
+    Every pair is judged in both orderings to mitigate position bias; the
+    strategy decides how (see JUDGE_STRATEGIES). With the single strategy and
+    calibration_rate set, that fraction of pairs is also judged with the
+    two-call swap method so both position-bias rates can be compared on the
+    same pairs (see stats).
     """
     
-    def __init__(self, provider: BaseProvider, model: str, max_retries: int = 2):
+    def __init__(
+        self,
+        provider: BaseProvider,
+        model: str,
+        max_retries: int = 2,
+        cache: Optional[DiskCache] = None,
+        strategy: str = "swap",
+        calibration_rate: float = 0.0,
+        max_workers: int = 4,
+    ):
+        if strategy not in JUDGE_STRATEGIES:
+            raise ValueError(f"Unknown judge strategy: {strategy}")
         self.provider = provider
         self.model = model
         self.max_retries = max_retries
+        self.cache = cache
+        self.strategy = strategy
+        self.calibration_rate = calibration_rate
+        self.max_workers = max(1, max_workers)
+        self.stats = JudgeStats()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
     
     def evaluate_pair(
         self,
         conversation: List[str],
         response_a: str,
         response_b: str,
-        system_prompt: str = "",
-        role: str = "a helpful assistant",
+        role: str = DEFAULT_JUDGE_ROLE,
     ) -> Dict[str, Any]:
         """
         Evaluate two responses with swap-order mitigation.
@@ -145,33 +303,94 @@ class JudgeEvaluator(Evaluator):
             Dict with winner ("A", "B", or "tie"), scores, and reasons
         """
         # Format conversation
-        conv_text = "\n".join([f"USER[{i+1}]: {t}" for i, t in enumerate(conversation)])
+        conv_text = format_conversation(conversation)
         
-        # First comparison: A vs B
-        j_ab = self._judge_once(conv_text, response_a, response_b, role)
+        if self.strategy == "single":
+            j_ab, j_ba = self._judge_both(conv_text, response_a, response_b, role)
+        elif self.strategy == "concurrent":
+            # Swapped ordering on the judge pool while this thread judges A vs B
+            future = self._pool().submit(self._judge_once, conv_text, response_b, response_a, role)
+            j_ab = self._judge_once(conv_text, response_a, response_b, role)
+            j_ba = future.result()
+        else:
+            j_ab = self._judge_once(conv_text, response_a, response_b, role)
+            j_ba = self._judge_once(conv_text, response_b, response_a, role)
         
-        # Second comparison: B vs A (swapped)
-        j_ba = self._judge_once(conv_text, response_b, response_a, role)
+        result = self._record(j_ab, j_ba)
         
-        # Apply swap mitigation
-        final_winner = swap_mitigated_winner(j_ab, j_ba)
+        if self._calibrate(conv_text, response_a, response_b):
+            swap_ab = self._judge_once(conv_text, response_a, response_b, role)
+            swap_ba = self._judge_once(conv_text, response_b, response_a, role)
+            self._record_calibration(result, swap_ab, swap_ba)
         
-        # Average scores (accounting for swap)
-        avg_score_a = (j_ab["score_A"] + j_ba["score_B"]) / 2
-        avg_score_b = (j_ab["score_B"] + j_ba["score_A"]) / 2
+        return result
+    
+    async def aevaluate_pair(
+        self,
+        conversation: List[str],
+        response_a: str,
+        response_b: str,
+        role: str = DEFAULT_JUDGE_ROLE,
+    ) -> Dict[str, Any]:
+        """Async variant of evaluate_pair for use on an event loop"""
+        conv_text = format_conversation(conversation)
         
-        # Combine reasons
-        all_reasons = j_ab["reasons"] + j_ba["reasons"]
-        unique_reasons = list(dict.fromkeys(all_reasons))[:6]  # Dedupe and limit
+        if self.strategy == "single":
+            j_ab, j_ba = await self._ajudge_both(conv_text, response_a, response_b, role)
+        elif self.strategy == "concurrent":
+            j_ab, j_ba = await asyncio.gather(
+                self._ajudge_once(conv_text, response_a, response_b, role),
+                self._ajudge_once(conv_text, response_b, response_a, role),
+            )
+        else:
+            j_ab = await self._ajudge_once(conv_text, response_a, response_b, role)
+            j_ba = await self._ajudge_once(conv_text, response_b, response_a, role)
         
-        return {
-            "winner": final_winner,
-            "score_A": round(avg_score_a, 1),
-            "score_B": round(avg_score_b, 1),
-            "reasons": unique_reasons,
-            "raw_ab": j_ab,
-            "raw_ba": j_ba,
-        }
+        result = self._record(j_ab, j_ba)
+        
+        if self._calibrate(conv_text, response_a, response_b):
+            swap_ab = await self._ajudge_once(conv_text, response_a, response_b, role)
+            swap_ba = await self._ajudge_once(conv_text, response_b, response_a, role)
+            self._record_calibration(result, swap_ab, swap_ba)
+        
+        return result
+    
+    def _record(self, j_ab: dict, j_ba: dict) -> Dict[str, Any]:
+        """Count the pair's position bias under the configured strategy and combine its verdicts"""
+        calls = 1 if self.strategy == "single" else 2
+        self.stats.record(self.strategy, j_ab, j_ba, calls)
+        return combine_swapped_verdicts(j_ab, j_ba)
+    
+    def _calibrate(self, conversation: str, response_a: str, response_b: str) -> bool:
+        """Whether this pair is also judged with the two-call method (stable per pair)"""
+        if self.strategy != "single" or self.calibration_rate <= 0:
+            return False
+        digest = hashlib.sha256(
+            "\x00".join([conversation, response_a, response_b]).encode("utf-8")
+        ).hexdigest()
+        return int(digest[:8], 16) / 0xFFFFFFFF < self.calibration_rate
+    
+    def _record_calibration(self, result: Dict[str, Any], swap_ab: dict, swap_ba: dict) -> None:
+        # Calibration calls are billed with the pair they calibrate
+        result["usage"] = _sum_usage([{"usage": result["usage"]}, swap_ab, swap_ba])
+        self.stats.record("swap", swap_ab, swap_ba, 2)
+        self.stats.record_calibration(result["winner"], swap_mitigated_winner(swap_ab, swap_ba))
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        """Thread pool for the swapped orderings of the concurrent strategy"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="domainbench-judge"
+                )
+            return self._executor
+    
+    def close(self) -> None:
+        """Shut down the concurrent strategy's thread pool"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
     
     def _judge_once(
         self,
@@ -181,42 +400,383 @@ class JudgeEvaluator(Evaluator):
         role: str,
     ) -> dict:
         """Run a single judge comparison"""
-        prompt = JUDGE_PROMPT_TEMPLATE.format(
-            role=role,
-            conversation=conversation,
-            response_a=response_a,
-            response_b=response_b,
-        )
+        with span("judge.judge_once", role=role):
+            return self._drive(self._verdict_exchange(conversation, response_a, response_b, role))
+    
+    async def _ajudge_once(
+        self,
+        conversation: str,
+        response_a: str,
+        response_b: str,
+        role: str,
+    ) -> dict:
+        """Async variant of _judge_once"""
+        with span("judge.judge_once", role=role):
+            return await self._adrive(
+                self._verdict_exchange(conversation, response_a, response_b, role)
+            )
+    
+    def _judge_both(
+        self,
+        conversation: str,
+        response_a: str,
+        response_b: str,
+        role: str,
+    ) -> Tuple[dict, dict]:
+        """Judge both orderings in a single call; returns the A/B and B/A verdicts"""
+        with span("judge.judge_both", role=role):
+            return self._drive(
+                self._dual_verdict_exchange(conversation, response_a, response_b, role)
+            )
+    
+    async def _ajudge_both(
+        self,
+        conversation: str,
+        response_a: str,
+        response_b: str,
+        role: str,
+    ) -> Tuple[dict, dict]:
+        """Async variant of _judge_both"""
+        with span("judge.judge_both", role=role):
+            return await self._adrive(
+                self._dual_verdict_exchange(conversation, response_a, response_b, role)
+            )
+    
+    def _drive(self, exchange: JudgeExchange) -> Any:
+        """Run a judge exchange to completion with blocking provider calls"""
+        try:
+            messages = next(exchange)
+            while True:
+                response = self.provider.chat_completion(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.0,
+                )
+                messages = exchange.send(response)
+        except StopIteration as done:
+            return done.value
+    
+    async def _adrive(self, exchange: JudgeExchange) -> Any:
+        """Run a judge exchange to completion on the event loop"""
+        try:
+            messages = next(exchange)
+            while True:
+                response = await async_chat_completion(
+                    self.provider,
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.0,
+                )
+                messages = exchange.send(response)
+        except StopIteration as done:
+            return done.value
+    
+    def _verdict_exchange(
+        self,
+        conversation: str,
+        response_a: str,
+        response_b: str,
+        role: str,
+    ) -> JudgeExchange:
+        """Judge one ordering, serving and storing the verdict through the cache"""
+        key = self._verdict_cache_key(conversation, response_a, response_b, role)
+        cached = self._cached_verdict(key)
+        if cached is not None:
+            return cached
         
-        messages = [{"role": "user", "content": prompt}]
-        last_text = ""
+        transport = _new_transport_stats()
+        messages = build_judge_messages(conversation, response_a, response_b, role)
+        verdict, last_text = yield from self._ask_for_json(messages, transport, _parse_verdict)
+        if verdict is None:
+            return {**unparseable_judge_result(last_text), **transport}
+        self._store_verdict(key, verdict, transport)
+        return {**verdict, **transport}
+    
+    def _dual_verdict_exchange(
+        self,
+        conversation: str,
+        response_a: str,
+        response_b: str,
+        role: str,
+    ) -> JudgeExchange:
+        """Judge both orderings in one prompt, serving and storing the verdicts through the cache"""
+        key = self._dual_cache_key(conversation, response_a, response_b, role)
+        cached = self._cached_dual_verdict(key)
+        if cached is not None:
+            return cached
+        
+        transport = _new_transport_stats()
+        messages = build_dual_judge_messages(conversation, response_a, response_b, role)
+        verdicts, last_text = yield from self._ask_for_json(messages, transport, split_dual_verdict)
+        if verdicts is None:
+            fallback = unparseable_judge_result(last_text)
+            return {**fallback, **transport}, fallback
+        return self._store_dual_verdict(key, verdicts, transport)
+    
+    def _ask_for_json(
+        self,
+        messages: List[Dict[str, str]],
+        transport: Dict[str, Any],
+        parse: Callable[[Optional[dict]], Any],
+    ) -> Generator[List[Dict[str, str]], Dict[str, Any], Tuple[Any, str]]:
+        """
+        Request judge output until parse accepts it, nudging for strict JSON in between.
         
+        Yields the messages of each judge call and is sent the provider's
+        response. Returns the parsed output (None after max_retries failed
+        nudges) and the last raw text.
+        """
+        text = ""
         for attempt in range(self.max_retries + 1):
-            response = self.provider.chat_completion(
-                model=self.model,
-                messages=messages,
-                temperature=0.0,
-            )
+            response = yield messages
+            _add_transport_stats(transport, response)
             text = response.get("content", "")
-            last_text = text
             
-            obj = safe_json_loads(text)
-            if obj is not None:
-                return normalize_judge_result(obj)
+            with span("judge.parse_json"):
+                parsed = parse(safe_json_loads(text))
+            if parsed is not None:
+                return parsed, text
             
-            # Nudge to output strict JSON only
-            messages.append({"role": "assistant", "content": text})
-            messages.append({
-                "role": "user", 
-                "content": "Your previous output was not valid JSON. Output ONLY strict JSON per the schema."
-            })
+            _nudge_for_json(messages, text)
         
-        return {
-            "winner": "tie",
-            "score_A": 0,
-            "score_B": 0,
-            "reasons": [f"Judge output not parseable as JSON. Last: {last_text[:200]}"]
-        }
+        return None, text
+    
+    def cached_judgement(
+        self,
+        conversation: str,
+        response_a: str,
+        response_b: str,
+        role: str,
+    ) -> Optional[dict]:
+        """Cached verdict for one ordering, if any"""
+        return self._cached_verdict(
+            self._verdict_cache_key(conversation, response_a, response_b, role)
+        )
+    
+    def judgement_from_response(
+        self,
+        conversation: str,
+        response_a: str,
+        response_b: str,
+        role: str,
+        response: Optional[Dict[str, Any]],
+    ) -> dict:
+        """
+        Verdict for one ordering from an already completed judge response (e.g. a batch result).
+        
+        Falls back to interactive judging, with JSON nudges, when the response
+        is missing, failed or not parseable.
+        """
+        if response is not None and "error" not in response:
+            obj = safe_json_loads(response.get("content", ""))
+            if obj is not None:
+                transport = _new_transport_stats()
+                _add_transport_stats(transport, response)
+                verdict = normalize_judge_result(obj)
+                key = self._verdict_cache_key(conversation, response_a, response_b, role)
+                self._store_verdict(key, verdict, transport)
+                return {**verdict, **transport, "batch": True}
+        
+        return self._judge_once(conversation, response_a, response_b, role)
+    
+    def _verdict_cache_key(
+        self,
+        conversation: str,
+        response_a: str,
+        response_b: str,
+        role: str,
+    ) -> Optional[str]:
+        """Content address of one judge ordering, or None when caching is off"""
+        if self.cache is None:
+            return None
+        return cache_key(
+            self.provider.name,
+            self.model,
+            JUDGE_TEMPLATE_HASH,
+            role,
+            conversation,
+            response_a,
+            response_b,
+        )
+    
+    def _dual_cache_key(
+        self,
+        conversation: str,
+        response_a: str,
+        response_b: str,
+        role: str,
+    ) -> Optional[str]:
+        """Content address of a single-call verdict pair, or None when caching is off"""
+        if self.cache is None:
+            return None
+        return cache_key(
+            self.provider.name,
+            self.model,
+            DUAL_JUDGE_TEMPLATE_HASH,
+            role,
+            conversation,
+            response_a,
+            response_b,
+        )
+    
+    def _cached_dual_verdict(self, key: Optional[str]) -> Optional[Tuple[dict, dict]]:
+        """Serve a single-call verdict pair from the judge cache"""
+        entry = self._cached_verdict(key)
+        if entry is None:
+            return None
+        hit = {"retries": 0, "backoff_seconds": 0.0, "cached": True}
+        return {**entry["ab"], **hit}, {**entry["ba"], **hit}
+    
+    def _store_dual_verdict(
+        self,
+        key: Optional[str],
+        verdicts: Tuple[dict, dict],
+        transport: Dict[str, Any],
+    ) -> Tuple[dict, dict]:
+        """Cache a single-call verdict pair; the call's transport stats go on the A/B verdict"""
+        j_ab, j_ba = verdicts
+        self._store_verdict(key, {"ab": j_ab, "ba": j_ba}, transport)
+        return {**j_ab, **transport}, j_ba
+    
+    def _cached_verdict(self, key: Optional[str]) -> Optional[dict]:
+        """Serve a verdict from the judge cache"""
+        if key is None:
+            return None
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        return {**entry, "retries": 0, "backoff_seconds": 0.0, "cached": True}
+    
+    def _store_verdict(self, key: Optional[str], verdict: dict, transport: Dict[str, Any]) -> None:
+        """Cache a parsed verdict (fallback ties from unparseable output are never cached)"""
+        if key is None:
+            return
+        self.cache.put(key, {**verdict, "usage": transport["usage"]})
+
+
+def format_conversation(conversation: List[str]) -> str:
+    """Format multi-turn user messages for the judge prompt"""
+    return "\n".join([f"USER[{i+1}]: {t}" for i, t in enumerate(conversation)])
+
+
+def build_judge_messages(
+    conversation: str,
+    response_a: str,
+    response_b: str,
+    role: str,
+) -> List[Dict[str, str]]:
+    """Build the judge chat messages for one ordering of a response pair"""
+    prompt = JUDGE_PROMPT_TEMPLATE.format(
+        role=role,
+        conversation=conversation,
+        response_a=response_a,
+        response_b=response_b,
+    )
+    return [{"role": "user", "content": prompt}]
+
+
+def build_dual_judge_messages(
+    conversation: str,
+    response_a: str,
+    response_b: str,
+    role: str,
+) -> List[Dict[str, str]]:
+    """Build the single-call judge messages covering both orderings of a response pair"""
+    prompt = DUAL_JUDGE_PROMPT_TEMPLATE.format(
+        role=role,
+        conversation=conversation,
+        response_a=response_a,
+        response_b=response_b,
+    )
+    return [{"role": "user", "content": prompt}]
+
+
+def _new_transport_stats() -> Dict[str, Any]:
+    return {
+        "retries": 0,
+        "backoff_seconds": 0.0,
+        "usage": {
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+            "cached_tokens": 0,
+        },
+    }
+
+
+def _add_transport_stats(transport: Dict[str, Any], response: Dict[str, Any]) -> None:
+    """Accumulate retry counts and token usage reported on a judge response"""
+    transport["retries"] += response.get("retries", 0)
+    transport["backoff_seconds"] += response.get("backoff_seconds", 0.0)
+    for field, count in response.get("usage", {}).items():
+        if field in transport["usage"] and count:
+            transport["usage"][field] += count
+
+
+def _sum_usage(verdicts: List[dict]) -> Dict[str, int]:
+    """Token usage of the judge calls behind some verdicts (cache hits cost nothing)"""
+    usage = _new_transport_stats()["usage"]
+    for verdict in verdicts:
+        if verdict.get("cached"):
+            continue
+        for field, count in verdict.get("usage", {}).items():
+            if field in usage and count:
+                usage[field] += count
+    return usage
+
+
+def _nudge_for_json(messages: List[Dict[str, str]], text: str) -> None:
+    """Append a follow-up asking the judge to output strict JSON only"""
+    messages.append({"role": "assistant", "content": text})
+    messages.append({
+        "role": "user", 
+        "content": (
+            "Your previous output was not valid JSON. Output ONLY strict JSON per the schema."
+        ),
+    })
+
+
+def unparseable_judge_result(last_text: str) -> dict:
+    """Fallback verdict when the judge never produced valid JSON"""
+    return {
+        "winner": "tie",
+        "score_A": 0,
+        "score_B": 0,
+        "reasons": [f"Judge output not parseable as JSON. Last: {last_text[:200]}"]
+    }
+
+
+def combine_swapped_verdicts(j_ab: dict, j_ba: dict) -> Dict[str, Any]:
+    """
+    Merge the A/B and swapped B/A verdicts into a final result.
+    
+    Returns:
+        Dict with winner ("A", "B", or "tie"), scores, and reasons
+    """
+    # Apply swap mitigation
+    final_winner = swap_mitigated_winner(j_ab, j_ba)
+    
+    # Average scores (accounting for swap)
+    avg_score_a = (j_ab["score_A"] + j_ba["score_B"]) / 2
+    avg_score_b = (j_ab["score_B"] + j_ba["score_A"]) / 2
+    
+    # Combine reasons
+    all_reasons = j_ab["reasons"] + j_ba["reasons"]
+    unique_reasons = list(dict.fromkeys(all_reasons))[:6]  # Dedupe and limit
+    
+    return {
+        "winner": final_winner,
+        "score_A": round(avg_score_a, 1),
+        "score_B": round(avg_score_b, 1),
+        "reasons": unique_reasons,
+        "retries": j_ab.get("retries", 0) + j_ba.get("retries", 0),
+        "cached": bool(j_ab.get("cached") and j_ba.get("cached")),
+        "backoff_ms": (j_ab.get("backoff_seconds", 0.0) + j_ba.get("backoff_seconds", 0.0)) * 1000,
+        "usage": _sum_usage([j_ab, j_ba]),
+        "batch": bool(j_ab.get("batch") and j_ba.get("batch")),
+        "raw_ab": j_ab,
+        "raw_ba": j_ba,
+    }
 
 
 class RuleBasedEvaluator(Evaluator):
@@ -0,0 +1,268 @@
+"""
+Metrics - Latency and token distributions, and streaming latency metrics
+"""
+
+import math
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_HISTOGRAM_MS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Linearly interpolated q-th percentile (0-100) of values, or None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error.
+    
+    Values are counted in log-spaced buckets (as in HDR histograms and
+    DDSketch) whose bounds grow by gamma = (1 + a) / (1 - a), so every
+    quantile is within relative accuracy a of the exact value while memory
+    grows only with log(max / min), not with the number of values. Values
+    of zero or below share one bucket.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        self._non_positive = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+    
+    def add(self, value: float) -> None:
+        if value > 0:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+        else:
+            self._non_positive += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch with the same relative accuracy into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, n in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + n
+        self._non_positive += other._non_positive
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+    
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+    
+    def _value(self, index: int) -> float:
+        """Representative value of a bucket (relative error at most a)"""
+        return 2 * self._gamma ** index / (self._gamma + 1)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated q-quantile (0-1), or None if the sketch is empty"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._non_positive
+        if rank < seen:
+            return self.min
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+    
+    def histogram(self, bounds: Tuple[float, ...]) -> List[int]:
+        """
+        Counts per bucket of (previous bound, bound], plus a final bucket
+        above the last bound. Bucket edges are resolved to the sketch's
+        relative accuracy.
+        """
+        counts = [0] * (len(bounds) + 1)
+        counts[0] += self._non_positive
+        for index, n in self._buckets.items():
+            value = self._value(index)
+            slot = next((i for i, bound in enumerate(bounds) if value <= bound), len(bounds))
+            counts[slot] += n
+        return counts
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": _round(self.mean),
+            "p50": _round(self.quantile(0.5)),
+            "p90": _round(self.quantile(0.9)),
+            "p99": _round(self.quantile(0.99)),
+            "max": _round(self.max),
+        }
+
+
+class DistributionStats:
+    """
+    Latency and token distributions per model, capability and category.
+    
+    Each response record feeds latency_ms (wall time of the call), tokens
+    (total tokens per response) and tokens_per_sec (completion tokens over
+    the call's wall time) into quantile sketches, so p50/p90/p99 cost the
+    same memory for a hundred responses as for millions. Cache hits replay
+    an old latency and batch results have none, so both count towards
+    tokens only.
+    """
+    
+    def __init__(self, latency: bool = True, tokens: bool = True):
+        self.latency = latency
+        self.tokens = tokens
+        self._lock = threading.Lock()
+        self._groups: Dict[Tuple[str, Optional[str], Optional[str]], Dict[str, QuantileSketch]] = {}
+    
+    def _values(self, response: Dict[str, Any]) -> Dict[str, float]:
+        values: Dict[str, float] = {}
+        latency_ms = None if response.get("cached") else response.get("latency_ms")
+        if self.latency and latency_ms is not None:
+            values["latency_ms"] = latency_ms
+        if self.tokens:
+            values["tokens"] = response.get("tokens") or 0
+            completion = response.get("completion_tokens")
+            if latency_ms and completion:
+                values["tokens_per_sec"] = completion / (latency_ms / 1000)
+        return values
+    
+    def record(self, model: str, capability: str, category: str, response: Dict[str, Any]) -> None:
+        """Fold one response record into its model, capability and category groups"""
+        values = self._values(response)
+        if not values:
+            return
+        with self._lock:
+            for key in (
+                (model, None, None),
+                (model, "capability", capability),
+                (model, "category", category),
+            ):
+                group = self._groups.setdefault(key, {})
+                for metric, value in values.items():
+                    group.setdefault(metric, QuantileSketch()).add(value)
+    
+    def summary(self) -> Optional[Dict[str, Any]]:
+        if not self._groups:
+            return None
+        summary: Dict[str, Any] = {"models": {}, "by_capability": {}, "by_category": {}}
+        with self._lock:
+            for (model, kind, name), group in self._groups.items():
+                stats = {metric: sketch.summary() for metric, sketch in group.items()}
+                if kind is None:
+                    summary["models"][model] = stats
+                else:
+                    summary[f"by_{kind}"].setdefault(name, {})[model] = stats
+            
+            # Latency histogram per model
+            histograms = {
+                model: group["latency_ms"].histogram(LATENCY_HISTOGRAM_MS)
+                for (model, kind, _), group in self._groups.items()
+                if kind is None and "latency_ms" in group
+            }
+        if histograms:
+            summary["latency_histogram"] = {
+                "bounds_ms": list(LATENCY_HISTOGRAM_MS),
+                "counts": histograms,
+            }
+        return summary
+
+
+def stream_metrics(stream: Dict[str, Any], completion_tokens: Optional[int]) -> Dict[str, Any]:
+    """
+    Per-response streaming metrics from a provider's StreamTimer result.
+    
+    ttft_ms is the time to the first content chunk; itl_mean_ms and
+    itl_p95_ms summarize the gaps between chunks; decode_tokens_per_sec is
+    the completion tokens after the first, over the time from first to last
+    chunk (chunks stand in for tokens when usage is missing).
+    """
+    gaps = stream.get("gaps_ms", [])
+    decode_ms = sum(gaps)
+    tokens = completion_tokens or stream.get("chunks", 0)
+    throughput = (tokens - 1) / (decode_ms / 1000) if decode_ms > 0 and tokens > 1 else None
+    return {
+        "ttft_ms": _round(stream.get("ttft_ms")),
+        "itl_mean_ms": _round(decode_ms / len(gaps) if gaps else None),
+        "itl_p95_ms": _round(percentile(gaps, 95)),
+        "decode_tokens_per_sec": _round(throughput),
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+class StreamStats:
+    """
+    Aggregates per-response streaming metrics per model and per category.
+    
+    For each group the summary reports the mean and p95 of TTFT across
+    responses, and the means of the per-response inter-token latency
+    (mean and p95) and decode throughput. Cache hits carry no stream
+    timings and are skipped.
+    """
+    
+    FIELDS = ("ttft_ms", "itl_mean_ms", "itl_p95_ms", "decode_tokens_per_sec")
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._groups: Dict[Tuple[str, Optional[str]], Dict[str, QuantileSketch]] = {}
+    
+    def record(self, model: str, category: str, response: Dict[str, Any]) -> None:
+        """Fold one response record (with stream_metrics fields) into its groups"""
+        if response.get("ttft_ms") is None:
+            return
+        with self._lock:
+            for key in ((model, None), (model, category)):
+                group = self._groups.setdefault(
+                    key, {field: QuantileSketch() for field in self.FIELDS}
+                )
+                for field, sketch in group.items():
+                    if response.get(field) is not None:
+                        sketch.add(response[field])
+    
+    def summary(self) -> Optional[Dict[str, Any]]:
+        if not self._groups:
+            return None
+        summary: Dict[str, Any] = {"models": {}, "by_category": {}}
+        with self._lock:
+            for (model, category), group in self._groups.items():
+                stats = _group_summary(group)
+                if category is None:
+                    summary["models"][model] = stats
+                else:
+                    summary["by_category"].setdefault(category, {})[model] = stats
+        return summary
+
+
+def _group_summary(group: Dict[str, QuantileSketch]) -> Dict[str, Any]:
+    """Summary stats for one model (or model and category)"""
+    ttft = group["ttft_ms"]
+    return {
+        "responses": ttft.count,
+        "ttft_ms_mean": _round(ttft.mean),
+        "ttft_ms_p95": _round(ttft.quantile(0.95)),
+        "itl_ms_mean": _round(group["itl_mean_ms"].mean),
+        "itl_ms_p95": _round(group["itl_p95_ms"].mean),
+        "decode_tokens_per_sec": _round(group["decode_tokens_per_sec"].mean),
+    }
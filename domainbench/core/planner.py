@@ -0,0 +1,365 @@
+"""
+Planner - Project the calls, tokens, cost and wall time of a run without calling any provider
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+
+from domainbench.core.config import BenchmarkConfig, ModelConfig
+from domainbench.core.cost import PriceTable
+from domainbench.core.evaluator import (
+    DEFAULT_JUDGE_ROLE,
+    build_dual_judge_messages,
+    build_judge_messages,
+    format_conversation,
+    resolve_judge_strategy,
+)
+from domainbench.core.tournament import PairScheduler
+from domainbench.providers.ratelimit import estimate_tokens
+
+
+# Completion lengths assumed per call (capped by max_tokens when a model sets it)
+ESTIMATED_COMPLETION_TOKENS = 300
+ESTIMATED_VERDICT_TOKENS = 150
+ESTIMATED_DUAL_VERDICT_TOKENS = 250
+
+# Latency model used without history: request overhead plus decode time
+DEFAULT_OVERHEAD_MS = 600.0
+DEFAULT_MS_PER_TOKEN = 20.0  # ~50 tokens/sec
+
+
+def estimate_latency_ms(completion_tokens: float) -> float:
+    """Rough per-call latency for a completion of this length"""
+    return DEFAULT_OVERHEAD_MS + completion_tokens * DEFAULT_MS_PER_TOKEN
+
+
+class _Role:
+    """Projected calls, tokens and cost of one candidate model or the judge"""
+    
+    def __init__(self, provider: str, model: str, latency_ms: Optional[float]):
+        self.provider = provider
+        self.model = model
+        self.history_latency_ms = latency_ms
+        self.calls = 0.0
+        self.prompt_tokens = 0.0
+        self.completion_tokens = 0.0
+        self.cost: Optional[float] = 0.0
+    
+    def add(
+        self, calls: float, prompt_tokens: float, completion_tokens: float, cost: Optional[float]
+    ) -> None:
+        self.calls += calls
+        self.prompt_tokens += prompt_tokens * calls
+        self.completion_tokens += completion_tokens * calls
+        if cost is None or self.cost is None:
+            self.cost = None
+        else:
+            self.cost += cost * calls
+    
+    def latency_ms(self, completion_tokens: float) -> float:
+        if self.history_latency_ms is not None:
+            return self.history_latency_ms
+        return estimate_latency_ms(completion_tokens)
+    
+    def summary(self) -> Dict[str, Any]:
+        completion = self.completion_tokens / self.calls if self.calls else 0
+        return {
+            "calls": round(self.calls),
+            "prompt_tokens": round(self.prompt_tokens),
+            "completion_tokens": round(self.completion_tokens),
+            "cost_usd": round(self.cost, 4) if self.cost is not None else None,
+            "latency_ms": round(self.latency_ms(completion)),
+            "latency_source": "history" if self.history_latency_ms is not None else "estimate",
+        }
+
+
+def _completion_estimate(model_config: ModelConfig) -> int:
+    if model_config.max_tokens:
+        return min(model_config.max_tokens, ESTIMATED_COMPLETION_TOKENS)
+    return ESTIMATED_COMPLETION_TOKENS
+
+
+def _judge_calls(
+    conversation: str,
+    strategy: str,
+    calibration: float,
+) -> List[Tuple[float, int, int]]:
+    """Judge calls per pair as (calls, prompt tokens without responses, verdict tokens)"""
+    single_prompt = estimate_tokens(build_judge_messages(conversation, "", "", DEFAULT_JUDGE_ROLE))
+    if strategy != "single":
+        return [(2.0, single_prompt, ESTIMATED_VERDICT_TOKENS)]
+    
+    dual_messages = build_dual_judge_messages(conversation, "", "", DEFAULT_JUDGE_ROLE)
+    dual_prompt = estimate_tokens(dual_messages)
+    calls = [(1.0, dual_prompt, ESTIMATED_DUAL_VERDICT_TOKENS)]
+    if calibration:
+        calls.append((2 * calibration, single_prompt, ESTIMATED_VERDICT_TOKENS))
+    return calls
+
+
+class CaseCostEstimator:
+    """
+    Pre-run dollar estimate of a single test case, sized as plan_run sizes it.
+    
+    The budget charges cases still in flight at this estimate until the
+    first case has finished. Models and a judge without a price add
+    nothing, and every scheduled pair is assumed to be judged.
+    """
+    
+    def __init__(self, config: BenchmarkConfig, prices: PriceTable):
+        # Imported here to avoid a circular import
+        from domainbench.capabilities import get_capability
+        from domainbench.domains.loader import load_domain
+        
+        settings = config.settings
+        self.config = config
+        self.prices = prices
+        self.system_prompt = (config.domain_config or load_domain(config.domain)).system_prompt
+        self.capabilities = {name: get_capability(name) for name in config.capabilities}
+        self.models = {model.display_name: model for model in config.models}
+        # A scheduler of its own, so estimating never touches the run's adaptive state
+        self.scheduler = PairScheduler(
+            list(self.models),
+            schedule=settings.pairing,
+            pairs_per_case=settings.pairs_per_case,
+            seed=settings.seed,
+            adaptive=settings.adaptive,
+        )
+        self.strategy = resolve_judge_strategy(config.judge.strategy, settings.fan_out)
+        self.calibration = config.judge.calibration_rate if self.strategy == "single" else 0.0
+    
+    def __call__(self, idx: int, test_case: Dict[str, Any]) -> float:
+        judge = self.config.judge
+        case_id = str(test_case.get("id", f"case_{idx}"))
+        category = test_case.get("category", "unknown")
+        conversation = format_conversation(test_case.get("turns", []))
+        cost = 0.0
+        
+        for cap_name, capability in self.capabilities.items():
+            pairs = self.scheduler.pairs_for(case_id, cap_name, category)
+            if not pairs:
+                continue
+            
+            messages = capability.build_messages(
+                test_case=test_case, system_prompt=self.system_prompt
+            )
+            prompt_tokens = estimate_tokens(messages)
+            for name in self.scheduler.models_for(pairs):
+                model = self.models[name]
+                completion = _completion_estimate(model)
+                usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion}
+                cost += self.prices.estimate_cost(model.provider.value, model.model, usage) or 0.0
+            
+            judge_calls = _judge_calls(conversation, self.strategy, self.calibration)
+            for name_a, name_b in pairs:
+                responses = sum(
+                    _completion_estimate(self.models[name]) for name in (name_a, name_b)
+                )
+                for count, base_prompt, completion in judge_calls:
+                    usage = {
+                        "prompt_tokens": base_prompt + responses,
+                        "completion_tokens": completion,
+                    }
+                    verdict = self.prices.estimate_cost(judge.provider.value, judge.model, usage)
+                    cost += count * (verdict or 0.0)
+        return cost
+
+
+def plan_run(
+    config: BenchmarkConfig,
+    dataset_path: str,
+    history: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Project a run from its config and dataset alone.
+    
+    Walks the selected test cases through the same pair schedule the run
+    would use and sizes every prompt from the capability's build_messages
+    and the judge prompt templates (~4 characters per token). Candidate
+    responses, which the judge prompts embed, are assumed to be
+    ESTIMATED_COMPLETION_TOKENS long. Dollars come from the price table,
+    latency per call from history (mean latency_ms per model, e.g. from
+    ResultStore.latency_by_model) or else estimate_latency_ms. Wall time
+    is the slower of the latency-bound schedule (fan-out, workers) and
+    the configured rpm/tpm limits.
+    
+    Returns:
+        Dict with cases, per-model and judge projections, totals, wall_time and notes
+    """
+    # Imported here to avoid a circular import
+    from domainbench.capabilities import get_capability
+    from domainbench.domains.loader import iter_dataset, load_domain
+    
+    history = history or {}
+    settings = config.settings
+    judge_config = config.judge
+    domain_config = config.domain_config or load_domain(config.domain)
+    prices = PriceTable(config.metrics.prices)
+    batch = settings.batch.enabled
+    
+    capabilities = {name: get_capability(name) for name in config.capabilities}
+    models = {model.display_name: model for model in config.models}
+    scheduler = PairScheduler(
+        list(models),
+        schedule=settings.pairing,
+        pairs_per_case=settings.pairs_per_case,
+        seed=settings.seed,
+        adaptive=settings.adaptive,
+    )
+    
+    roles = {
+        name: _Role(model.provider.value, model.model, history.get(name, {}).get("latency_ms"))
+        for name, model in models.items()
+    }
+    judge_name = f"{judge_config.provider.value}/{judge_config.model}"
+    judge = _Role(
+        judge_config.provider.value,
+        judge_config.model,
+        history.get(judge_name, {}).get("latency_ms"),
+    )
+    
+    # Batch mode always judges with the two-call swap prompts
+    strategy = "swap" if batch else resolve_judge_strategy(judge_config.strategy, settings.fan_out)
+    calibration = judge_config.calibration_rate if strategy == "single" else 0.0
+    
+    cases = 0
+    case_ms_total = 0.0
+    for idx, test_case in iter_dataset(
+        dataset_path,
+        offset=settings.offset,
+        max_items=settings.max_items,
+        shard=settings.shard,
+        with_index=True,
+        index_dir=settings.index_dir,
+    ):
+        cases += 1
+        case_id = str(test_case.get("id", f"case_{idx}"))
+        category = test_case.get("category", "unknown")
+        conversation = format_conversation(test_case.get("turns", []))
+        
+        for cap_name, capability in capabilities.items():
+            pairs = scheduler.pairs_for(case_id, cap_name, category)
+            if not pairs:
+                continue
+            
+            # Candidate generations
+            messages = capability.build_messages(
+                test_case=test_case, system_prompt=domain_config.system_prompt
+            )
+            prompt_tokens = estimate_tokens(messages)
+            generation_ms = []
+            for name in scheduler.models_for(pairs):
+                role = roles[name]
+                completion = _completion_estimate(models[name])
+                usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion}
+                cost = prices.estimate_cost(role.provider, role.model, usage, batch)
+                role.add(1, prompt_tokens, completion, cost)
+                generation_ms.append(role.latency_ms(completion))
+            
+            judge_calls = _judge_calls(conversation, strategy, calibration)
+            
+            pair_ms = []
+            for name_a, name_b in pairs:
+                # Both candidate responses are embedded in the judge prompt
+                responses = sum(_completion_estimate(models[name]) for name in (name_a, name_b))
+                serial_ms = 0.0
+                for count, base_prompt, completion in judge_calls:
+                    prompt = base_prompt + responses
+                    usage = {"prompt_tokens": prompt, "completion_tokens": completion}
+                    cost = prices.estimate_cost(judge.provider, judge.model, usage, batch)
+                    judge.add(count, prompt, completion, cost)
+                    # Concurrent judging overlaps the two orderings
+                    rounds = 1 if strategy == "concurrent" else count
+                    serial_ms += rounds * judge.latency_ms(completion)
+                pair_ms.append(serial_ms)
+            
+            if settings.fan_out:
+                case_ms_total += max(generation_ms) + max(pair_ms)
+            else:
+                case_ms_total += sum(generation_ms) + sum(pair_ms)
+    
+    model_summaries = {name: role.summary() for name, role in roles.items()}
+    judge_summary = judge.summary()
+    everything = [*model_summaries.values(), judge_summary]
+    costs = [entry["cost_usd"] for entry in everything]
+    
+    plan: Dict[str, Any] = {
+        "cases": cases,
+        "models": model_summaries,
+        "judge": {**judge_summary, "strategy": strategy},
+        "total": {
+            "calls": sum(entry["calls"] for entry in everything),
+            "tokens": sum(
+                entry["prompt_tokens"] + entry["completion_tokens"] for entry in everything
+            ),
+            "cost_usd": round(sum(cost for cost in costs if cost is not None), 4),
+        },
+        "price_table": prices.version,
+        "wall_time": _wall_time(config, cases, case_ms_total, [*roles.values(), judge]),
+        "notes": [],
+    }
+    
+    notes = plan["notes"]
+    if strategy != judge_config.strategy:
+        plan["judge"]["requested_strategy"] = judge_config.strategy
+    if None in costs:
+        unpriced = [name for name, entry in model_summaries.items() if entry["cost_usd"] is None]
+        if judge_summary["cost_usd"] is None:
+            unpriced.append("judge")
+        notes.append(
+            f"No price for {', '.join(unpriced)}; totals exclude them (set metrics.prices)"
+        )
+    if settings.adaptive.enabled:
+        notes.append("Adaptive judging skips settled pairs, so judge calls are an upper bound")
+    if config.cache.enabled or config.cache.judge:
+        notes.append("Cache hits are not predicted; calls and cost are an upper bound")
+    if batch:
+        notes.append(
+            "Batch mode: batch discounts applied; wall time depends on the provider's batch queue"
+        )
+    if settings.budget is not None and plan["total"]["cost_usd"] > settings.budget:
+        notes.append(
+            f"Projected cost exceeds the ${settings.budget:.2f} budget; the run will stop early"
+        )
+    return plan
+
+
+def _wall_time(
+    config: BenchmarkConfig, cases: int, case_ms_total: float, roles: List[_Role]
+) -> Dict[str, Any]:
+    """Slower of the latency-bound schedule and the rpm/tpm limits"""
+    settings = config.settings
+    if settings.batch.enabled:
+        return {"seconds": None, "bound": "batch"}
+    
+    concurrent = settings.parallel_execution or settings.async_execution
+    in_flight = max(1, settings.max_workers) if concurrent else 1
+    seconds = case_ms_total / in_flight / 1000
+    bound = "latency"
+    
+    # Rate limits are shared per provider/model by candidates and judge alike (tightest wins)
+    limits: Dict[Tuple[str, str], Tuple[Optional[int], Optional[int]]] = {}
+    for limited in [*config.models, config.judge]:
+        key = (limited.provider.value, limited.model)
+        rpm, tpm = limits.get(key, (None, None))
+        rpm = min(filter(None, (rpm, limited.rpm)), default=None)
+        tpm = min(filter(None, (tpm, limited.tpm)), default=None)
+        if rpm or tpm:
+            limits[key] = (rpm, tpm)
+    
+    # Legacy fixed sleep between serial cases, superseded by rate limits
+    if not concurrent and not limits:
+        seconds += settings.sleep_between_calls * cases
+    
+    for (provider, model), (rpm, tpm) in limits.items():
+        shared = [role for role in roles if (role.provider, role.model) == (provider, model)]
+        calls = sum(role.calls for role in shared)
+        tokens = sum(role.prompt_tokens + role.completion_tokens for role in shared)
+        limited_seconds = max(
+            calls / rpm * 60 if rpm else 0.0,
+            tokens / tpm * 60 if tpm else 0.0,
+        )
+        if limited_seconds > seconds:
+            seconds = limited_seconds
+            bound = f"rate limit {provider}/{model}"
+    
+    return {"seconds": round(seconds, 1), "bound": bound, "cases_in_flight": in_flight}
@@ -8,6 +8,15 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from domainbench.core.config import OutputConfig
+from domainbench.core.sinks import ResultSink, JsonSink, JsonlSink
+from domainbench.core.tracing import span
+
+
+# Formats written incrementally while a benchmark runs
+STREAMING_FORMATS = ("json", "jsonl", "parquet", "arrow")
+
+# Columnar formats (flattened to one row per model response, requires pyarrow)
+COLUMNAR_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
 
 
 class Reporter:
@@ -17,6 +26,7 @@ class Reporter:
     Supports:
     - JSON: Machine-readable full results
     - Markdown: GitHub-friendly summary
+    - Parquet / Arrow: Columnar detailed results for analytics
     - HTML: Visual dashboard (future)
     """
     
@@ -50,19 +60,54 @@ class Reporter:
         saved_paths = []
         
         for fmt in formats:
-            if fmt == "json":
-                path = self._save_json(results, base_name)
-            elif fmt == "markdown" or fmt == "md":
-                path = self._save_markdown(results, base_name)
-            elif fmt == "jsonl":
-                path = self._save_jsonl(results, base_name)
-            else:
-                continue
+            with span(f"report.{fmt}"):
+                if fmt == "json":
+                    path = self._save_json(results, base_name)
+                elif fmt == "markdown" or fmt == "md":
+                    path = self._save_markdown(results, base_name)
+                elif fmt == "jsonl":
+                    path = self._save_jsonl(results, base_name)
+                elif fmt in COLUMNAR_EXTENSIONS:
+                    path = self._save_columnar(results, base_name, fmt)
+                else:
+                    continue
             
             saved_paths.append(path)
         
         return saved_paths
     
+    def open_sinks(self, base_name: str, formats: Optional[List[str]] = None) -> List[ResultSink]:
+        """
+        Create streaming sinks for the formats that support incremental writes.
+        
+        Args:
+            base_name: Base filename (without extension)
+            formats: Formats to stream (defaults to config); others are ignored
+        
+        Returns:
+            Unopened sinks, one per streaming format
+        """
+        sinks = []
+        for fmt in formats or self.config.formats:
+            if fmt == "json":
+                sinks.append(JsonSink(str(self.output_dir / f"{base_name}.json")))
+            elif fmt == "jsonl":
+                sinks.append(JsonlSink(str(self.output_dir / f"{base_name}.jsonl")))
+            elif fmt in COLUMNAR_EXTENSIONS:
+                sinks.append(self._columnar_sink(base_name, fmt))
+        return sinks
+    
+    def _columnar_sink(self, base_name: str, fmt: str) -> ResultSink:
+        """Parquet or Arrow IPC sink using the configured compression and row-group size"""
+        from domainbench.core.columnar import ColumnarSink
+        
+        return ColumnarSink(
+            str(self.output_dir / f"{base_name}.{COLUMNAR_EXTENSIONS[fmt]}"),
+            fmt=fmt,
+            compression=self.config.compression,
+            row_group_size=self.config.row_group_size,
+        )
+    
     def _save_json(self, results: Dict[str, Any], base_name: str) -> str:
         """Save full results as JSON"""
         path = self.output_dir / f"{base_name}.json"
@@ -72,6 +117,14 @@ class Reporter:
         
         return str(path)
     
+    def _save_columnar(self, results: Dict[str, Any], base_name: str, fmt: str) -> str:
+        """Save detailed results as a Parquet or Arrow IPC table"""
+        sink = self._columnar_sink(base_name, fmt)
+        sink.open(results)
+        for result in results.get("detailed_results", []):
+            sink.write(result)
+        return sink.close(results)
+    
     def _save_jsonl(self, results: Dict[str, Any], base_name: str) -> str:
         """Save detailed results as JSONL (one result per line)"""
         path = self.output_dir / f"{base_name}.jsonl"
@@ -145,6 +198,32 @@ class Reporter:
             "",
         ])
         
+        # Ratings and head-to-head records (informative with 3+ models)
+        ratings = summary.get("ratings", {})
+        if ratings and len(models) > 2:
+            bt = ratings.get("bradley_terry", {})
+            elo = ratings.get("elo", {})
+            md_lines.extend([
+                "## Ratings",
+                "",
+                "| Model | Bradley-Terry | Elo |",
+                "|-------|---------------|-----|",
+            ])
+            for model_name in sorted(bt, key=bt.get, reverse=True):
+                md_lines.append(
+                    f"| {model_name} | {bt[model_name]:.0f} | {elo.get(model_name, 0):.0f} |"
+                )
+            
+            md_lines.extend([
+                "",
+                "| Pair | Wins A | Wins B | Ties |",
+                "|------|--------|--------|------|",
+            ])
+            for pair, counts in summary.get("pairwise", {}).items():
+                cells = [counts.get(key, 0) for key in ("wins_a", "wins_b", "ties")]
+                md_lines.append(f"| {pair} | " + " | ".join(str(cell) for cell in cells) + " |")
+            md_lines.append("")
+        
         # Category breakdown
         by_category = summary.get("by_category", {})
         if by_category:
@@ -166,6 +245,16 @@ class Reporter:
             
             md_lines.append("")
         
+        # Spend per model, judge and category
+        cost = summary.get("cost")
+        if cost:
+            md_lines.extend(_cost_lines(cost))
+        
+        # Latency and token distributions
+        distributions = summary.get("distributions")
+        if distributions:
+            md_lines.extend(_distribution_lines(distributions))
+        
         md_lines.extend([
             "---",
             f"*Generated by DomainBench*",
@@ -204,3 +293,108 @@ class Reporter:
         ])
         
         return '\n'.join(lines)
+
+
+def _cost_lines(cost: Dict[str, Any]) -> List[str]:
+    """Markdown tables for spend per model and judge, and per category"""
+    lines = [
+        "## Cost",
+        "",
+        f"Prices: table `{cost.get('price_table')}`, USD",
+        "",
+        "| Model | Calls | Cost |",
+        "|-------|-------|------|",
+    ]
+    for model_name, stats in cost.get("models", {}).items():
+        lines.append(f"| {model_name} | {stats['calls']} | ${stats['usd']:.4f} |")
+    judge = cost.get("judge", {})
+    lines.append(f"| Judge | {judge.get('comparisons', 0)} pairs | ${judge.get('usd', 0):.4f} |")
+    lines.append(f"| **Total** | | **${cost.get('total_usd', 0):.4f}** |")
+    lines.append("")
+    
+    if cost.get("unpriced"):
+        lines.extend([f"No price for: {', '.join(cost['unpriced'])}", ""])
+    budget = cost.get("budget")
+    if budget and budget.get("stopped"):
+        lines.extend([
+            f"Budget of ${budget['limit_usd']:.2f} reached after {budget['cases_run']} cases.",
+            "",
+        ])
+    
+    by_category = cost.get("by_category", {})
+    models = list(cost.get("models", {}))
+    if by_category:
+        lines.extend([
+            "| Category | " + " | ".join(models) + " | Judge | Total |",
+            "|----------|" + "|".join(["---"] * (len(models) + 2)) + "|",
+        ])
+        for cat, spend in by_category.items():
+            cells = [spend["models"].get(m, 0) for m in models]
+            cells += [spend["judge"], spend["total_usd"]]
+            lines.append(f"| {cat} | " + " | ".join(f"${usd:.4f}" for usd in cells) + " |")
+        lines.append("")
+    return lines
+
+
+def _fmt(stats: Dict[str, Any], metric: str, field: str) -> str:
+    value = stats.get(metric, {}).get(field)
+    return f"{value:.0f}" if value is not None else "-"
+
+
+def _distribution_lines(distributions: Dict[str, Any]) -> List[str]:
+    """Markdown tables for the latency and token percentiles and latency histogram"""
+    columns = [
+        ("latency_ms", "p50"), ("latency_ms", "p90"), ("latency_ms", "p99"),
+        ("tokens", "mean"), ("tokens", "p90"), ("tokens_per_sec", "p50"),
+    ]
+    header = "| p50 (ms) | p90 (ms) | p99 (ms) | Tokens/resp | Tokens/resp p90 | Tokens/sec p50 |"
+    lines = [
+        "## Latency and Tokens",
+        "",
+        "| Model " + header,
+        "|-------|" + "---|" * len(columns),
+    ]
+    for model_name, stats in distributions.get("models", {}).items():
+        lines.append(f"| {model_name} | " + " | ".join(_fmt(stats, *c) for c in columns) + " |")
+    lines.append("")
+    
+    histogram = distributions.get("latency_histogram")
+    if histogram:
+        counts = histogram["counts"]
+        bounds = histogram["bounds_ms"]
+        labels = [f"≤ {bounds[0]}"]
+        labels += [f"{low}–{high}" for low, high in zip(bounds, bounds[1:])]
+        labels.append(f"> {bounds[-1]}")
+        lines.extend([
+            "### Latency Histogram",
+            "",
+            "| Latency (ms) | " + " | ".join(counts) + " |",
+            "|--------------|" + "|".join(["---"] * len(counts)) + "|",
+        ])
+        for i, label in enumerate(labels):
+            lines.append(f"| {label} | " + " | ".join(str(c[i]) for c in counts.values()) + " |")
+        lines.append("")
+    
+    # Capability breakdown only adds information with several capabilities
+    sections = [("category", "Category")]
+    if len(distributions.get("by_capability", {})) > 1:
+        sections.insert(0, ("capability", "Capability"))
+    for kind, title in sections:
+        groups = distributions.get(f"by_{kind}", {})
+        if not groups:
+            continue
+        lines.extend([
+            f"### By {title}",
+            "",
+            f"| {title} | Model " + header,
+            "|---|---|" + "---|" * len(columns),
+        ])
+        for name, models in groups.items():
+            for model_name, stats in models.items():
+                lines.append(
+                    f"| {name} | {model_name} | "
+                    + " | ".join(_fmt(stats, *c) for c in columns)
+                    + " |"
+                )
+        lines.append("")
+    return lines
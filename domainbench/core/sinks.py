@@ -0,0 +1,127 @@
+"""
+Sinks - Stream detailed results to disk as they are recorded
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+
+def strip_raw_responses(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a result without the candidates' response text (output.include_raw_responses off)"""
+    return {
+        **result,
+        "responses": {
+            name: {key: value for key, value in response.items() if key != "response"}
+            for name, response in result.get("responses", {}).items()
+        },
+    }
+
+
+class ResultSink:
+    """
+    Destination for detailed results written during a run.
+    
+    open() receives the run header (benchmark id, name, timestamp, config),
+    write() is called once per result in dataset order, and close() receives
+    the finished run (summary, duration) and returns the written path.
+    """
+    
+    def open(self, header: Dict[str, Any]) -> None:
+        pass
+    
+    def write(self, result: Dict[str, Any]) -> None:
+        raise NotImplementedError
+    
+    def close(self, footer: Dict[str, Any]) -> Optional[str]:
+        return None
+
+
+class MemorySink(ResultSink):
+    """Keeps every result in a list (for small runs and library use)"""
+    
+    def __init__(self, results: Optional[List[Dict[str, Any]]] = None):
+        self.results = results if results is not None else []
+    
+    def write(self, result: Dict[str, Any]) -> None:
+        self.results.append(result)
+
+
+class JsonlSink(ResultSink):
+    """
+    One JSON object per line: a header line, one line per result as it is
+    recorded, and a closing summary line. Each line is flushed immediately,
+    so the file can be tailed during a run.
+    """
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._file = None
+    
+    def _write_line(self, obj: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(obj, ensure_ascii=False, default=str) + '\n')
+        self._file.flush()
+    
+    def open(self, header: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._write_line({"type": "header", **header})
+    
+    def write(self, result: Dict[str, Any]) -> None:
+        self._write_line({"type": "result", **result})
+    
+    def close(self, footer: Dict[str, Any]) -> Optional[str]:
+        self._write_line({"type": "summary", **footer})
+        self._file.close()
+        self._file = None
+        return str(self.path)
+
+
+class JsonSink(ResultSink):
+    """
+    Full results JSON document written incrementally.
+    
+    The header fields and the opening of "detailed_results" are written up
+    front; each result is appended as one compact array element; summary and
+    duration close the document. The output has the same keys as
+    BenchmarkEngine.get_full_results(). It is streamed into a .json.tmp file
+    and moved into place on close, so the final path never holds a partial
+    document.
+    """
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._tmp_path = self.path.with_suffix(".json.tmp")
+        self._file = None
+        self._count = 0
+    
+    def open(self, header: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        self._file.write("{\n")
+        for key, value in header.items():
+            self._file.write(f"  {json.dumps(key)}: {_dumps_indented(value)},\n")
+        self._file.write('  "detailed_results": [')
+        self._count = 0
+    
+    def write(self, result: Dict[str, Any]) -> None:
+        separator = ",\n    " if self._count else "\n    "
+        self._file.write(separator + json.dumps(result, ensure_ascii=False, default=str))
+        self._count += 1
+    
+    def close(self, footer: Dict[str, Any]) -> Optional[str]:
+        self._file.write("\n  ]" if self._count else "]")
+        for key, value in footer.items():
+            self._file.write(f",\n  {json.dumps(key)}: {_dumps_indented(value)}")
+        self._file.write("\n}\n")
+        self._file.close()
+        self._file = None
+        os.replace(self._tmp_path, self.path)
+        return str(self.path)
+
+
+def _dumps_indented(value: Any) -> str:
+    """Pretty-print a value nested one level inside a top-level object"""
+    text = json.dumps(value, indent=2, ensure_ascii=False, default=str)
+    return text.replace("\n", "\n  ")
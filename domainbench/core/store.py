@@ -0,0 +1,405 @@
+"""
+Store - SQLite index of benchmark runs for fast queries across many results
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from domainbench.core.columnar import flatten_result
+from domainbench.core.sinks import ResultSink
+
+
+DEFAULT_STORE_PATH = "results/domainbench.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    benchmark_id TEXT UNIQUE,
+    name TEXT,
+    timestamp TEXT,
+    domain TEXT,
+    duration_seconds REAL,
+    total_test_cases INTEGER,
+    overall_winner TEXT,
+    summary TEXT,
+    source TEXT,
+    source_mtime REAL,
+    source_size INTEGER,
+    complete INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS run_models (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    model TEXT NOT NULL,
+    wins INTEGER,
+    ties INTEGER,
+    losses INTEGER,
+    avg_score REAL,
+    rating REAL
+);
+CREATE TABLE IF NOT EXISTS cases (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test_id TEXT,
+    category TEXT,
+    capability TEXT,
+    model TEXT,
+    latency_ms REAL,
+    tokens INTEGER,
+    score REAL,
+    wins INTEGER,
+    ties INTEGER,
+    losses INTEGER,
+    winner TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_source ON runs(source);
+CREATE INDEX IF NOT EXISTS idx_run_models_model ON run_models(model, run_id);
+CREATE INDEX IF NOT EXISTS idx_cases_run ON cases(run_id);
+CREATE INDEX IF NOT EXISTS idx_cases_model_category ON cases(model, category, run_id);
+CREATE INDEX IF NOT EXISTS idx_cases_model_capability ON cases(model, capability, run_id);
+"""
+
+# Results inserted per executemany call when ingesting JSONL
+INGEST_CHUNK_SIZE = 1000
+
+# Results a StoreSink buffers before each commit
+STORE_COMMIT_EVERY = 100
+
+CASE_COLUMNS = [
+    "test_id", "category", "capability", "model", "latency_ms",
+    "tokens", "score", "wins", "ties", "losses", "winner",
+]
+
+
+class ResultStore:
+    """
+    Embedded SQLite index of benchmark runs.
+    
+    Each run contributes one row to runs (with its summary as JSON), one row
+    per model to run_models, and one row per model response to cases (the
+    same flattening as the Parquet export). Result files are ingested once;
+    re-ingesting an unchanged file is a no-op, so compare and history only
+    ever parse new files.
+    """
+    
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        # Stores created before runs were marked complete hold only finished runs
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(runs)")}
+        if "complete" not in columns:
+            self.conn.execute("ALTER TABLE runs ADD COLUMN complete INTEGER NOT NULL DEFAULT 1")
+    
+    def close(self) -> None:
+        self.conn.close()
+    
+    def __enter__(self) -> "ResultStore":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    # Writing
+    
+    def begin_run(self, header: Dict[str, Any], source: Optional[str] = None) -> int:
+        """
+        Insert a run from its results header, replacing an earlier copy of the same benchmark.
+        
+        The run stays marked incomplete (and out of queries) until finish_run.
+        """
+        self.conn.execute("DELETE FROM runs WHERE benchmark_id = ?", (header.get("benchmark_id"),))
+        cursor = self.conn.execute(
+            "INSERT INTO runs (benchmark_id, name, timestamp, domain, source, complete) "
+            "VALUES (?, ?, ?, ?, ?, 0)",
+            (
+                header.get("benchmark_id"),
+                header.get("benchmark_name"),
+                header.get("timestamp"),
+                (header.get("config") or {}).get("domain"),
+                source,
+            ),
+        )
+        return cursor.lastrowid
+    
+    def add_results(self, run_id: int, results: List[Dict[str, Any]]) -> None:
+        """Insert the per-model rows of detailed results"""
+        rows = [
+            (run_id, *[row[column] for column in CASE_COLUMNS])
+            for result in results
+            for row in flatten_result(result)
+        ]
+        self.conn.executemany(
+            f"INSERT INTO cases (run_id, {', '.join(CASE_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * (len(CASE_COLUMNS) + 1))})",
+            rows,
+        )
+    
+    def finish_run(self, run_id: int, footer: Dict[str, Any]) -> None:
+        """Store the run summary and per-model totals, mark the run complete and commit"""
+        summary = footer.get("summary") or {}
+        ratings = summary.get("ratings", {}).get("bradley_terry", {})
+        self.conn.execute(
+            "UPDATE runs SET duration_seconds = ?, total_test_cases = ?, overall_winner = ?, "
+            "summary = ?, complete = 1 WHERE id = ?",
+            (
+                footer.get("duration_seconds"),
+                summary.get("total_test_cases"),
+                summary.get("overall_winner"),
+                json.dumps(summary, default=str),
+                run_id,
+            ),
+        )
+        self.conn.executemany(
+            "INSERT INTO run_models (run_id, model, wins, ties, losses, avg_score, rating) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id, model, stats.get("total_wins", 0), stats.get("total_ties", 0),
+                    stats.get("total_losses", 0), stats.get("avg_score"), ratings.get(model),
+                )
+                for model, stats in summary.get("models", {}).items()
+            ],
+        )
+        self.conn.commit()
+    
+    def ingest(self, path: str) -> Optional[int]:
+        """
+        Index a results file (.json or .jsonl).
+        
+        Returns the run id, or None when the file was already ingested
+        unchanged.
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        existing = self.conn.execute(
+            "SELECT id FROM runs WHERE source = ? AND source_mtime = ? AND source_size = ?",
+            (str(path), stat.st_mtime, stat.st_size),
+        ).fetchone()
+        if existing is not None:
+            return None
+        
+        if path.suffix == ".jsonl":
+            run_id = self._ingest_jsonl(path)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+            results = document.pop("detailed_results", [])
+            run_id = self.begin_run(_with_id(document, path), source=str(path))
+            self.add_results(run_id, results)
+            self.finish_run(run_id, document)
+        
+        self.conn.execute(
+            "UPDATE runs SET source_mtime = ?, source_size = ? WHERE id = ?",
+            (stat.st_mtime, stat.st_size, run_id),
+        )
+        self.conn.commit()
+        return run_id
+    
+    def _ingest_jsonl(self, path: Path) -> int:
+        """Stream a results JSONL file into the store in chunks"""
+        run_id = None
+        footer: Dict[str, Any] = {}
+        chunk = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                kind = record.pop("type", None)
+                # Streamed files start with a header; legacy files start with the summary
+                if run_id is None:
+                    run_id = self.begin_run(_with_id(record, path), source=str(path))
+                if kind == "result":
+                    chunk.append(record)
+                    if len(chunk) >= INGEST_CHUNK_SIZE:
+                        self.add_results(run_id, chunk)
+                        chunk = []
+                elif kind == "summary":
+                    footer = record
+        if run_id is None:
+            raise ValueError(f"Empty results file: {path}")
+        self.add_results(run_id, chunk)
+        self.finish_run(run_id, footer)
+        return run_id
+    
+    # Queries
+    
+    def run_for_source(self, path: str) -> Optional[int]:
+        """Run id most recently ingested from a results file"""
+        row = self.conn.execute(
+            "SELECT id FROM runs WHERE source = ? ORDER BY id DESC LIMIT 1",
+            (str(Path(path).resolve()),),
+        ).fetchone()
+        return row["id"] if row is not None else None
+    
+    def runs(
+        self, name: Optional[str] = None, model: Optional[str] = None, last: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Runs (newest first), optionally filtered by benchmark name and participating model"""
+        query = (
+            "SELECT id, benchmark_id, name, timestamp, domain, overall_winner, total_test_cases "
+            "FROM runs"
+        )
+        where, params = _run_filter(name, model)
+        query += where + " ORDER BY timestamp DESC"
+        if last:
+            query += " LIMIT ?"
+            params.append(last)
+        return [dict(row) for row in self.conn.execute(query, params)]
+    
+    def summaries(self, run_ids: List[int]) -> List[Dict[str, Any]]:
+        """Stored summaries in the shape of a results file (without detailed results)"""
+        documents = []
+        for run_id in run_ids:
+            row = self.conn.execute(
+                "SELECT benchmark_id, name, timestamp, duration_seconds, summary "
+                "FROM runs WHERE id = ?",
+                (run_id,),
+            ).fetchone()
+            if row is None:
+                continue
+            documents.append({
+                "benchmark_id": row["benchmark_id"],
+                "benchmark_name": row["name"],
+                "timestamp": row["timestamp"],
+                "duration_seconds": row["duration_seconds"],
+                "summary": json.loads(row["summary"] or "{}"),
+            })
+        return documents
+    
+    def model_history(
+        self,
+        model: str,
+        category: Optional[str] = None,
+        capability: Optional[str] = None,
+        name: Optional[str] = None,
+        last: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-run wins, ties, losses and win rate of a model (newest first).
+        
+        Without a category or capability the per-run totals are used; with
+        either, the counts come from the per-case rows. Win rate counts a
+        tie as half a win.
+        """
+        where, params = _run_filter(name, model)
+        recent = f"SELECT id FROM runs{where} ORDER BY timestamp DESC"
+        if last:
+            recent += " LIMIT ?"
+            params.append(last)
+        
+        if category is None and capability is None:
+            query = (
+                "SELECT r.id, r.name, r.timestamp, m.wins, m.ties, m.losses "
+                "FROM run_models m JOIN runs r ON r.id = m.run_id "
+                f"WHERE m.model = ? AND r.id IN ({recent})"
+            )
+            params = [model] + params
+        else:
+            filters = ["c.model = ?"]
+            case_params: List[Any] = [model]
+            if category is not None:
+                filters.append("c.category = ?")
+                case_params.append(category)
+            if capability is not None:
+                filters.append("c.capability = ?")
+                case_params.append(capability)
+            query = (
+                "SELECT r.id, r.name, r.timestamp, "
+                "SUM(c.wins) AS wins, SUM(c.ties) AS ties, SUM(c.losses) AS losses "
+                "FROM cases c JOIN runs r ON r.id = c.run_id "
+                f"WHERE {' AND '.join(filters)} AND r.id IN ({recent}) "
+                "GROUP BY r.id"
+            )
+            params = case_params + params
+        
+        history = []
+        for row in self.conn.execute(query + " ORDER BY r.timestamp DESC", params):
+            entry = dict(row)
+            n = entry["wins"] + entry["ties"] + entry["losses"]
+            entry["win_rate"] = round((entry["wins"] + entry["ties"] / 2) / n, 4) if n else None
+            history.append(entry)
+        return history
+    
+    def latency_by_model(self, models: List[str], last: int = 20) -> Dict[str, Dict[str, Any]]:
+        """Mean latency per response of each model over its last complete runs (for planning)"""
+        if not models:
+            return {}
+        marks = ", ".join("?" for _ in models)
+        query = (
+            "SELECT c.model, AVG(c.latency_ms) AS latency_ms, COUNT(*) AS responses FROM cases c "
+            f"WHERE c.model IN ({marks}) AND c.latency_ms IS NOT NULL AND c.run_id IN ("
+            "SELECT DISTINCT m.run_id FROM run_models m JOIN runs r ON r.id = m.run_id "
+            f"WHERE m.model IN ({marks}) AND r.complete = 1 ORDER BY r.timestamp DESC LIMIT ?) "
+            "GROUP BY c.model"
+        )
+        rows = self.conn.execute(query, [*models, *models, last])
+        return {
+            row["model"]: {"latency_ms": row["latency_ms"], "responses": row["responses"]}
+            for row in rows
+        }
+
+
+class StoreSink(ResultSink):
+    """
+    Records a run in a ResultStore as its results stream in.
+    
+    Results are committed every STORE_COMMIT_EVERY results, so the store is
+    never locked for a whole run and an interrupted run keeps the rows it
+    streamed (marked incomplete until a resumed run finishes it).
+    """
+    
+    def __init__(self, path: str, commit_every: int = STORE_COMMIT_EVERY):
+        self.path = path
+        self.commit_every = commit_every
+        self._store: Optional[ResultStore] = None
+        self._run_id: Optional[int] = None
+        self._pending: List[Dict[str, Any]] = []
+    
+    def open(self, header: Dict[str, Any]) -> None:
+        self._store = ResultStore(self.path)
+        self._run_id = self._store.begin_run(header)
+        self._store.conn.commit()
+    
+    def write(self, result: Dict[str, Any]) -> None:
+        self._pending.append(result)
+        if len(self._pending) >= self.commit_every:
+            self._flush()
+    
+    def _flush(self) -> None:
+        self._store.add_results(self._run_id, self._pending)
+        self._store.conn.commit()
+        self._pending = []
+    
+    def close(self, footer: Dict[str, Any]) -> Optional[str]:
+        self._store.add_results(self._run_id, self._pending)
+        self._pending = []
+        self._store.finish_run(self._run_id, footer)
+        self._store.close()
+        self._store = None
+        return None
+
+
+def _run_filter(name: Optional[str], model: Optional[str]) -> Tuple[str, List[Any]]:
+    """WHERE clause selecting complete runs by benchmark name and participating model"""
+    clauses, params = ["complete = 1"], []
+    if name is not None:
+        clauses.append("name = ?")
+        params.append(name)
+    if model is not None:
+        clauses.append("id IN (SELECT run_id FROM run_models WHERE model = ?)")
+        params.append(model)
+    return " WHERE " + " AND ".join(clauses), params
+
+
+def _with_id(header: Dict[str, Any], path: Path) -> Dict[str, Any]:
+    """Fall back to the file path as the run identity for files without a benchmark id"""
+    if header.get("benchmark_id") is None:
+        return {**header, "benchmark_id": str(path)}
+    return header
@@ -0,0 +1,259 @@
+"""
+Tournament - Pairwise judging schedules and Bradley-Terry / Elo ratings for N models
+"""
+
+import math
+import random
+import threading
+from itertools import combinations
+from statistics import NormalDist
+from typing import List, Dict, Any, Optional, Tuple
+
+from domainbench.core.config import AdaptiveConfig
+
+
+Pair = Tuple[str, str]
+
+# Elo defaults
+ELO_INITIAL = 1000.0
+ELO_K = 32.0
+
+
+def wilson_interval(successes: float, n: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion (ties may count as half a success)"""
+    if n <= 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+class PairScheduler:
+    """
+    Decides which model pairs the judge compares for each test case.
+    
+    Schedules:
+    - round_robin: every pair, N*(N-1)/2 judgements per case
+    - sampled: pairs_per_case pairs drawn per case, seeded by the case id so
+      that reruns and resumed runs pick the same pairs
+    
+    In adaptive mode, observed verdicts are tallied per pair (or per pair and
+    category) and a pair is no longer scheduled once the Wilson interval on
+    its win rate excludes 0.5. Repeatedly testing a growing sample inflates
+    the false-settle rate, so the interval is only checked at pre-declared
+    looks (min_comparisons, then doubling, max_looks in all), each at the
+    Bonferroni-corrected level 1 - (1 - confidence) / max_looks. Across all
+    looks, an even pair is then settled with probability at most
+    1 - confidence. A category whose pairs are all settled is skipped
+    entirely, generation included.
+    """
+    
+    def __init__(
+        self,
+        models: List[str],
+        schedule: str = "round_robin",
+        pairs_per_case: Optional[int] = None,
+        seed: Optional[int] = None,
+        adaptive: Optional[AdaptiveConfig] = None,
+    ):
+        if len(models) < 2:
+            raise ValueError("At least 2 models are required for comparison")
+        if schedule not in ("round_robin", "sampled"):
+            raise ValueError(f"Unknown pairing schedule: {schedule}")
+        if schedule == "sampled" and (pairs_per_case is None or pairs_per_case < 1):
+            raise ValueError("Pairing 'sampled' needs pairs_per_case of at least 1")
+        if adaptive is not None and adaptive.enabled:
+            if adaptive.scope not in ("pair", "category"):
+                raise ValueError(f"Unknown adaptive scope: {adaptive.scope}")
+            if not 0 < adaptive.confidence < 1:
+                raise ValueError("Adaptive confidence must be between 0 and 1")
+            if adaptive.min_comparisons < 1 or adaptive.max_looks < 1:
+                raise ValueError("Adaptive min_comparisons and max_looks must be at least 1")
+        
+        self.models = list(models)
+        self.schedule = schedule
+        self.pairs_per_case = pairs_per_case
+        self.seed = seed
+        self.adaptive = adaptive if adaptive is not None and adaptive.enabled else None
+        self.all_pairs: List[Pair] = list(combinations(self.models, 2))
+        
+        # Comparison counts at which a pair's interval is checked, and the per-look level
+        self.looks: List[int] = []
+        self.look_confidence = 1.0
+        if self.adaptive is not None:
+            self.looks = [
+                self.adaptive.min_comparisons * 2**k for k in range(self.adaptive.max_looks)
+            ]
+            self.look_confidence = 1 - (1 - self.adaptive.confidence) / self.adaptive.max_looks
+        
+        # Adaptive state: tallies and settled verdicts keyed by (pair, category or None)
+        self._tallies: Dict[Tuple[Pair, Optional[str]], Dict[str, int]] = {}
+        self._settled: Dict[Tuple[Pair, Optional[str]], Dict[str, Any]] = {}
+        self._skipped: Dict[Pair, int] = {}
+        self._lock = threading.Lock()
+    
+    def pairs_for(self, case_id: str, capability: str, category: str) -> List[Pair]:
+        """Pairs to judge for one test case and capability"""
+        candidates = self.all_pairs
+        if self.adaptive is not None:
+            with self._lock:
+                candidates = [
+                    p for p in self.all_pairs if self._key(p, category) not in self._settled
+                ]
+                for pair in self.all_pairs:
+                    if self._key(pair, category) in self._settled:
+                        self._skipped[pair] = self._skipped.get(pair, 0) + 1
+        
+        if self.schedule == "round_robin":
+            return list(candidates)
+        
+        k = min(self.pairs_per_case, len(candidates))
+        rng = random.Random(f"{self.seed}:{case_id}:{capability}")
+        chosen = set(rng.sample(range(len(candidates)), k))
+        return [pair for i, pair in enumerate(candidates) if i in chosen]
+    
+    def observe(self, model_a: str, model_b: str, category: str, winner: str) -> None:
+        """Feed one judged verdict back into the adaptive stopping rule"""
+        if self.adaptive is None:
+            return
+        
+        key = self._key((model_a, model_b), category)
+        with self._lock:
+            counts = self._tallies.setdefault(key, {"wins_a": 0, "wins_b": 0, "ties": 0})
+            counts["wins_a" if winner == "A" else "wins_b" if winner == "B" else "ties"] += 1
+            if key in self._settled:
+                return
+            
+            n = counts["wins_a"] + counts["wins_b"] + counts["ties"]
+            if n not in self.looks:
+                return
+            
+            low, high = wilson_interval(
+                counts["wins_a"] + counts["ties"] / 2, n, self.look_confidence
+            )
+            if low > 0.5 or high < 0.5:
+                self._settled[key] = {
+                    "leader": model_a if low > 0.5 else model_b,
+                    "comparisons": n,
+                    "win_rate_a": round((counts["wins_a"] + counts["ties"] / 2) / n, 4),
+                    "interval": [round(low, 4), round(high, 4)],
+                }
+    
+    def _key(self, pair: Pair, category: str) -> Tuple[Pair, Optional[str]]:
+        return pair, category if self.adaptive.scope == "category" else None
+    
+    def adaptive_summary(self) -> Optional[Dict[str, Any]]:
+        """Settled pairs and skipped comparisons for the run summary"""
+        if self.adaptive is None:
+            return None
+        
+        with self._lock:
+            settled = {}
+            for ((a, b), category), verdict in self._settled.items():
+                label = f"{a} vs {b}" if category is None else f"{a} vs {b} [{category}]"
+                settled[label] = verdict
+            return {
+                "confidence": self.adaptive.confidence,
+                "look_confidence": round(self.look_confidence, 6),
+                "looks": self.looks,
+                "scope": self.adaptive.scope,
+                "skipped_comparisons": sum(self._skipped.values()),
+                "skipped_by_pair": {f"{a} vs {b}": n for (a, b), n in self._skipped.items()},
+                "settled": settled,
+            }
+    
+    def models_for(self, pairs: List[Pair]) -> List[str]:
+        """Models that must generate a response for the given pairs, in config order"""
+        needed = {name for pair in pairs for name in pair}
+        return [name for name in self.models if name in needed]
+
+
+class Tournament:
+    """
+    Running pairwise tallies and ratings across all judged comparisons.
+    
+    Elo is updated online in recording order (dataset order, so it is
+    deterministic); Bradley-Terry strengths are fitted from the pairwise
+    win matrix when the summary is built.
+    """
+    
+    def __init__(self, models: List[str]):
+        self.models = list(models)
+        self.pairwise: Dict[Pair, Dict[str, int]] = {}
+        self.elo: Dict[str, float] = {m: ELO_INITIAL for m in self.models}
+    
+    def record(self, model_a: str, model_b: str, winner: str) -> None:
+        """Record one comparison; winner is "A", "B" or "tie" relative to (model_a, model_b)"""
+        counts = self.pairwise.setdefault((model_a, model_b), {"wins_a": 0, "wins_b": 0, "ties": 0})
+        if winner == "A":
+            counts["wins_a"] += 1
+            outcome = 1.0
+        elif winner == "B":
+            counts["wins_b"] += 1
+            outcome = 0.0
+        else:
+            counts["ties"] += 1
+            outcome = 0.5
+        
+        expected = 1.0 / (1.0 + 10 ** ((self.elo[model_b] - self.elo[model_a]) / 400))
+        delta = ELO_K * (outcome - expected)
+        self.elo[model_a] += delta
+        self.elo[model_b] -= delta
+    
+    def bradley_terry(self, iterations: int = 200, tolerance: float = 1e-8) -> Dict[str, float]:
+        """
+        Fit Bradley-Terry strengths with the MM algorithm, on the Elo scale.
+        
+        Ties count as half a win for each side, and every played pair gets
+        one extra virtual tie so that undefeated or winless models keep a
+        finite rating.
+        """
+        wins: Dict[Pair, float] = {}
+        games: Dict[Pair, float] = {}
+        for (a, b), counts in self.pairwise.items():
+            n = counts["wins_a"] + counts["wins_b"] + counts["ties"] + 1
+            wins[(a, b)] = wins.get((a, b), 0.0) + counts["wins_a"] + (counts["ties"] + 1) / 2
+            wins[(b, a)] = wins.get((b, a), 0.0) + counts["wins_b"] + (counts["ties"] + 1) / 2
+            games[(a, b)] = games.get((a, b), 0.0) + n
+            games[(b, a)] = games.get((b, a), 0.0) + n
+        
+        strength = {m: 1.0 for m in self.models}
+        for _ in range(iterations):
+            updated = {}
+            for i in self.models:
+                total_wins = sum(w for (x, _), w in wins.items() if x == i)
+                denom = sum(
+                    n / (strength[i] + strength[j])
+                    for (x, j), n in games.items() if x == i
+                )
+                updated[i] = total_wins / denom if denom > 0 else strength[i]
+            
+            # Normalize to geometric mean 1
+            log_mean = sum(math.log(v) for v in updated.values()) / len(updated)
+            updated = {m: v / math.exp(log_mean) for m, v in updated.items()}
+            
+            converged = max(abs(updated[m] - strength[m]) for m in self.models) < tolerance
+            strength = updated
+            if converged:
+                break
+        
+        return {m: round(ELO_INITIAL + 400 * math.log10(strength[m]), 1) for m in self.models}
+    
+    def summary(self) -> Dict[str, Any]:
+        """Pairwise records and ratings for the run summary"""
+        return {
+            "pairwise": {
+                f"{a} vs {b}": {
+                    **counts,
+                    "comparisons": counts["wins_a"] + counts["wins_b"] + counts["ties"],
+                }
+                for (a, b), counts in self.pairwise.items()
+            },
+            "ratings": {
+                "bradley_terry": self.bradley_terry(),
+                "elo": {m: round(r, 1) for m, r in self.elo.items()},
+            },
+        }
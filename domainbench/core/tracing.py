@@ -0,0 +1,271 @@
+"""
+Tracing - Named spans around the run pipeline, exported as Chrome trace or OTLP
+"""
+
+import asyncio
+import contextvars
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+
+# Spans per OTLP request body
+OTLP_BATCH_SIZE = 1000
+
+
+class _NoopSpan:
+    """Returned by span() while tracing is off, so disabled spans cost one check"""
+    
+    __slots__ = ()
+    
+    def __enter__(self) -> "_NoopSpan":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+    
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+# Innermost open span of the current thread or asyncio task
+_current = contextvars.ContextVar("domainbench_span", default=None)
+
+
+class Span:
+    """One timed, named operation (use as a context manager)"""
+    
+    __slots__ = (
+        "tracer",
+        "name",
+        "attrs",
+        "span_id",
+        "parent_id",
+        "track",
+        "start_ns",
+        "end_ns",
+        "error",
+        "_token",
+    )
+    
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.span_id = os.urandom(8).hex()
+        self.parent_id: Optional[str] = None
+        self.track: Tuple[str, int, str] = ("thread", 0, "")
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error: Optional[str] = None
+    
+    def set(self, **attrs: Any) -> None:
+        """Add attributes once they are known (e.g. the attempt outcome)"""
+        self.attrs.update(attrs)
+    
+    def __enter__(self) -> "Span":
+        parent = _current.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.track = _track()
+        self._token = _current.set(self)
+        self.start_ns = time.time_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end_ns = time.time_ns()
+        _current.reset(self._token)
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer._finish(self)
+        return False
+
+
+def _track() -> Tuple[str, int, str]:
+    """Timeline a span belongs to: its asyncio task, else its thread"""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return ("task", id(task), task.get_name())
+    thread = threading.current_thread()
+    return ("thread", thread.ident, thread.name)
+
+
+class Tracer:
+    """
+    Collects spans for one run and exports them when it ends.
+    
+    Spans nest per thread and per asyncio task, and every span of a run
+    shares one trace id. While stopped, span() returns a shared no-op.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.trace_id = ""
+        self.max_spans = 0
+        self.dropped = 0
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+    
+    def start(self, max_spans: int = 1_000_000) -> None:
+        """Begin collecting spans under a new trace id"""
+        with self._lock:
+            self.trace_id = os.urandom(16).hex()
+            self.max_spans = max_spans
+            self.dropped = 0
+            self._spans = []
+            self.enabled = True
+    
+    def stop(self) -> List[Span]:
+        """Stop collecting and return the finished spans"""
+        with self._lock:
+            self.enabled = False
+            spans, self._spans = self._spans, []
+        return spans
+    
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            if len(self._spans) < self.max_spans:
+                self._spans.append(span)
+            else:
+                self.dropped += 1
+
+
+# Process-wide tracer used by the engine, evaluator, retries and reporter
+tracer = Tracer()
+
+
+def span(name: str, **attrs: Any):
+    """
+    Context manager timing `name` when tracing is on.
+    
+    Example:
+        with span("judge.parse_json", role=role):
+            obj = safe_json_loads(text)
+    """
+    if not tracer.enabled:
+        return _NOOP
+    return Span(tracer, name, attrs)
+
+
+def write_chrome_trace(spans: List[Span], path: str, trace_id: str = "", dropped: int = 0) -> str:
+    """
+    Write spans in the Chrome trace event format (chrome://tracing, ui.perfetto.dev).
+    
+    Each thread and asyncio task gets its own track; timestamps are
+    microseconds since the first span.
+    """
+    origin = min((s.start_ns for s in spans), default=0)
+    pid = os.getpid()
+    tids: Dict[Tuple[str, int], int] = {}
+    events: List[Dict[str, Any]] = []
+    
+    for s in sorted(spans, key=lambda s: s.start_ns):
+        kind, ident, track_name = s.track
+        tid = tids.get((kind, ident))
+        if tid is None:
+            tid = len(tids) + 1
+            tids[(kind, ident)] = tid
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": track_name},
+            })
+        args = dict(s.attrs)
+        if s.error is not None:
+            args["error"] = s.error
+        events.append({
+            "name": s.name,
+            "cat": s.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": (s.start_ns - origin) / 1000,
+            "dur": (s.end_ns - s.start_ns) / 1000,
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        })
+    
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"trace_id": trace_id, "dropped_spans": dropped},
+        }, f, default=str)
+    return path
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_payload(
+    spans: List[Span], trace_id: str, service_name: str = "domainbench"
+) -> Dict[str, Any]:
+    """OTLP/JSON ExportTraceServiceRequest body for a batch of spans"""
+    from domainbench import __version__
+    
+    otlp_spans = []
+    for s in spans:
+        entry = {
+            "traceId": trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attrs.items()],
+            "status": {"code": 2, "message": s.error} if s.error is not None else {},
+        }
+        if s.parent_id is not None:
+            entry["parentSpanId"] = s.parent_id
+        otlp_spans.append(entry)
+    
+    service = {"key": "service.name", "value": {"stringValue": service_name}}
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [service]},
+            "scopeSpans": [{
+                "scope": {"name": "domainbench", "version": __version__},
+                "spans": otlp_spans,
+            }],
+        }],
+    }
+
+
+def export_otlp(
+    spans: List[Span],
+    endpoint: str,
+    trace_id: str,
+    service_name: str = "domainbench",
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 10.0,
+) -> int:
+    """
+    POST spans to an OpenTelemetry collector's OTLP/HTTP JSON endpoint.
+    
+    Args:
+        endpoint: Traces URL, e.g. http://localhost:4318/v1/traces
+    
+    Returns:
+        Number of spans sent (raises httpx.HTTPError if the collector rejects them)
+    """
+    import httpx
+    
+    with httpx.Client(timeout=timeout, headers=headers or {}) as client:
+        for i in range(0, len(spans), OTLP_BATCH_SIZE):
+            batch = spans[i:i + OTLP_BATCH_SIZE]
+            response = client.post(endpoint, json=otlp_payload(batch, trace_id, service_name))
+            response.raise_for_status()
+    return len(spans)
@@ -2,12 +2,13 @@
 Domain loading and management
 """
 
-from domainbench.domains.loader import load_domain, load_dataset, list_builtin_domains
+from domainbench.domains.loader import load_domain, load_dataset, iter_dataset, list_builtin_domains
 from domainbench.domains.schema import DomainSchema
 
 __all__ = [
     "load_domain",
     "load_dataset",
+    "iter_dataset",
     "list_builtin_domains",
     "DomainSchema",
 ]
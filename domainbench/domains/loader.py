@@ -2,14 +2,26 @@
 Domain loader - Load domains from built-in templates or user-defined paths
 """
 
+import hashlib
 import json
+import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Union
 
 
 # Built-in domains directory
 BUILTIN_DOMAINS_DIR = Path(__file__).parent / "builtin"
 
+# Dataset line-count index: the item count and the byte offset of every
+# INDEX_STRIDE-th item, so totals and seeks skip JSON parsing
+INDEX_SUFFIX = ".idx"
+INDEX_STRIDE = 1024
+
+# Indexes built in this process, keyed by resolved dataset path
+_index_memo: Dict[str, Dict[str, Any]] = {}
+_index_lock = threading.Lock()
+
 
 def list_builtin_domains() -> List[Dict[str, str]]:
     """
@@ -104,16 +116,180 @@ def load_dataset(path: str) -> List[Dict[str, Any]]:
     Returns:
         List of test case dictionaries
     """
-    items = []
+    return list(iter_dataset(path))
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse a shard spec "i/N" (0-based shard i of N)"""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard spec (expected i/N): {spec}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard spec (need 0 <= i < N): {spec}")
+    return index, count
+
+
+def dataset_index_path(path: str, index_dir: str) -> Path:
+    """Where the index of a dataset is stored inside index_dir"""
+    resolved = str(Path(path).resolve())
+    digest = hashlib.sha256(resolved.encode("utf-8")).hexdigest()[:16]
+    return Path(index_dir) / f"{Path(path).name}-{digest}{INDEX_SUFFIX}"
+
+
+def load_dataset_index(path: str, index_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load the line-count index of a JSONL dataset, rebuilding it if stale.
     
-    with open(path, 'r', encoding='utf-8') as f:
+    The index is tied to the file's size and mtime. Building it scans raw
+    bytes without parsing JSON. It is kept in memory for the rest of the
+    process and, when index_dir is set, also persisted there so later runs
+    skip the scan. Nothing is ever written next to the dataset, whose
+    directory may be read-only or shared. If index_dir cannot be written,
+    the index is still returned.
+    
+    Returns:
+        Dict with 'items', 'stride' and 'offsets' (byte offset of every
+        stride-th item)
+    """
+    stat = os.stat(path)
+    resolved = str(Path(path).resolve())
+    
+    def fresh(index: Optional[Dict[str, Any]]) -> bool:
+        return (
+            index is not None
+            and index.get("size") == stat.st_size
+            and index.get("mtime_ns") == stat.st_mtime_ns
+        )
+    
+    with _index_lock:
+        index = _index_memo.get(resolved)
+    if fresh(index):
+        return index
+    
+    index_path = dataset_index_path(path, index_dir) if index_dir else None
+    if index_path is not None:
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if fresh(index):
+                with _index_lock:
+                    _index_memo[resolved] = index
+                return index
+        except (OSError, ValueError):
+            pass
+    
+    items = 0
+    offsets = []
+    position = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                if items % INDEX_STRIDE == 0:
+                    offsets.append(position)
+                items += 1
+            position += len(line)
+    
+    index = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "items": items,
+        "stride": INDEX_STRIDE,
+        "offsets": offsets,
+    }
+    
+    with _index_lock:
+        _index_memo[resolved] = index
+    
+    if index_path is not None:
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = index_path.with_suffix(index_path.suffix + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            pass
+    
+    return index
+
+
+def dataset_range(
+    path: str,
+    offset: int = 0,
+    max_items: Optional[int] = None,
+    shard: Optional[Union[str, Tuple[int, int]]] = None,
+    index_dir: Optional[str] = None,
+) -> Tuple[int, int]:
+    """
+    Item range [start, stop) selected by offset, shard and max_items.
+    
+    The offset skips leading items; the remainder is split into N contiguous
+    shards; max_items then caps the selected shard.
+    """
+    total = load_dataset_index(path, index_dir)["items"]
+    start = min(max(0, offset), total)
+    stop = total
+    
+    if shard is not None:
+        index, count = parse_shard(shard) if isinstance(shard, str) else shard
+        span = total - start
+        start, stop = start + span * index // count, start + span * (index + 1) // count
+    
+    if max_items:
+        stop = min(stop, start + max_items)
+    
+    return start, stop
+
+
+def iter_dataset(
+    path: str,
+    offset: int = 0,
+    max_items: Optional[int] = None,
+    shard: Optional[Union[str, Tuple[int, int]]] = None,
+    with_index: bool = False,
+    index_dir: Optional[str] = None,
+) -> Iterator[Any]:
+    """
+    Lazily iterate test cases from a JSONL file.
+    
+    Only the selected items are parsed, and the line-count index is used to
+    seek close to the first one, so memory stays flat however large the file.
+    
+    Args:
+        path: Path to JSONL file
+        offset: Number of leading items to skip
+        max_items: Maximum number of items to yield
+        shard: "i/N" or (i, N) to yield only the i-th of N contiguous shards
+        with_index: Yield (item number, item) tuples instead of items
+        index_dir: Directory to persist the line-count index in (optional)
+    
+    Yields:
+        Test case dictionaries (or (item number, test case) tuples)
+    """
+    if not offset and not max_items and shard is None:
+        start, stop = 0, None
+        number, position = 0, 0
+    else:
+        start, stop = dataset_range(path, offset, max_items, shard, index_dir)
+        if start >= stop:
+            return
+        index = load_dataset_index(path, index_dir)
+        block = start // index["stride"]
+        number, position = block * index["stride"], index["offsets"][block]
+    
+    with open(path, 'rb') as f:
+        f.seek(position)
         for line in f:
             line = line.strip()
             if not line:
                 continue
-            items.append(json.loads(line))
-    
-    return items
+            if stop is not None and number >= stop:
+                break
+            if number >= start:
+                item = json.loads(line)
+                yield (number, item) if with_index else item
+            number += 1
 
 
 def save_dataset(items: List[Dict[str, Any]], path: str) -> None:
@@ -2,41 +2,73 @@
 Provider adapters for LLM APIs
 """
 
-from domainbench.providers.base import BaseProvider
+from typing import Optional
+
+from domainbench.providers.base import BaseProvider, AsyncBaseProvider
 from domainbench.providers.openai_provider import OpenAIProvider
 from domainbench.providers.gemini_provider import GeminiProvider
 from domainbench.providers.anthropic_provider import AnthropicProvider
+from domainbench.providers.openai_compatible_provider import (
+    OpenAICompatibleProvider,
+    OllamaProvider,
+)
+from domainbench.providers.simulated_provider import SimulatedProvider
+from domainbench.providers.clients import ClientRegistry, client_key
 
 from domainbench.core.config import ModelConfig, ProviderType
 
 
-def get_provider(config: ModelConfig) -> BaseProvider:
+PROVIDERS = {
+    ProviderType.OPENAI: OpenAIProvider,
+    ProviderType.GEMINI: GeminiProvider,
+    ProviderType.ANTHROPIC: AnthropicProvider,
+    ProviderType.OLLAMA: OllamaProvider,
+    ProviderType.CUSTOM: OpenAICompatibleProvider,
+    ProviderType.SIMULATED: SimulatedProvider,
+}
+
+
+def get_provider(config: ModelConfig, clients: Optional[ClientRegistry] = None) -> BaseProvider:
     """
     Factory function to get the appropriate provider for a model config.
     
     Args:
         config: ModelConfig with provider type and settings
+        clients: Registry to share providers and connection pools through
+            (optional, a standalone provider is built if not set)
         
     Returns:
         Initialized provider instance
     """
-    provider_map = {
-        ProviderType.OPENAI: OpenAIProvider,
-        ProviderType.GEMINI: GeminiProvider,
-        ProviderType.ANTHROPIC: AnthropicProvider,
-    }
-    
-    provider_class = provider_map.get(config.provider)
+    provider_class = PROVIDERS.get(config.provider)
     if provider_class is None:
         raise ValueError(f"Unsupported provider: {config.provider}")
     
-    return provider_class(api_key_env=config.api_key_env)
+    def build() -> BaseProvider:
+        return provider_class(
+            api_key_env=config.api_key_env, base_url=config.base_url, clients=clients
+        )
+    
+    if clients is None:
+        return build()
+    # Roles with the same provider, credentials and endpoint share one provider
+    key = client_key(
+        provider_class.name,
+        config.api_key_env or provider_class.default_api_key_env,
+        config.base_url,
+    )
+    return clients.provider(key, build)
 
 
 __all__ = [
     "BaseProvider",
+    "AsyncBaseProvider",
     "OpenAIProvider", 
     "GeminiProvider",
     "AnthropicProvider",
+    "OpenAICompatibleProvider",
+    "OllamaProvider",
+    "SimulatedProvider",
+    "ClientRegistry",
     "get_provider",
 ]
@@ -2,28 +2,78 @@
 Anthropic Claude provider adapter
 """
 
-from typing import List, Dict, Any, Optional
-from domainbench.providers.base import BaseProvider
+import json
+from typing import List, Dict, Any, Optional, Tuple
+from domainbench.providers.base import BaseProvider, AsyncBaseProvider, StreamTimer
 
 
-class AnthropicProvider(BaseProvider):
+def _split_system_prompt(messages: List[Dict[str, str]]) -> Tuple[str, List[Dict[str, str]]]:
+    """Extract the system message, which Anthropic takes as a separate parameter"""
+    system_prompt = ""
+    chat_messages = []
+    
+    for msg in messages:
+        if msg["role"] == "system":
+            system_prompt = msg["content"]
+        else:
+            chat_messages.append({
+                "role": msg["role"],
+                "content": msg["content"],
+            })
+    
+    return system_prompt, chat_messages
+
+
+def _usage_from_response(response) -> Dict[str, int]:
+    """Extract token usage from an Anthropic response"""
+    if not response.usage:
+        return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cached_tokens": 0}
+    # input_tokens excludes prompt-cache reads; count them as (cached) prompt tokens
+    cached = getattr(response.usage, "cache_read_input_tokens", 0) or 0
+    prompt = response.usage.input_tokens + cached
+    return {
+        "prompt_tokens": prompt,
+        "completion_tokens": response.usage.output_tokens,
+        "total_tokens": prompt + response.usage.output_tokens,
+        "cached_tokens": cached,
+    }
+
+
+class AnthropicProvider(BaseProvider, AsyncBaseProvider):
     """Provider adapter for Anthropic Claude API"""
     
     name = "anthropic"
-    supported_features = ["chat_completion", "function_calling", "vision"]
+    supported_features = ["chat_completion", "function_calling", "vision", "batch", "streaming"]
+    default_api_key_env = "ANTHROPIC_API_KEY"
     
-    def __init__(self, api_key_env: Optional[str] = None):
-        super().__init__(api_key_env)
+    def __init__(
+        self, api_key_env: Optional[str] = None, base_url: Optional[str] = None, clients=None
+    ):
+        super().__init__(api_key_env, base_url, clients)
         self._client = None
+        self._async_client = None
     
     @property
     def client(self):
         """Lazy initialization of Anthropic client"""
-        if self._client is None:
-            import anthropic
-            api_key = self.get_api_key("ANTHROPIC_API_KEY")
-            self._client = anthropic.Anthropic(api_key=api_key)
-        return self._client
+        with self._client_lock:
+            if self._client is None:
+                import anthropic
+                api_key = self.get_api_key()
+                self._client = anthropic.Anthropic(api_key=api_key, **self.sdk_client_kwargs())
+            return self._client
+    
+    @property
+    def async_client(self):
+        """Lazy initialization of the asyncio Anthropic client"""
+        with self._client_lock:
+            if self._async_client is None:
+                import anthropic
+                api_key = self.get_api_key()
+                self._async_client = anthropic.AsyncAnthropic(
+                    api_key=api_key, **self.sdk_client_kwargs(asynchronous=True)
+                )
+            return self._async_client
     
     def chat_completion(
         self,
@@ -34,19 +84,96 @@ class AnthropicProvider(BaseProvider):
         **kwargs,
     ) -> Dict[str, Any]:
         """Send a chat completion request to Anthropic Claude"""
-        
-        # Extract system message if present
-        system_prompt = ""
-        chat_messages = []
-        
-        for msg in messages:
-            if msg["role"] == "system":
-                system_prompt = msg["content"]
-            else:
-                chat_messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"],
-                })
+        request_kwargs = self._chat_request(model, messages, temperature, max_tokens)
+        response = self.client.messages.create(**request_kwargs)
+        return self._chat_result(response)
+    
+    async def achat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Send a chat completion request to Anthropic Claude without blocking the event loop"""
+        request_kwargs = self._chat_request(model, messages, temperature, max_tokens)
+        response = await self.async_client.messages.create(**request_kwargs)
+        return self._chat_result(response)
+    
+    def stream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Stream a chat completion from Anthropic Claude, timing each text delta"""
+        request_kwargs = self._chat_request(model, messages, temperature, max_tokens)
+        timer = StreamTimer()
+        with self.client.messages.stream(**request_kwargs) as stream:
+            for text in stream.text_stream:
+                timer.chunk(text)
+            response = stream.get_final_message()
+        return {**self._chat_result(response), "stream": timer.result()}
+    
+    async def astream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Stream a chat completion from Anthropic Claude without blocking the event loop"""
+        request_kwargs = self._chat_request(model, messages, temperature, max_tokens)
+        timer = StreamTimer()
+        async with self.async_client.messages.stream(**request_kwargs) as stream:
+            async for text in stream.text_stream:
+                timer.chunk(text)
+            response = await stream.get_final_message()
+        return {**self._chat_result(response), "stream": timer.result()}
+    
+    def function_call(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        functions: List[Dict[str, Any]],
+        temperature: float = 0.2,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Send a tool use request to Anthropic Claude"""
+        request_kwargs = self._function_call_request(
+            model, messages, functions, temperature, kwargs
+        )
+        response = self.client.messages.create(**request_kwargs)
+        return self._function_call_result(response)
+    
+    async def afunction_call(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        functions: List[Dict[str, Any]],
+        temperature: float = 0.2,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Send a tool use request to Anthropic Claude without blocking the event loop"""
+        request_kwargs = self._function_call_request(
+            model, messages, functions, temperature, kwargs
+        )
+        response = await self.async_client.messages.create(**request_kwargs)
+        return self._function_call_result(response)
+    
+    def _chat_request(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+    ) -> Dict[str, Any]:
+        """Build messages.create kwargs for a chat completion"""
+        system_prompt, chat_messages = _split_system_prompt(messages)
         
         request_kwargs = {
             "model": model,
@@ -58,8 +185,10 @@ class AnthropicProvider(BaseProvider):
         if system_prompt:
             request_kwargs["system"] = system_prompt
         
-        response = self.client.messages.create(**request_kwargs)
-        
+        return request_kwargs
+    
+    def _chat_result(self, response) -> Dict[str, Any]:
+        """Convert a messages response to the provider result dict"""
         # Extract content from response
         content = ""
         if response.content:
@@ -67,40 +196,22 @@ class AnthropicProvider(BaseProvider):
                 if hasattr(block, "text"):
                     content += block.text
         
-        usage = {
-            "prompt_tokens": response.usage.input_tokens if response.usage else 0,
-            "completion_tokens": response.usage.output_tokens if response.usage else 0,
-            "total_tokens": (response.usage.input_tokens + response.usage.output_tokens) if response.usage else 0,
-        }
-        
         return {
             "content": content,
-            "usage": usage,
+            "usage": _usage_from_response(response),
             "raw": response,
         }
     
-    def function_call(
+    def _function_call_request(
         self,
         model: str,
         messages: List[Dict[str, str]],
         functions: List[Dict[str, Any]],
-        temperature: float = 0.2,
-        **kwargs,
+        temperature: float,
+        kwargs: Dict[str, Any],
     ) -> Dict[str, Any]:
-        """Send a tool use request to Anthropic Claude"""
-        
-        # Extract system message if present
-        system_prompt = ""
-        chat_messages = []
-        
-        for msg in messages:
-            if msg["role"] == "system":
-                system_prompt = msg["content"]
-            else:
-                chat_messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"],
-                })
+        """Build messages.create kwargs for a tool use request"""
+        system_prompt, chat_messages = _split_system_prompt(messages)
         
         # Convert functions to Anthropic tools format
         tools = []
@@ -122,8 +233,10 @@ class AnthropicProvider(BaseProvider):
         if system_prompt:
             request_kwargs["system"] = system_prompt
         
-        response = self.client.messages.create(**request_kwargs)
-        
+        return request_kwargs
+    
+    def _function_call_result(self, response) -> Dict[str, Any]:
+        """Convert a tool use response to the provider result dict"""
         # Extract content and tool calls
         content = ""
         tool_calls = []
@@ -133,7 +246,6 @@ class AnthropicProvider(BaseProvider):
                 if hasattr(block, "text"):
                     content += block.text
                 elif hasattr(block, "type") and block.type == "tool_use":
-                    import json
                     tool_calls.append({
                         "id": block.id,
                         "function": {
@@ -142,15 +254,41 @@ class AnthropicProvider(BaseProvider):
                         }
                     })
         
-        usage = {
-            "prompt_tokens": response.usage.input_tokens if response.usage else 0,
-            "completion_tokens": response.usage.output_tokens if response.usage else 0,
-            "total_tokens": (response.usage.input_tokens + response.usage.output_tokens) if response.usage else 0,
-        }
-        
         return {
             "content": content,
             "tool_calls": tool_calls,
-            "usage": usage,
+            "usage": _usage_from_response(response),
             "raw": response,
         }
+    
+    def submit_batch(self, requests: List[Dict[str, Any]]) -> str:
+        """Start a Message Batches job"""
+        batch = self.client.messages.batches.create(requests=[
+            {
+                "custom_id": request["custom_id"],
+                "params": self._chat_request(
+                    request["model"],
+                    request["messages"],
+                    request.get("temperature", 0.2),
+                    request.get("max_tokens"),
+                ),
+            }
+            for request in requests
+        ])
+        return batch.id
+    
+    def batch_status(self, batch_id: str) -> str:
+        """Map the batch processing status to pending or ended"""
+        batch = self.client.messages.batches.retrieve(batch_id)
+        return "ended" if batch.processing_status == "ended" else "pending"
+    
+    def batch_results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """Stream the results of an ended batch"""
+        results = {}
+        for entry in self.client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = self._chat_result(entry.result.message)
+            else:
+                error = getattr(entry.result, "error", None) or entry.result.type
+                results[entry.custom_id] = {"error": str(error)}
+        return results
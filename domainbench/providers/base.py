@@ -2,9 +2,12 @@
 Base provider interface for LLM APIs
 """
 
+import asyncio
 import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 
 
 class BaseProvider(ABC):
@@ -16,20 +19,29 @@ class BaseProvider(ABC):
     
     name: str = "base"
     supported_features: List[str] = ["chat_completion"]
+    default_api_key_env: str = ""
     
-    def __init__(self, api_key_env: Optional[str] = None):
+    def __init__(
+        self, api_key_env: Optional[str] = None, base_url: Optional[str] = None, clients=None
+    ):
         """
         Initialize the provider.
         
         Args:
             api_key_env: Environment variable name for API key (optional, uses default if not set)
+            base_url: API endpoint override (optional, uses the SDK default if not set)
+            clients: ClientRegistry whose shared connection pools the SDK clients use (optional)
         """
         self.api_key_env = api_key_env
+        self.base_url = base_url
+        self.clients = clients
         self._client = None
+        # SDK clients are created lazily and may be first used by several workers at once
+        self._client_lock = threading.Lock()
     
-    def get_api_key(self, default_env: str) -> str:
+    def get_api_key(self, default_env: Optional[str] = None) -> str:
         """Get API key from environment variable"""
-        env_var = self.api_key_env or default_env
+        env_var = self.api_key_env or default_env or self.default_api_key_env
         key = os.environ.get(env_var, "").strip()
         if not key:
             raise ValueError(f"Missing required environment variable: {env_var}")
@@ -128,6 +140,366 @@ class BaseProvider(ABC):
         """
         raise NotImplementedError(f"{self.name} does not support vision")
     
+    def stream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Send a chat completion request and consume the response as a token stream.
+        
+        Args:
+            model: Model identifier
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            **kwargs: Additional provider-specific options
+        
+        Returns:
+            Same dict as chat_completion plus 'stream' (see StreamTimer.result)
+        """
+        raise NotImplementedError(f"{self.name} does not support streaming")
+    
+    def submit_batch(self, requests: List[Dict[str, Any]]) -> str:
+        """
+        Submit chat completion requests as one asynchronous batch job.
+        
+        Args:
+            requests: List of dicts with 'custom_id', 'model', 'messages',
+                'temperature' and 'max_tokens'
+        
+        Returns:
+            Provider batch ID
+        """
+        raise NotImplementedError(f"{self.name} does not support batch submission")
+    
+    def batch_status(self, batch_id: str) -> str:
+        """Return "pending" while a batch is processing and "ended" once it is done"""
+        raise NotImplementedError(f"{self.name} does not support batch submission")
+    
+    def batch_results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Collect the results of an ended batch.
+        
+        Returns:
+            Dict mapping custom_id to a chat completion result dict, or to
+            {'error': str} for requests that failed or expired
+        """
+        raise NotImplementedError(f"{self.name} does not support batch submission")
+    
+    def sdk_client_kwargs(self, asynchronous: bool = False) -> Dict[str, Any]:
+        """
+        Constructor arguments for an OpenAI-style SDK client.
+        
+        SDK retries are disabled: RetryingProvider is the only retry layer, so
+        every attempt waits for rate-limit budget and is counted in the stats.
+        """
+        kwargs: Dict[str, Any] = {"max_retries": 0}
+        if self.base_url:
+            kwargs["base_url"] = self.base_url
+        if self.clients is not None:
+            if asynchronous:
+                kwargs["http_client"] = self.clients.async_http_client(self.name)
+            else:
+                kwargs["http_client"] = self.clients.http_client(self.name)
+        return kwargs
+    
     def supports(self, feature: str) -> bool:
         """Check if provider supports a specific feature"""
         return feature in self.supported_features
+
+    def estimate_cost(self, model: str, usage: Dict[str, int]) -> Optional[float]:
+        """Dollars for one call's usage at the built-in list prices (None for unknown models)"""
+        from domainbench.core.cost import PriceTable
+        return PriceTable().estimate_cost(self.name, model, usage)
+
+
+class AsyncBaseProvider(ABC):
+    """
+    Asyncio interface for LLM provider adapters.
+    
+    Providers backed by an async SDK client implement this alongside
+    BaseProvider so that many requests can be in flight on a single
+    event loop. The result dicts match their synchronous counterparts.
+    """
+    
+    @abstractmethod
+    async def achat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Send a chat completion request without blocking the event loop.
+        
+        Args:
+            model: Model identifier
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            **kwargs: Additional provider-specific options
+        
+        Returns:
+            Dict with 'content' (str), 'usage' (dict), and 'raw' (original response)
+        """
+        pass
+    
+    async def afunction_call(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        functions: List[Dict[str, Any]],
+        temperature: float = 0.2,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Send a function calling request without blocking the event loop.
+        
+        Args:
+            model: Model identifier
+            messages: List of message dicts
+            functions: List of function definitions
+            temperature: Sampling temperature
+            **kwargs: Additional options
+        
+        Returns:
+            Dict with function call info or text response
+        """
+        raise NotImplementedError(
+            f"{getattr(self, 'name', 'provider')} does not support async function calling"
+        )
+    
+    async def astream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Async variant of BaseProvider.stream_chat_completion"""
+        raise NotImplementedError(
+            f"{getattr(self, 'name', 'provider')} does not support async streaming"
+        )
+
+
+class StreamTimer:
+    """
+    Arrival times of streamed content chunks.
+    
+    Created just before a streaming request is sent; chunk() is called for
+    every content delta as it arrives. Chunks are timed on arrival, so
+    providers that send several tokens per delta yield per-chunk rather than
+    strictly per-token gaps. RateLimitedProvider re-measures ttft_ms from
+    first_chunk_at, against the moment it sent the request.
+    """
+    
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.chunk_times: List[float] = []
+    
+    def chunk(self, text: Optional[str]) -> None:
+        if text:
+            self.chunk_times.append(time.perf_counter())
+    
+    def result(self) -> Dict[str, Any]:
+        """Time to first chunk and the gaps between chunks, in milliseconds"""
+        times = self.chunk_times
+        return {
+            "ttft_ms": (times[0] - self.start) * 1000 if times else None,
+            "first_chunk_at": times[0] if times else None,
+            "gaps_ms": [(later - earlier) * 1000 for earlier, later in zip(times, times[1:])],
+            "chunks": len(times),
+        }
+
+
+async def async_chat_completion(provider: BaseProvider, **kwargs) -> Dict[str, Any]:
+    """
+    Await a chat completion from any provider.
+    
+    Uses the native async client when the provider implements
+    AsyncBaseProvider, otherwise runs the blocking call on a worker thread.
+    """
+    if isinstance(provider, AsyncBaseProvider):
+        return await provider.achat_completion(**kwargs)
+    return await asyncio.to_thread(provider.chat_completion, **kwargs)
+
+
+async def async_stream_chat_completion(provider: BaseProvider, **kwargs) -> Dict[str, Any]:
+    """Await a streamed chat completion from any provider (see async_chat_completion)"""
+    if isinstance(provider, AsyncBaseProvider):
+        return await provider.astream_chat_completion(**kwargs)
+    return await asyncio.to_thread(provider.stream_chat_completion, **kwargs)
+
+
+class ProviderWrapper(BaseProvider, AsyncBaseProvider):
+    """
+    Base class for providers that add behavior around another provider.
+    
+    Every request method delegates to the wrapped provider through _call
+    (or _acall for async methods). Subclasses override those two hooks to
+    run code before and after each request, e.g. throttling or retrying.
+    """
+    
+    def __init__(self, provider: BaseProvider):
+        super().__init__(provider.api_key_env)
+        self.provider = provider
+        self.name = provider.name
+        self.supported_features = provider.supported_features
+    
+    def _call(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: Optional[int],
+        call: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Invoke a request on the wrapped provider"""
+        return call()
+    
+    async def _acall(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: Optional[int],
+        call: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Invoke an async request on the wrapped provider"""
+        return await call()
+    
+    def chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        return self._call(model, messages, max_tokens, lambda: self.provider.chat_completion(
+            model=model, messages=messages, temperature=temperature, max_tokens=max_tokens, **kwargs
+        ))
+    
+    async def achat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        return await self._acall(model, messages, max_tokens, lambda: async_chat_completion(
+            self.provider, model=model, messages=messages, temperature=temperature,
+            max_tokens=max_tokens, **kwargs
+        ))
+    
+    def stream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        return self._call(model, messages, max_tokens, lambda: self.provider.stream_chat_completion(
+            model=model, messages=messages, temperature=temperature, max_tokens=max_tokens, **kwargs
+        ))
+    
+    async def astream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        return await self._acall(model, messages, max_tokens, lambda: async_stream_chat_completion(
+            self.provider, model=model, messages=messages, temperature=temperature,
+            max_tokens=max_tokens, **kwargs
+        ))
+    
+    def function_call(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        functions: List[Dict[str, Any]],
+        temperature: float = 0.2,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        return self._call(
+            model,
+            messages,
+            kwargs.get("max_tokens"),
+            lambda: self.provider.function_call(
+                model=model,
+                messages=messages,
+                functions=functions,
+                temperature=temperature,
+                **kwargs,
+            ),
+        )
+    
+    async def afunction_call(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        functions: List[Dict[str, Any]],
+        temperature: float = 0.2,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        def call() -> Awaitable[Dict[str, Any]]:
+            if isinstance(self.provider, AsyncBaseProvider):
+                return self.provider.afunction_call(
+                    model=model, messages=messages, functions=functions,
+                    temperature=temperature, **kwargs
+                )
+            return asyncio.to_thread(
+                self.provider.function_call, model=model, messages=messages,
+                functions=functions, temperature=temperature, **kwargs
+            )
+        
+        return await self._acall(model, messages, kwargs.get("max_tokens"), call)
+    
+    def structured_output(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        schema: Dict[str, Any],
+        temperature: float = 0.2,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        return self._call(
+            model,
+            messages,
+            kwargs.get("max_tokens"),
+            lambda: self.provider.structured_output(
+                model=model, messages=messages, schema=schema, temperature=temperature, **kwargs
+            ),
+        )
+    
+    def vision(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        images: List[str],
+        temperature: float = 0.2,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        return self._call(model, messages, kwargs.get("max_tokens"), lambda: self.provider.vision(
+            model=model, messages=messages, images=images, temperature=temperature, **kwargs
+        ))
+    
+    def submit_batch(self, requests: List[Dict[str, Any]]) -> str:
+        # Batch jobs have their own provider quotas, so they bypass the wrapper hooks
+        return self.provider.submit_batch(requests)
+    
+    def batch_status(self, batch_id: str) -> str:
+        return self.provider.batch_status(batch_id)
+    
+    def batch_results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        return self.provider.batch_results(batch_id)
@@ -0,0 +1,109 @@
+"""
+Clients - Provider instances and HTTP connection pools shared across roles and workers
+"""
+
+import hashlib
+import os
+import threading
+from typing import Dict, Any, Optional, Tuple, Callable
+
+import httpx
+
+from domainbench.core.config import HttpConfig
+from domainbench.providers.base import BaseProvider
+
+
+def client_key(
+    provider: str, api_key_env: str, base_url: Optional[str]
+) -> Tuple[str, str, Optional[str]]:
+    """
+    Identity of an SDK client: (provider, credentials, base URL).
+    
+    Credentials are the resolved API key, hashed so the key itself is never
+    held in the registry.
+    """
+    api_key = os.environ.get(api_key_env, "").strip()
+    digest = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    return (provider, digest, base_url.rstrip("/") if base_url else None)
+
+
+class ClientRegistry:
+    """
+    Providers and httpx connection pools shared by every role in a run.
+    
+    Providers are keyed by client_key, so a judge and a candidate calling
+    the same account and endpoint share one provider and its SDK clients.
+    Every SDK client of one provider type draws on a single httpx pool
+    (one sync, one async) sized by HttpConfig, so TLS connections are
+    reused across models, the judge and concurrent workers alike.
+    """
+    
+    def __init__(self, http: Optional[HttpConfig] = None):
+        self.http = http or HttpConfig()
+        self._providers: Dict[Tuple[str, str, Optional[str]], BaseProvider] = {}
+        self._clients: Dict[str, httpx.Client] = {}
+        self._async_clients: Dict[str, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+    
+    def provider(
+        self, key: Tuple[str, str, Optional[str]], factory: Callable[[], BaseProvider]
+    ) -> BaseProvider:
+        """Get the provider for a client key, creating it on first use"""
+        with self._lock:
+            provider = self._providers.get(key)
+            if provider is None:
+                provider = factory()
+                self._providers[key] = provider
+            return provider
+    
+    def client_args(self) -> Dict[str, Any]:
+        """Keyword arguments for an httpx client with the configured pool"""
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.http.max_connections,
+                max_keepalive_connections=self.http.max_keepalive_connections,
+                keepalive_expiry=self.http.keepalive_expiry,
+            ),
+            "http2": self.http.http2,
+        }
+    
+    def http_client(self, name: str) -> httpx.Client:
+        """Shared sync connection pool for one provider type"""
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                client = httpx.Client(**self.client_args())
+                self._clients[name] = client
+            return client
+    
+    def async_http_client(self, name: str) -> httpx.AsyncClient:
+        """Shared asyncio connection pool for one provider type"""
+        with self._lock:
+            client = self._async_clients.get(name)
+            if client is None:
+                client = httpx.AsyncClient(**self.client_args())
+                self._async_clients[name] = client
+            return client
+    
+    def stats(self) -> Dict[str, Any]:
+        """Distinct providers and connection pools opened so far"""
+        with self._lock:
+            return {
+                "providers": len(self._providers),
+                "pools": sorted({*self._clients, *self._async_clients}),
+            }
+    
+    def close(self) -> None:
+        """Close the sync pools (async pools are closed by aclose)"""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+            self._providers = {}
+        for client in clients:
+            client.close()
+    
+    async def aclose(self) -> None:
+        """Close the async pools on the event loop that used them"""
+        with self._lock:
+            clients, self._async_clients = list(self._async_clients.values()), {}
+        for client in clients:
+            await client.aclose()
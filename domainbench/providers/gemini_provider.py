@@ -4,27 +4,95 @@ Based on the GeminiChat class from waiterbench.py
 """
 
 from typing import List, Dict, Any, Optional
-from domainbench.providers.base import BaseProvider
+from domainbench.providers.base import BaseProvider, AsyncBaseProvider, StreamTimer
 
 
-class GeminiProvider(BaseProvider):
+def _messages_to_transcript(messages: List[Dict[str, str]]) -> str:
+    """
+    Convert messages to transcript format for Gemini
+    
+    SYSTEM: ...
+    USER: ...
+    ASSISTANT: ...
+    """
+    lines = []
+    for m in messages:
+        role = m.get("role", "user").upper()
+        content = m.get("content", "")
+        lines.append(f"{role}: {content}")
+    
+    return "\n".join(lines)
+
+
+def _usage_from_metadata(response) -> Dict[str, int]:
+    """Extract token usage from a Gemini response or stream chunk"""
+    # Gemini doesn't provide token usage in the same way
+    meta = getattr(response, "usage_metadata", None)
+    if meta is None:
+        return {}
+    return {
+        "prompt_tokens": getattr(meta, "prompt_token_count", 0),
+        "completion_tokens": getattr(meta, "candidates_token_count", 0),
+        "total_tokens": getattr(meta, "total_token_count", 0),
+        "cached_tokens": getattr(meta, "cached_content_token_count", 0) or 0,
+    }
+
+
+class GeminiProvider(BaseProvider, AsyncBaseProvider):
     """Provider adapter for Google Gemini API"""
     
     name = "gemini"
-    supported_features = ["chat_completion"]
+    supported_features = ["chat_completion", "streaming"]
+    default_api_key_env = "GEMINI_API_KEY"
     
-    def __init__(self, api_key_env: Optional[str] = None):
-        super().__init__(api_key_env)
+    def __init__(
+        self, api_key_env: Optional[str] = None, base_url: Optional[str] = None, clients=None
+    ):
+        super().__init__(api_key_env, base_url, clients)
         self._client = None
+        self._async_client = None
     
     @property
     def client(self):
         """Lazy initialization of Gemini client"""
-        if self._client is None:
-            from google import genai
-            api_key = self.get_api_key("GEMINI_API_KEY")
-            self._client = genai.Client(api_key=api_key)
-        return self._client
+        with self._client_lock:
+            if self._client is None:
+                from google import genai
+                api_key = self.get_api_key()
+                self._client = genai.Client(api_key=api_key, **self._http_options())
+            return self._client
+    
+    @property
+    def async_client(self):
+        """
+        Lazy asyncio Gemini client.
+        
+        It is a separate genai.Client so the shared async pool is only
+        opened by async runs, which close it on their event loop.
+        """
+        with self._client_lock:
+            if self._async_client is None:
+                from google import genai
+                api_key = self.get_api_key()
+                self._async_client = genai.Client(
+                    api_key=api_key, **self._http_options(asynchronous=True)
+                ).aio
+            return self._async_client
+    
+    def _http_options(self, asynchronous: bool = False) -> Dict[str, Any]:
+        """Endpoint override and the shared connection pool, in google-genai's HttpOptions"""
+        options: Dict[str, Any] = {}
+        if self.base_url:
+            options["base_url"] = self.base_url
+        if self.clients is not None:
+            if asynchronous:
+                options["httpx_async_client"] = self.clients.async_http_client(self.name)
+            else:
+                options["httpx_client"] = self.clients.http_client(self.name)
+        if not options:
+            return {}
+        from google.genai import types
+        return {"http_options": types.HttpOptions(**options)}
     
     def chat_completion(
         self,
@@ -40,18 +108,7 @@ class GeminiProvider(BaseProvider):
         Note: Gemini API has a different message format, so we convert
         the standard messages to a single prompt transcript.
         """
-        
-        # Convert messages to transcript format for Gemini
-        # SYSTEM: ...
-        # USER: ...
-        # ASSISTANT: ...
-        lines = []
-        for m in messages:
-            role = m.get("role", "user").upper()
-            content = m.get("content", "")
-            lines.append(f"{role}: {content}")
-        
-        prompt = "\n".join(lines)
+        prompt = _messages_to_transcript(messages)
         
         # Generate content
         # Note: config parameter handling varies by google-genai version
@@ -61,26 +118,90 @@ class GeminiProvider(BaseProvider):
                 contents=prompt,
             )
         except Exception as e:
-            raise RuntimeError(f"Gemini API error: {e}")
+            raise RuntimeError(f"Gemini API error: {e}") from e
+        
+        return self._chat_result(response)
+    
+    async def achat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Send a chat completion request to Gemini without blocking the event loop"""
+        prompt = _messages_to_transcript(messages)
+        
+        try:
+            response = await self.async_client.models.generate_content(
+                model=model,
+                contents=prompt,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Gemini API error: {e}") from e
+        
+        return self._chat_result(response)
+    
+    def stream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Stream a chat completion from Gemini, timing each text chunk"""
+        prompt = _messages_to_transcript(messages)
+        timer = StreamTimer()
+        parts, usage = [], {}
+        try:
+            for chunk in self.client.models.generate_content_stream(model=model, contents=prompt):
+                text = getattr(chunk, "text", None)
+                timer.chunk(text)
+                parts.append(text or "")
+                usage = _usage_from_metadata(chunk) or usage
+        except Exception as e:
+            raise RuntimeError(f"Gemini API error: {e}") from e
         
+        return {"content": "".join(parts), "usage": usage, "stream": timer.result()}
+    
+    async def astream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Stream a chat completion from Gemini without blocking the event loop"""
+        prompt = _messages_to_transcript(messages)
+        timer = StreamTimer()
+        parts, usage = [], {}
+        try:
+            stream = await self.async_client.models.generate_content_stream(
+                model=model, contents=prompt
+            )
+            async for chunk in stream:
+                text = getattr(chunk, "text", None)
+                timer.chunk(text)
+                parts.append(text or "")
+                usage = _usage_from_metadata(chunk) or usage
+        except Exception as e:
+            raise RuntimeError(f"Gemini API error: {e}") from e
+        
+        return {"content": "".join(parts), "usage": usage, "stream": timer.result()}
+    
+    def _chat_result(self, response) -> Dict[str, Any]:
+        """Convert a generate_content response to the provider result dict"""
         # Extract text from response
         text = getattr(response, "text", None)
         if text is None:
             # Fallback if response structure differs
             text = str(response)
         
-        # Gemini doesn't provide token usage in the same way
-        usage = {}
-        if hasattr(response, "usage_metadata"):
-            meta = response.usage_metadata
-            usage = {
-                "prompt_tokens": getattr(meta, "prompt_token_count", 0),
-                "completion_tokens": getattr(meta, "candidates_token_count", 0),
-                "total_tokens": getattr(meta, "total_token_count", 0),
-            }
-        
         return {
             "content": text,
-            "usage": usage,
+            "usage": _usage_from_metadata(response),
             "raw": response,
         }
@@ -0,0 +1,52 @@
+"""
+OpenAI-compatible provider adapters for self-hosted servers (Ollama, vLLM, llama.cpp server)
+"""
+
+import os
+from typing import Optional
+
+from domainbench.providers.openai_provider import OpenAIProvider
+
+
+class OpenAICompatibleProvider(OpenAIProvider):
+    """
+    Provider adapter for any server exposing the OpenAI chat completions API.
+    
+    The endpoint comes from the model's base_url, or else CUSTOM_BASE_URL.
+    Local servers usually ignore the API key, so one is only sent when
+    the key variable is set.
+    """
+    
+    name = "custom"
+    supported_features = ["chat_completion", "function_calling", "structured_output", "streaming"]
+    default_api_key_env = "CUSTOM_API_KEY"
+    
+    def __init__(
+        self, api_key_env: Optional[str] = None, base_url: Optional[str] = None, clients=None
+    ):
+        super().__init__(api_key_env, base_url or self.default_base_url(), clients)
+        if not self.base_url:
+            raise ValueError(f"The {self.name} provider needs a base_url (or CUSTOM_BASE_URL)")
+    
+    def default_base_url(self) -> Optional[str]:
+        """Endpoint used when the model config sets no base_url"""
+        return os.environ.get("CUSTOM_BASE_URL")
+    
+    def get_api_key(self, default_env: Optional[str] = None) -> str:
+        """API key if one is configured, else a placeholder (the SDK requires a value)"""
+        env_var = self.api_key_env or default_env or self.default_api_key_env
+        return os.environ.get(env_var, "").strip() or "not-needed"
+
+
+class OllamaProvider(OpenAICompatibleProvider):
+    """Provider adapter for Ollama's OpenAI-compatible endpoint"""
+    
+    name = "ollama"
+    default_api_key_env = "OLLAMA_API_KEY"
+    
+    def default_base_url(self) -> Optional[str]:
+        """OLLAMA_HOST (as the ollama CLI reads it), defaulting to the local daemon"""
+        host = os.environ.get("OLLAMA_HOST", "").strip() or "http://localhost:11434"
+        if "://" not in host:
+            host = f"http://{host}"
+        return f"{host.rstrip('/')}/v1"
@@ -3,28 +3,62 @@ OpenAI provider adapter
 Based on the OpenAIChat class from waiterbench.py
 """
 
+import json
 from typing import List, Dict, Any, Optional
-from domainbench.providers.base import BaseProvider
+from domainbench.providers.base import BaseProvider, AsyncBaseProvider, StreamTimer
 
 
-class OpenAIProvider(BaseProvider):
+def _usage_from_response(response) -> Dict[str, int]:
+    """Extract token usage from an OpenAI response"""
+    if not response.usage:
+        return {}
+    # Prompt tokens served from OpenAI's prompt cache (billed at a discount)
+    details = getattr(response.usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": response.usage.prompt_tokens,
+        "completion_tokens": response.usage.completion_tokens,
+        "total_tokens": response.usage.total_tokens,
+        "cached_tokens": getattr(details, "cached_tokens", 0) or 0,
+    }
+
+
+class OpenAIProvider(BaseProvider, AsyncBaseProvider):
     """Provider adapter for OpenAI API"""
     
     name = "openai"
-    supported_features = ["chat_completion", "function_calling", "structured_output", "vision"]
+    supported_features = [
+        "chat_completion", "function_calling", "structured_output", "vision", "batch", "streaming"
+    ]
+    default_api_key_env = "OPENAI_API_KEY"
     
-    def __init__(self, api_key_env: Optional[str] = None):
-        super().__init__(api_key_env)
+    def __init__(
+        self, api_key_env: Optional[str] = None, base_url: Optional[str] = None, clients=None
+    ):
+        super().__init__(api_key_env, base_url, clients)
         self._client = None
+        self._async_client = None
     
     @property
     def client(self):
         """Lazy initialization of OpenAI client"""
-        if self._client is None:
-            from openai import OpenAI
-            api_key = self.get_api_key("OPENAI_API_KEY")
-            self._client = OpenAI(api_key=api_key)
-        return self._client
+        with self._client_lock:
+            if self._client is None:
+                from openai import OpenAI
+                api_key = self.get_api_key()
+                self._client = OpenAI(api_key=api_key, **self.sdk_client_kwargs())
+            return self._client
+    
+    @property
+    def async_client(self):
+        """Lazy initialization of the asyncio OpenAI client"""
+        with self._client_lock:
+            if self._async_client is None:
+                from openai import AsyncOpenAI
+                api_key = self.get_api_key()
+                self._async_client = AsyncOpenAI(
+                    api_key=api_key, **self.sdk_client_kwargs(asynchronous=True)
+                )
+            return self._async_client
     
     def chat_completion(
         self,
@@ -35,7 +69,86 @@ class OpenAIProvider(BaseProvider):
         **kwargs,
     ) -> Dict[str, Any]:
         """Send a chat completion request to OpenAI"""
-        
+        request_kwargs = self._chat_request(model, messages, temperature, max_tokens, kwargs)
+        response = self.client.chat.completions.create(**request_kwargs)
+        return self._chat_result(response)
+    
+    async def achat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Send a chat completion request to OpenAI without blocking the event loop"""
+        request_kwargs = self._chat_request(model, messages, temperature, max_tokens, kwargs)
+        response = await self.async_client.chat.completions.create(**request_kwargs)
+        return self._chat_result(response)
+    
+    def stream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Stream a chat completion from OpenAI, timing each content delta"""
+        request_kwargs = self._stream_request(model, messages, temperature, max_tokens, kwargs)
+        timer = StreamTimer()
+        parts, usage = [], {}
+        for chunk in self.client.chat.completions.create(**request_kwargs):
+            usage = _usage_from_response(chunk) or usage
+            if chunk.choices:
+                text = chunk.choices[0].delta.content
+                timer.chunk(text)
+                parts.append(text or "")
+        return {"content": "".join(parts), "usage": usage, "stream": timer.result()}
+    
+    async def astream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Stream a chat completion from OpenAI without blocking the event loop"""
+        request_kwargs = self._stream_request(model, messages, temperature, max_tokens, kwargs)
+        timer = StreamTimer()
+        parts, usage = [], {}
+        async for chunk in await self.async_client.chat.completions.create(**request_kwargs):
+            usage = _usage_from_response(chunk) or usage
+            if chunk.choices:
+                text = chunk.choices[0].delta.content
+                timer.chunk(text)
+                parts.append(text or "")
+        return {"content": "".join(parts), "usage": usage, "stream": timer.result()}
+    
+    def _stream_request(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Chat completion kwargs for a stream that reports usage in its final chunk"""
+        request_kwargs = self._chat_request(model, messages, temperature, max_tokens, kwargs)
+        request_kwargs["stream"] = True
+        request_kwargs["stream_options"] = {"include_usage": True}
+        return request_kwargs
+    
+    def _chat_request(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Build chat completion request kwargs"""
         request_kwargs = {
             "model": model,
             "messages": messages,
@@ -47,22 +160,15 @@ class OpenAIProvider(BaseProvider):
         
         # Add any additional kwargs
         request_kwargs.update(kwargs)
-        
-        response = self.client.chat.completions.create(**request_kwargs)
-        
+        return request_kwargs
+    
+    def _chat_result(self, response) -> Dict[str, Any]:
+        """Convert a chat completion response to the provider result dict"""
         content = response.choices[0].message.content or ""
         
-        usage = {}
-        if response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
-        
         return {
             "content": content,
-            "usage": usage,
+            "usage": _usage_from_response(response),
             "raw": response,
         }
     
@@ -86,7 +192,30 @@ class OpenAIProvider(BaseProvider):
             temperature=temperature,
             **kwargs,
         )
+        return self._function_call_result(response)
+    
+    async def afunction_call(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        functions: List[Dict[str, Any]],
+        temperature: float = 0.2,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Send a function calling request to OpenAI without blocking the event loop"""
+        tools = [{"type": "function", "function": f} for f in functions]
         
+        response = await self.async_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            tools=tools,
+            temperature=temperature,
+            **kwargs,
+        )
+        return self._function_call_result(response)
+    
+    def _function_call_result(self, response) -> Dict[str, Any]:
+        """Convert a tool calling response to the provider result dict"""
         message = response.choices[0].message
         content = message.content or ""
         
@@ -102,18 +231,10 @@ class OpenAIProvider(BaseProvider):
                     }
                 })
         
-        usage = {}
-        if response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
-        
         return {
             "content": content,
             "tool_calls": tool_calls,
-            "usage": usage,
+            "usage": _usage_from_response(response),
             "raw": response,
         }
     
@@ -137,23 +258,81 @@ class OpenAIProvider(BaseProvider):
         
         content = response.choices[0].message.content or "{}"
         
-        import json
         try:
             parsed = json.loads(content)
         except json.JSONDecodeError:
             parsed = None
         
-        usage = {}
-        if response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
-        
         return {
             "content": content,
             "parsed": parsed,
-            "usage": usage,
+            "usage": _usage_from_response(response),
             "raw": response,
         }
+    
+    def submit_batch(self, requests: List[Dict[str, Any]]) -> str:
+        """Upload requests as a JSONL batch file and start a Batch API job"""
+        lines = []
+        for request in requests:
+            body = self._chat_request(
+                request["model"],
+                request["messages"],
+                request.get("temperature", 0.2),
+                request.get("max_tokens"),
+                {},
+            )
+            lines.append(json.dumps({
+                "custom_id": request["custom_id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }, ensure_ascii=False))
+        
+        batch_file = self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+    
+    def batch_status(self, batch_id: str) -> str:
+        """Map the Batch API job status to pending or ended"""
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in ("completed", "failed", "expired", "cancelled"):
+            return "ended"
+        return "pending"
+    
+    def batch_results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """Download the output and error files of an ended batch"""
+        from openai.types.chat import ChatCompletion
+        
+        batch = self.client.batches.retrieve(batch_id)
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get("response") or {}
+                body = response.get("body") or {}
+                
+                if response.get("status_code") == 200 and body.get("choices"):
+                    results[entry["custom_id"]] = self._chat_result(
+                        ChatCompletion.model_validate(body)
+                    )
+                else:
+                    error = (
+                        entry.get("error")
+                        or body.get("error")
+                        or f"status {response.get('status_code')}"
+                    )
+                    results[entry["custom_id"]] = {"error": str(error)}
+        
+        return results
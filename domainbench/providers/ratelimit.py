@@ -0,0 +1,349 @@
+"""
+Rate limiting - Token-bucket RPM/TPM budgets and concurrency caps shared per provider and model
+"""
+
+import asyncio
+import functools
+import threading
+import time
+import weakref
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
+
+from domainbench.providers.base import BaseProvider, ProviderWrapper
+
+
+# Completion budget assumed when a request sets no max_tokens
+DEFAULT_COMPLETION_TOKENS = 512
+
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """
+    Cheap prompt token estimate (~4 characters per token plus per-message overhead).
+    
+    Good enough for budgeting; actual usage is reconciled after each call.
+    """
+    total = 0
+    for m in messages:
+        content = m.get("content", "")
+        if not isinstance(content, str):
+            content = str(content)
+        total += len(content) // 4 + 4
+    return total
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at a per-minute rate.
+    
+    Reservations are taken immediately and may drive the balance negative;
+    the caller then waits until the debt is repaid. This keeps callers in
+    arrival order without holding the lock while sleeping, so the same
+    bucket can serve threads and asyncio tasks.
+    
+    Args:
+        per_minute: Refill rate, which is also the burst capacity
+        clock: Monotonic time source in seconds (injectable for tests)
+    """
+    
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        if per_minute <= 0:
+            raise ValueError("Rate limit must be positive")
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._clock = clock
+        self.updated = clock()
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def reserve(self, amount: float) -> float:
+        """Reserve tokens and return the number of seconds to wait before using them"""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+    
+    def refund(self, amount: float) -> None:
+        """Return unused tokens (or take extra when amount is negative)"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budget for one provider/model"""
+    
+    def __init__(
+        self,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = TokenBucket(rpm, clock) if rpm else None
+        self.tokens = TokenBucket(tpm, clock) if tpm else None
+        
+        # Time spent waiting for budget, for reporting
+        self.wait_seconds = 0.0
+        self._stats_lock = threading.Lock()
+    
+    def _reserve(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(tokens))
+        if wait > 0:
+            with self._stats_lock:
+                self.wait_seconds += wait
+        return wait
+    
+    def acquire(self, tokens: int) -> None:
+        """Block until one request using `tokens` tokens fits the budget"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def aacquire(self, tokens: int) -> None:
+        """Async counterpart of acquire"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """Correct the token bucket once real usage is known"""
+        if self.tokens is not None and actual:
+            self.tokens.refund(estimated - actual)
+
+
+class ConcurrencyLimiter:
+    """
+    Cap on the requests in flight to one provider/model.
+    
+    Threads wait on a semaphore; asyncio tasks wait on a semaphore owned by
+    their event loop, so the cap holds for whichever path a run drives.
+    """
+    
+    def __init__(self, limit: int):
+        if limit <= 0:
+            raise ValueError("Concurrency limit must be positive")
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._async_semaphores: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+        ) = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+    
+    def run(self, call: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Run a request once a slot is free"""
+        with self._semaphore:
+            return call()
+    
+    async def arun(self, call: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Async counterpart of run"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.limit)
+                self._async_semaphores[loop] = semaphore
+        async with semaphore:
+            return await call()
+
+
+class RateLimiterRegistry:
+    """
+    Rate limiters keyed by (provider, model).
+    
+    Candidate models and the judge configure the same registry, so calls
+    to one provider/model share a single budget however many roles use it.
+    When a key is configured twice, the tighter limit wins.
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._limits: Dict[Tuple[str, str], Tuple[Optional[int], Optional[int]]] = {}
+        self._limiters: Dict[Tuple[str, str], RateLimiter] = {}
+        self._concurrency: Dict[Tuple[str, str], ConcurrencyLimiter] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def configured(self) -> bool:
+        """Whether any limits have been configured"""
+        return bool(self._limits)
+    
+    def configure(
+        self, provider: str, model: str, rpm: Optional[int] = None, tpm: Optional[int] = None
+    ) -> None:
+        """Register RPM/TPM limits for a provider/model"""
+        if not rpm and not tpm:
+            return
+        
+        def tighter(a: Optional[int], b: Optional[int]) -> Optional[int]:
+            values = [v for v in (a, b) if v]
+            return min(values) if values else None
+        
+        key = (provider, model)
+        with self._lock:
+            old_rpm, old_tpm = self._limits.get(key, (None, None))
+            self._limits[key] = (tighter(old_rpm, rpm), tighter(old_tpm, tpm))
+            self._limiters.pop(key, None)
+    
+    def configure_concurrency(self, provider: str, model: str, limit: Optional[int]) -> None:
+        """Cap the requests in flight to a provider/model (the tighter cap wins)"""
+        if not limit:
+            return
+        key = (provider, model)
+        with self._lock:
+            current = self._concurrency.get(key)
+            if current is None or limit < current.limit:
+                self._concurrency[key] = ConcurrencyLimiter(limit)
+    
+    def get_concurrency(self, provider: str, model: str) -> Optional[ConcurrencyLimiter]:
+        """Get the shared concurrency cap for a provider/model, or None if uncapped"""
+        with self._lock:
+            return self._concurrency.get((provider, model))
+    
+    def get(self, provider: str, model: str) -> Optional[RateLimiter]:
+        """Get the shared limiter for a provider/model, or None if unlimited"""
+        key = (provider, model)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None and key in self._limits:
+                rpm, tpm = self._limits[key]
+                limiter = RateLimiter(rpm=rpm, tpm=tpm, clock=self._clock)
+                self._limiters[key] = limiter
+            return limiter
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Configured limits and time spent waiting, per provider/model"""
+        with self._lock:
+            items = list(self._limits.items())
+        
+        stats = {}
+        for (provider, model), (rpm, tpm) in items:
+            limiter = self.get(provider, model)
+            stats[f"{provider}/{model}"] = {
+                "rpm": rpm,
+                "tpm": tpm,
+                "wait_seconds": round(limiter.wait_seconds, 2),
+            }
+        return stats
+
+
+class RateLimitedProvider(ProviderWrapper):
+    """
+    Provider wrapper that waits for RPM/TPM budget and a concurrency slot before each request.
+    
+    The request itself is timed inside the slot, so responses carry
+    'latency_seconds' (sending the request until its response) apart from
+    'queue_seconds' (waiting for budget and a slot first). A streamed
+    response's ttft_ms is measured from the same send time.
+    """
+    
+    def __init__(
+        self,
+        provider: BaseProvider,
+        registry: RateLimiterRegistry,
+        provider_key: Optional[str] = None,
+    ):
+        super().__init__(provider)
+        self.registry = registry
+        self.provider_key = provider_key or provider.name
+    
+    def _call(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: Optional[int],
+        call: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        queued = time.perf_counter()
+        timing: Dict[str, float] = {}
+        call = _timed(call, timing)
+        slots = self.registry.get_concurrency(self.provider_key, model)
+        if slots is not None:
+            call = functools.partial(slots.run, call)
+        
+        limiter = self.registry.get(self.provider_key, model)
+        if limiter is None:
+            return _with_timing(call(), queued, timing)
+        
+        estimated = estimate_tokens(messages) + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+        limiter.acquire(estimated)
+        response = call()
+        limiter.reconcile(estimated, response.get("usage", {}).get("total_tokens", 0))
+        return _with_timing(response, queued, timing)
+    
+    async def _acall(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: Optional[int],
+        call: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        queued = time.perf_counter()
+        timing: Dict[str, float] = {}
+        call = _atimed(call, timing)
+        slots = self.registry.get_concurrency(self.provider_key, model)
+        if slots is not None:
+            call = functools.partial(slots.arun, call)
+        
+        limiter = self.registry.get(self.provider_key, model)
+        if limiter is None:
+            return _with_timing(await call(), queued, timing)
+        
+        estimated = estimate_tokens(messages) + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+        await limiter.aacquire(estimated)
+        response = await call()
+        limiter.reconcile(estimated, response.get("usage", {}).get("total_tokens", 0))
+        return _with_timing(response, queued, timing)
+
+
+def _timed(
+    call: Callable[[], Dict[str, Any]],
+    timing: Dict[str, float],
+) -> Callable[[], Dict[str, Any]]:
+    """Wrap a request so the moment it is sent and its duration are recorded in timing"""
+    def send() -> Dict[str, Any]:
+        timing["sent"] = time.perf_counter()
+        response = call()
+        timing["latency"] = time.perf_counter() - timing["sent"]
+        return response
+    return send
+
+
+def _atimed(
+    call: Callable[[], Awaitable[Dict[str, Any]]],
+    timing: Dict[str, float],
+) -> Callable[[], Awaitable[Dict[str, Any]]]:
+    """Async counterpart of _timed"""
+    async def send() -> Dict[str, Any]:
+        timing["sent"] = time.perf_counter()
+        response = await call()
+        timing["latency"] = time.perf_counter() - timing["sent"]
+        return response
+    return send
+
+
+def _with_timing(
+    response: Dict[str, Any], queued: float, timing: Dict[str, float]
+) -> Dict[str, Any]:
+    """Attach the request's own latency and the time it queued for budget and a slot"""
+    timed = {
+        **response,
+        "latency_seconds": timing["latency"],
+        "queue_seconds": timing["sent"] - queued,
+    }
+    stream = response.get("stream")
+    if stream and stream.get("first_chunk_at") is not None:
+        timed["stream"] = {**stream, "ttft_ms": (stream["first_chunk_at"] - timing["sent"]) * 1000}
+    return timed
@@ -0,0 +1,222 @@
+"""
+Retry - Exponential backoff with jitter around provider calls
+"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Iterator
+
+from domainbench.core.config import RetryConfig
+from domainbench.core.tracing import span
+from domainbench.providers.base import BaseProvider, ProviderWrapper
+
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits, server errors
+# and Anthropic's 529 "overloaded"
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+# Transport-level SDK/httpx exception class names (matched by name so the
+# SDKs stay optional imports)
+RETRYABLE_EXCEPTION_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "InternalServerError",
+    "RateLimitError",
+    "ServerError",
+    "TransportError",
+    "TimeoutException",
+}
+
+
+def _exception_chain(exc: BaseException) -> Iterator[BaseException]:
+    """Walk an exception and its causes (providers may wrap SDK errors)"""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """Best-effort HTTP status of an SDK error"""
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Classify an error as transient (retry) or fatal (raise immediately)"""
+    for e in _exception_chain(exc):
+        status = _status_code(e)
+        if status is not None:
+            return status in RETRYABLE_STATUS_CODES
+        if isinstance(e, (ConnectionError, TimeoutError)):
+            return True
+        if any(cls.__name__ in RETRYABLE_EXCEPTION_NAMES for cls in type(e).__mro__):
+            return True
+    return False
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Read a server-provided Retry-After (or retry-after-ms) delay from an error"""
+    for e in _exception_chain(exc):
+        headers = getattr(getattr(e, "response", None), "headers", None)
+        if not headers:
+            continue
+        
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            try:
+                return max(0.0, float(value) / 1000)
+            except ValueError:
+                pass
+        
+        value = headers.get("retry-after")
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+            return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+class RetryStats:
+    """Thread-safe retry counters per provider/model, shared by all retrying providers"""
+    
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, key: str, retries: int, backoff_seconds: float, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                key, {"calls": 0, "retries": 0, "backoff_seconds": 0.0, "failures": 0}
+            )
+            stats["calls"] += 1
+            stats["retries"] += retries
+            stats["backoff_seconds"] += backoff_seconds
+            stats["failures"] += int(failed)
+    
+    @property
+    def any_retries(self) -> bool:
+        with self._lock:
+            return any(s["retries"] or s["failures"] for s in self._stats.values())
+    
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                key: {**stats, "backoff_seconds": round(stats["backoff_seconds"], 2)}
+                for key, stats in self._stats.items()
+            }
+
+
+class RetryingProvider(ProviderWrapper):
+    """
+    Provider wrapper that retries transient failures with exponential backoff.
+    
+    Retryable errors (429, 5xx, timeouts, connection resets) are retried up to
+    config.max_retries times, waiting for the server's Retry-After when one is
+    sent and for a jittered exponential delay otherwise (both capped at
+    config.max_backoff). Fatal errors are
+    raised immediately. Successful responses carry 'retries' and
+    'backoff_seconds' so callers can record the time lost.
+    """
+    
+    def __init__(
+        self,
+        provider: BaseProvider,
+        config: Optional[RetryConfig] = None,
+        stats: Optional[RetryStats] = None,
+        provider_key: Optional[str] = None,
+    ):
+        super().__init__(provider)
+        self.config = config or RetryConfig()
+        self.stats = stats or RetryStats()
+        self.provider_key = provider_key or provider.name
+    
+    def backoff_delay(self, attempt: int, exc: BaseException) -> float:
+        """
+        Seconds to wait before retry number `attempt` (0-based).
+        
+        A server Retry-After is honored but, like the computed backoff, capped
+        at config.max_backoff so a huge header cannot stall a worker.
+        """
+        server_delay = retry_after_seconds(exc)
+        if server_delay is not None:
+            return min(server_delay, self.config.max_backoff)
+        
+        delay = min(
+            self.config.max_backoff,
+            self.config.initial_backoff * (self.config.backoff_multiplier ** attempt),
+        )
+        if self.config.jitter:
+            delay = random.uniform(delay / 2, delay)
+        return delay
+    
+    def _call(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: Optional[int],
+        call: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        key = f"{self.provider_key}/{model}"
+        backoff = 0.0
+        
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                with span("provider.attempt", model=key, attempt=attempt):
+                    response = call()
+            except Exception as e:
+                if attempt >= self.config.max_retries or not is_retryable(e):
+                    self.stats.record(key, attempt, backoff, failed=True)
+                    raise
+                delay = self.backoff_delay(attempt, e)
+                backoff += delay
+                with span("provider.backoff", model=key, seconds=round(delay, 3)):
+                    time.sleep(delay)
+                continue
+            
+            self.stats.record(key, attempt, backoff, failed=False)
+            return {**response, "retries": attempt, "backoff_seconds": backoff}
+    
+    async def _acall(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: Optional[int],
+        call: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        key = f"{self.provider_key}/{model}"
+        backoff = 0.0
+        
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                with span("provider.attempt", model=key, attempt=attempt):
+                    response = await call()
+            except Exception as e:
+                if attempt >= self.config.max_retries or not is_retryable(e):
+                    self.stats.record(key, attempt, backoff, failed=True)
+                    raise
+                delay = self.backoff_delay(attempt, e)
+                backoff += delay
+                with span("provider.backoff", model=key, seconds=round(delay, 3)):
+                    await asyncio.sleep(delay)
+                continue
+            
+            self.stats.record(key, attempt, backoff, failed=False)
+            return {**response, "retries": attempt, "backoff_seconds": backoff}
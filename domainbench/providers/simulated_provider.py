@@ -0,0 +1,245 @@
+"""
+Simulated provider - In-process stand-in for an LLM API, for load-testing the engine itself
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+from domainbench.providers.base import BaseProvider, AsyncBaseProvider, StreamTimer
+from domainbench.providers.ratelimit import estimate_tokens
+
+
+# Named latency/failure profiles, selected by the model name (simulated/<profile>).
+# latency and jitter are the mean and standard deviation of a call in seconds,
+# ttft the share of it spent before the first streamed chunk, failure_rate the
+# chance of a transient error and tokens the typical completion length
+PROFILES: Dict[str, Dict[str, float]] = {
+    "instant": {"latency": 0.0, "jitter": 0.0, "ttft": 0.25, "failure_rate": 0.0, "tokens": 200},
+    "fast": {"latency": 0.3, "jitter": 0.1, "ttft": 0.25, "failure_rate": 0.0, "tokens": 200},
+    "typical": {"latency": 1.5, "jitter": 0.5, "ttft": 0.25, "failure_rate": 0.01, "tokens": 300},
+    "slow": {"latency": 6.0, "jitter": 2.0, "ttft": 0.2, "failure_rate": 0.02, "tokens": 600},
+    "flaky": {"latency": 1.0, "jitter": 0.5, "ttft": 0.25, "failure_rate": 0.2, "tokens": 300},
+}
+
+DEFAULT_PROFILE = "instant"
+
+# Words the generated replies are drawn from
+_VOCABULARY = (
+    "certainly happy to help our kitchen can prepare that dish without nuts today the chef "
+    "recommends grilled salmon with seasonal vegetables would you like a table by the window "
+    "and I will check with the manager about the reservation please let me know if anything else"
+).split()
+
+# A canned reply for a (model, messages) request, as used by the mock server
+Responder = Callable[[str, List[Dict[str, Any]]], str]
+
+
+def parse_profile(model: str) -> Dict[str, float]:
+    """
+    Profile for a simulated model name.
+    
+    The name is a comma-separated list: a PROFILES name picks the base
+    profile, key=value items override its fields, and anything else is a
+    label, so "a", "b,fast" and "fast,latency=0.5,failure_rate=0.1" are all
+    valid (unlabelled names default to the instant profile).
+    """
+    profile = dict(PROFILES[DEFAULT_PROFILE])
+    overrides = {}
+    for part in model.split(","):
+        part = part.strip()
+        if part in PROFILES:
+            profile = dict(PROFILES[part])
+        elif "=" in part:
+            key, _, value = part.partition("=")
+            if key not in profile:
+                raise ValueError(f"Unknown simulated profile field: {key}")
+            overrides[key] = float(value)
+    profile.update(overrides)
+    return profile
+
+
+class SimulatedProviderError(Exception):
+    """Transient error raised by the simulated provider (retryable by status code)"""
+    
+    def __init__(self, status_code: int):
+        super().__init__(f"Simulated provider error {status_code}")
+        self.status_code = status_code
+
+
+class SimulatedProvider(BaseProvider, AsyncBaseProvider):
+    """
+    Provider that answers in-process with seeded responses and latencies.
+    
+    Replies, judge verdicts and latencies are derived from a hash of the
+    request and the seed, so the same request always gets the same answer
+    however the calls interleave. Transient failures are drawn from one
+    seeded stream instead, so retried requests can succeed. Usage dicts
+    count tokens like the rate limiter does (~4 characters per token).
+    """
+    
+    name = "simulated"
+    supported_features = ["chat_completion", "streaming"]
+    
+    def __init__(
+        self,
+        api_key_env: Optional[str] = None,
+        base_url: Optional[str] = None,
+        clients=None,
+        seed: int = 0,
+        responder: Optional[Responder] = None,
+    ):
+        super().__init__(api_key_env, base_url, clients)
+        self.seed = seed
+        self.responder = responder
+        self.calls = 0
+        self._profiles: Dict[str, Dict[str, float]] = {}
+        self._failures = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def get_api_key(self, default_env: Optional[str] = None) -> str:
+        return "simulated"
+    
+    def profile(self, model: str) -> Dict[str, float]:
+        with self._lock:
+            profile = self._profiles.get(model)
+            if profile is None:
+                profile = parse_profile(model)
+                self._profiles[model] = profile
+            return profile
+    
+    def _prepare(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: Optional[int],
+    ) -> Tuple[Dict[str, Any], float, float]:
+        """Reply, latency and time to first chunk of one call (raises on a simulated failure)"""
+        profile = self.profile(model)
+        with self._lock:
+            self.calls += 1
+            failed = self._failures.random() < profile["failure_rate"]
+            status = self._failures.choice((429, 503)) if failed else None
+        if status is not None:
+            raise SimulatedProviderError(status)
+        
+        digest = hashlib.sha256(
+            json.dumps(messages, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        rng = random.Random(f"{self.seed}:{model}:{digest}")
+        latency = max(0.0, rng.gauss(profile["latency"], profile["jitter"]))
+        
+        if self.responder is not None:
+            content = self.responder(model, messages)
+        else:
+            tokens = int(profile["tokens"])
+            content = self._reply(
+                model, messages, rng, min(tokens, max_tokens) if max_tokens else tokens
+            )
+        usage = {
+            "prompt_tokens": estimate_tokens(messages),
+            "completion_tokens": max(1, len(content) // 4),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return {"content": content, "usage": usage}, latency, latency * profile["ttft"]
+    
+    def _reply(
+        self, model: str, messages: List[Dict[str, Any]], rng: random.Random, tokens: int
+    ) -> str:
+        """Judge verdict JSON for judge prompts, otherwise filler text of about `tokens` tokens"""
+        last = str(messages[-1].get("content", "")) if messages else ""
+        
+        def verdict() -> Dict[str, Any]:
+            return {
+                "winner": rng.choice(("A", "B", "tie")),
+                "score_A": rng.randint(0, 10),
+                "score_B": rng.randint(0, 10),
+            }
+        
+        if "comparison_1" in last:
+            return json.dumps({
+                "comparison_1": verdict(),
+                "comparison_2": verdict(),
+                "reasons": ["Simulated verdict"],
+            })
+        if "Return STRICT JSON" in last:
+            return json.dumps({**verdict(), "reasons": ["Simulated verdict"]})
+        
+        # Words average ~5 characters plus a space, i.e. ~1.5 tokens each
+        length = max(1, int(rng.gauss(tokens, tokens / 4) / 1.5))
+        return f"[{model}] " + " ".join(rng.choice(_VOCABULARY) for _ in range(length))
+    
+    @staticmethod
+    def _chunks(content: str, count: int = 16) -> List[str]:
+        """Split a reply into up to `count` streamed chunks"""
+        words = content.split(" ")
+        size = max(1, -(-len(words) // count))
+        return [" ".join(words[i:i + size]) + " " for i in range(0, len(words), size)]
+    
+    def chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        result, latency, _ = self._prepare(model, messages, max_tokens)
+        if latency:
+            time.sleep(latency)
+        return result
+    
+    async def achat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        result, latency, _ = self._prepare(model, messages, max_tokens)
+        if latency:
+            await asyncio.sleep(latency)
+        return result
+    
+    def stream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        timer = StreamTimer()
+        result, latency, ttft = self._prepare(model, messages, max_tokens)
+        chunks = self._chunks(result["content"])
+        gap = (latency - ttft) / max(1, len(chunks) - 1)
+        for i, chunk in enumerate(chunks):
+            delay = ttft if i == 0 else gap
+            if delay:
+                time.sleep(delay)
+            timer.chunk(chunk)
+        return {**result, "stream": timer.result()}
+    
+    async def astream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        timer = StreamTimer()
+        result, latency, ttft = self._prepare(model, messages, max_tokens)
+        chunks = self._chunks(result["content"])
+        gap = (latency - ttft) / max(1, len(chunks) - 1)
+        for i, chunk in enumerate(chunks):
+            delay = ttft if i == 0 else gap
+            if delay:
+                await asyncio.sleep(delay)
+            timer.chunk(chunk)
+        return {**result, "stream": timer.result()}
@@ -0,0 +1,11 @@
+"""
+Testing utilities - local stand-ins for provider APIs
+"""
+
+from domainbench.testing.mock_server import MockLLMServer, default_responder, parse_latency
+
+__all__ = [
+    "MockLLMServer",
+    "default_responder",
+    "parse_latency",
+]
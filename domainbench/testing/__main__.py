@@ -0,0 +1,8 @@
+"""
+Run the mock LLM server: python -m domainbench.testing --port 8089
+"""
+
+from domainbench.testing.mock_server import main
+
+
+main()
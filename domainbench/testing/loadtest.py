@@ -0,0 +1,143 @@
+"""
+Load test - Cases per second the engine sustains against the simulated provider
+
+Every provider call is answered in-process by SimulatedProvider, so the
+time not spent in simulated latency is the framework's own overhead:
+message building, judge parsing, stats, checkpoints and reporting. With the
+instant profile, throughput is bounded by that overhead alone.
+"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence
+
+from domainbench.core.config import (
+    BenchmarkConfig,
+    BenchmarkSettings,
+    JudgeConfig,
+    ModelConfig,
+    OutputConfig,
+    ProviderType,
+)
+
+
+DEFAULT_CONCURRENCY = (1, 10, 100, 1000)
+
+
+def load_test_config(
+    concurrency: int,
+    output_dir: str,
+    profile: str = "instant",
+    models: int = 2,
+    mode: str = "async",
+    judge_strategy: str = "swap",
+) -> BenchmarkConfig:
+    """
+    Benchmark config with simulated candidates and judge.
+    
+    mode is "async" (concurrency cases in flight on one event loop) or
+    "threads" (a worker pool of that width; 1 runs serially).
+    """
+    if mode not in ("async", "threads"):
+        raise ValueError(f"Unknown load test mode: {mode}")
+    return BenchmarkConfig(
+        name=f"Load test: {models} simulated models, {profile}, concurrency {concurrency}",
+        models=[
+            ModelConfig(provider=ProviderType.SIMULATED, model=f"m{i},{profile}", alias=f"sim-{i}")
+            for i in range(models)
+        ],
+        domain="restaurant_waiter",
+        judge=JudgeConfig(
+            provider=ProviderType.SIMULATED, model=f"judge,{profile}", strategy=judge_strategy
+        ),
+        settings=BenchmarkSettings(
+            async_execution=mode == "async",
+            parallel_execution=mode == "threads" and concurrency > 1,
+            max_workers=concurrency,
+            sleep_between_calls=0.0,
+        ),
+        output=OutputConfig(directory=output_dir, keep_results_in_memory=False),
+    )
+
+
+def run_load_test(
+    dataset_path: Optional[str] = None,
+    cases: int = 1000,
+    concurrency: Sequence[int] = DEFAULT_CONCURRENCY,
+    profile: str = "instant",
+    models: int = 2,
+    mode: str = "async",
+    judge_strategy: str = "swap",
+    output_dir: Optional[str] = None,
+    log=None,
+) -> List[Dict[str, Any]]:
+    """
+    Run the same dataset through the engine at each concurrency level.
+    
+    Args:
+        dataset_path: JSONL dataset (default: `cases` generated restaurant_waiter cases)
+        cases: Number of test cases to generate when no dataset is given
+        concurrency: Cases in flight (or worker pool width) per level
+        profile: Simulated latency/failure profile (see simulated_provider.PROFILES)
+        models: Number of simulated candidate models
+        mode: "async" or "threads"
+        judge_strategy: Judge strategy (swap, concurrent or single)
+        output_dir: Where results are written (default: a temporary directory)
+        log: Optional callable receiving each row as it completes
+    
+    Returns:
+        One row per level with cases, seconds, cases_per_sec, cpu_ms_per_case
+        (process CPU time, i.e. engine overhead) and retries
+    """
+    # Imported here to avoid a circular import
+    from domainbench.core.engine import BenchmarkEngine
+    
+    with tempfile.TemporaryDirectory(prefix="domainbench-loadtest-") as scratch:
+        if dataset_path is None:
+            dataset_path = str(Path(scratch) / "dataset.jsonl")
+            _write_dataset(dataset_path, cases)
+        
+        rows = []
+        for level in concurrency:
+            config = load_test_config(
+                level,
+                output_dir or str(Path(scratch) / "results"),
+                profile=profile,
+                models=models,
+                mode=mode,
+                judge_strategy=judge_strategy,
+            )
+            engine = BenchmarkEngine(config)
+            
+            started, cpu_started = time.perf_counter(), time.process_time()
+            results = engine.run(dataset_path, verbose=False)
+            seconds = time.perf_counter() - started
+            cpu_seconds = time.process_time() - cpu_started
+            
+            finished = results["summary"]["total_test_cases"]
+            row = {
+                "concurrency": level,
+                "mode": mode,
+                "profile": profile,
+                "cases": finished,
+                "seconds": round(seconds, 3),
+                "cases_per_sec": round(finished / seconds, 2) if seconds else None,
+                "cpu_ms_per_case": round(cpu_seconds * 1000 / finished, 3) if finished else None,
+                "retries": sum(
+                    stats["retries"] for stats in results["summary"].get("retries", {}).values()
+                ),
+            }
+            rows.append(row)
+            if log is not None:
+                log(row)
+        return rows
+
+
+def _write_dataset(path: str, cases: int) -> None:
+    from domainbench.domains.builtin.restaurant_waiter import generate_test_cases
+    
+    with open(path, "w", encoding="utf-8") as f:
+        for item in generate_test_cases(cases, 42):
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
@@ -0,0 +1,581 @@
+"""
+Mock server - Local stand-in for the OpenAI and Anthropic HTTP APIs
+
+Serves interactive chat completions (plain or streamed as server-sent
+events) plus the OpenAI Files/Batch and Anthropic Message Batches
+endpoints from memory, so batch mode, streaming and provider plumbing can
+be exercised without network access or API keys. Replies can be delayed
+by a latency distribution to benchmark engine throughput offline.
+
+Run standalone:
+    domainbench mock-server --port 8089 --latency lognormal:0.8,0.5
+    export OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=mock
+    export ANTHROPIC_BASE_URL=http://127.0.0.1:8089 ANTHROPIC_API_KEY=mock
+    export CUSTOM_BASE_URL=http://127.0.0.1:8089/v1
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Optional, Callable, Iterator, Union
+
+
+Responder = Callable[[str, List[Dict[str, Any]]], str]
+
+# Delay in seconds drawn from a random generator
+LatencySampler = Callable[[random.Random], float]
+
+
+def default_responder(model: str, messages: List[Dict[str, Any]]) -> str:
+    """
+    Deterministic reply for a request.
+    
+    Judge prompts get a valid verdict derived from a hash of the prompt;
+    anything else gets a short echo of the last message.
+    """
+    last = str(messages[-1].get("content", "")) if messages else ""
+    if "Return STRICT JSON" in last:
+        digest = hashlib.sha256(last.encode("utf-8")).digest()
+        return json.dumps({
+            "winner": ("A", "B", "tie")[digest[0] % 3],
+            "score_A": digest[1] % 11,
+            "score_B": digest[2] % 11,
+            "reasons": ["Mock verdict"],
+        })
+    return f"[{model}] {last[:200]}"
+
+
+def parse_latency(spec: str) -> LatencySampler:
+    """
+    Latency distribution from a spec (all values in seconds):
+        
+        0.5 or fixed:0.5        always 0.5
+        uniform:LOW,HIGH        uniform between LOW and HIGH
+        normal:MEAN,STD         normal, clipped at zero
+        lognormal:MEDIAN,SIGMA  log-normal with this median (long right tail)
+        exponential:MEAN        exponential with this mean
+    """
+    kind, _, args = spec.partition(":") if ":" in spec else ("fixed", "", spec)
+    try:
+        values = [float(v) for v in args.split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec}")
+    
+    samplers = {
+        ("fixed", 1): lambda rng: values[0],
+        ("uniform", 2): lambda rng: rng.uniform(values[0], values[1]),
+        ("normal", 2): lambda rng: max(0.0, rng.gauss(values[0], values[1])),
+        ("lognormal", 2): lambda rng: rng.lognormvariate(math.log(values[0]), values[1]),
+        ("exponential", 1): lambda rng: rng.expovariate(1 / values[0]) if values[0] else 0.0,
+    }
+    sampler = samplers.get((kind, len(values)))
+    if sampler is None:
+        raise ValueError(f"Invalid latency spec: {spec}")
+    return sampler
+
+
+def _count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _stream_pieces(text: str) -> List[str]:
+    """Split a reply into word-sized pieces for streaming"""
+    return re.findall(r"\s*\S+", text) or [text]
+
+
+def _parse_multipart(body: bytes, content_type: str) -> Dict[str, bytes]:
+    """Extract form fields from a multipart/form-data body"""
+    message = BytesParser(policy=default_policy).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        fields[name] = part.get_payload(decode=True)
+    return fields
+
+
+class MockLLMServer:
+    """
+    In-memory OpenAI/Anthropic API stand-in on a background thread.
+    
+    Batches end batch_delay seconds after submission; their results are
+    produced by the responder when first requested. Interactive replies
+    wait a delay drawn from latency (a parse_latency spec, or a dict of
+    specs by model with "*" as the fallback); streamed replies wait it on
+    top of first_token_delay before the first piece, then token_delay
+    between pieces. Delays are seeded by the request itself, so the same
+    request always waits the same time. Use as a context manager, and
+    point the SDKs at it with the variables from env().
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        batch_delay: float = 0.0,
+        responder: Optional[Responder] = None,
+        first_token_delay: float = 0.0,
+        token_delay: float = 0.0,
+        latency: Union[str, Dict[str, str], None] = None,
+        seed: int = 0,
+    ):
+        self.batch_delay = batch_delay
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.responder = responder or default_responder
+        self.seed = seed
+        
+        # Per-model latency distributions ("*" applies to every other model)
+        if isinstance(latency, str):
+            latency = {"*": latency}
+        self.latency = {model: parse_latency(spec) for model, spec in (latency or {}).items()}
+        
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point the provider SDKs at this server"""
+        return {
+            "OPENAI_BASE_URL": f"{self.url}/v1",
+            "OPENAI_API_KEY": "mock",
+            "ANTHROPIC_BASE_URL": self.url,
+            "ANTHROPIC_API_KEY": "mock",
+            "CUSTOM_BASE_URL": f"{self.url}/v1",
+            "OLLAMA_HOST": self.url,
+        }
+    
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+    
+    def __exit__(self, *exc) -> None:
+        self.stop()
+    
+    # Completions
+    
+    def response_delay(self, model: str, body: bytes) -> float:
+        """Seconds to wait before replying to an interactive request"""
+        sampler = self.latency.get(model, self.latency.get("*"))
+        if sampler is None:
+            return 0.0
+        digest = hashlib.sha256(body).hexdigest()
+        return sampler(random.Random(f"{self.seed}:{model}:{digest}"))
+    
+    def openai_completion(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """OpenAI chat.completion object for a request body"""
+        model = body.get("model", "mock")
+        messages = body.get("messages", [])
+        text = self.responder(model, messages)
+        prompt_tokens = sum(_count_tokens(str(m.get("content", ""))) for m in messages)
+        completion_tokens = _count_tokens(text)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+    
+    def anthropic_message(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Anthropic message object for messages.create params"""
+        model = params.get("model", "mock")
+        messages = list(params.get("messages", []))
+        if params.get("system"):
+            messages.insert(0, {"role": "system", "content": params["system"]})
+        text = self.responder(model, messages)
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": sum(_count_tokens(str(m.get("content", ""))) for m in messages),
+                "output_tokens": _count_tokens(text),
+            },
+        }
+    
+    def openai_stream(self, body: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """chat.completion.chunk objects streaming the completion for a request body"""
+        completion = self.openai_completion(body)
+        text = completion["choices"][0]["message"]["content"]
+        chunk = {key: completion[key] for key in ("id", "created", "model")}
+        chunk["object"] = "chat.completion.chunk"
+        
+        def delta(content: Dict[str, Any], finish_reason: Optional[str] = None) -> Dict[str, Any]:
+            return {
+                **chunk,
+                "choices": [{"index": 0, "delta": content, "finish_reason": finish_reason}],
+            }
+        
+        yield delta({"role": "assistant", "content": ""})
+        for piece in _stream_pieces(text):
+            yield delta({"content": piece})
+        yield delta({}, "stop")
+        if (body.get("stream_options") or {}).get("include_usage"):
+            yield {**chunk, "choices": [], "usage": completion["usage"]}
+    
+    def anthropic_stream(self, params: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Message stream events for messages.create params"""
+        message = self.anthropic_message(params)
+        text = message["content"][0]["text"]
+        usage = message["usage"]
+        
+        yield {
+            "type": "message_start",
+            "message": {
+                **message,
+                "content": [],
+                "stop_reason": None,
+                "usage": {**usage, "output_tokens": 0},
+            },
+        }
+        yield {
+            "type": "content_block_start",
+            "index": 0,
+            "content_block": {"type": "text", "text": ""},
+        }
+        for piece in _stream_pieces(text):
+            yield {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": piece},
+            }
+        yield {"type": "content_block_stop", "index": 0}
+        yield {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": usage["output_tokens"]},
+        }
+        yield {"type": "message_stop"}
+    
+    # Batches
+    
+    def create_file(self, content: bytes) -> Dict[str, Any]:
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        with self._lock:
+            self.files[file_id] = content
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": "batch.jsonl",
+            "purpose": "batch",
+            "status": "processed",
+        }
+    
+    def create_batch(self, kind: str, requests: List[Dict[str, Any]], **extra) -> Dict[str, Any]:
+        prefix = "batch_" if kind == "openai" else "msgbatch_"
+        batch = {
+            "id": f"{prefix}{uuid.uuid4().hex[:24]}",
+            "kind": kind,
+            "requests": requests,
+            "created": time.time(),
+            "output_file_id": None,
+            **extra,
+        }
+        with self._lock:
+            self.batches[batch["id"]] = batch
+        return batch
+    
+    def batch_ended(self, batch: Dict[str, Any]) -> bool:
+        return time.time() - batch["created"] >= self.batch_delay
+    
+    def openai_batch(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        """OpenAI batch object, writing the output file once the batch has ended"""
+        ended = self.batch_ended(batch)
+        if ended and batch["output_file_id"] is None:
+            lines = []
+            for request in batch["requests"]:
+                lines.append(json.dumps({
+                    "id": f"batch_req_{uuid.uuid4().hex[:16]}",
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "request_id": uuid.uuid4().hex,
+                        "body": self.openai_completion(request["body"]),
+                    },
+                    "error": None,
+                }))
+            batch["output_file_id"] = self.create_file("\n".join(lines).encode("utf-8"))["id"]
+        
+        total = len(batch["requests"])
+        return {
+            "id": batch["id"],
+            "object": "batch",
+            "endpoint": batch.get("endpoint", "/v1/chat/completions"),
+            "input_file_id": batch.get("input_file_id"),
+            "completion_window": "24h",
+            "status": "completed" if ended else "in_progress",
+            "output_file_id": batch["output_file_id"],
+            "error_file_id": None,
+            "created_at": int(batch["created"]),
+            "request_counts": {"total": total, "completed": total if ended else 0, "failed": 0},
+        }
+    
+    def anthropic_batch(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        """Anthropic message batch object"""
+        ended = self.batch_ended(batch)
+        total = len(batch["requests"])
+        created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(batch["created"]))
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else total,
+                "succeeded": total if ended else 0,
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": created,
+            "expires_at": created,
+            "ended_at": created if ended else None,
+            "cancel_initiated_at": None,
+            "archived_at": None,
+            "results_url": (
+                f"{self.url}/v1/messages/batches/{batch['id']}/results" if ended else None
+            ),
+        }
+    
+    def anthropic_results(self, batch: Dict[str, Any]) -> bytes:
+        lines = []
+        for request in batch["requests"]:
+            message = self.anthropic_message(request["params"])
+            lines.append(json.dumps({
+                "custom_id": request["custom_id"],
+                "result": {"type": "succeeded", "message": message},
+            }))
+        return "\n".join(lines).encode("utf-8")
+
+
+def _is_content_event(event: Dict[str, Any]) -> bool:
+    """Whether a stream event carries a piece of the reply text"""
+    if event.get("type") == "content_block_delta":
+        return True
+    choices = event.get("choices") or [{}]
+    return bool(choices[0].get("delta", {}).get("content"))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes API paths to the MockLLMServer on self.server.mock"""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format: str, *args) -> None:
+        pass
+    
+    @property
+    def mock(self) -> MockLLMServer:
+        return self.server.mock
+    
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+    
+    def _send(self, status: int, payload: Any, content_type: str = "application/json") -> None:
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _send_events(
+        self, events: Iterator[Dict[str, Any]], named: bool, delay: float = 0.0
+    ) -> None:
+        """Stream events as server-sent events, pacing content pieces by the token delays"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        
+        first = True
+        for event in events:
+            if _is_content_event(event):
+                time.sleep(self.mock.first_token_delay + delay if first else self.mock.token_delay)
+                first = False
+            prefix = f"event: {event['type']}\n" if named else ""
+            self.wfile.write(f"{prefix}data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        if not named:
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+    
+    def _not_found(self) -> None:
+        self._send(
+            404, {"error": {"type": "not_found_error", "message": f"Unknown path: {self.path}"}}
+        )
+    
+    def do_POST(self) -> None:
+        with self.mock._lock:
+            self.mock.requests += 1
+        path = self.path.split("?", 1)[0]
+        body = self._read_body()
+        
+        if path == "/v1/chat/completions":
+            params = json.loads(body)
+            delay = self.mock.response_delay(params.get("model", "mock"), body)
+            if params.get("stream"):
+                self._send_events(self.mock.openai_stream(params), named=False, delay=delay)
+            else:
+                time.sleep(delay)
+                self._send(200, self.mock.openai_completion(params))
+        elif path == "/v1/messages":
+            params = json.loads(body)
+            delay = self.mock.response_delay(params.get("model", "mock"), body)
+            if params.get("stream"):
+                self._send_events(self.mock.anthropic_stream(params), named=True, delay=delay)
+            else:
+                time.sleep(delay)
+                self._send(200, self.mock.anthropic_message(params))
+        elif path == "/v1/files":
+            fields = _parse_multipart(body, self.headers.get("Content-Type", ""))
+            self._send(200, self.mock.create_file(fields.get("file", b"")))
+        elif path == "/v1/batches":
+            params = json.loads(body)
+            content = self.mock.files.get(params.get("input_file_id"), b"")
+            requests = [
+                json.loads(line) for line in content.decode("utf-8").splitlines() if line.strip()
+            ]
+            batch = self.mock.create_batch(
+                "openai", requests,
+                input_file_id=params.get("input_file_id"), endpoint=params.get("endpoint"),
+            )
+            self._send(200, self.mock.openai_batch(batch))
+        elif path == "/v1/messages/batches":
+            batch = self.mock.create_batch("anthropic", json.loads(body).get("requests", []))
+            self._send(200, self.mock.anthropic_batch(batch))
+        else:
+            self._not_found()
+    
+    def do_GET(self) -> None:
+        with self.mock._lock:
+            self.mock.requests += 1
+        path = self.path.split("?", 1)[0]
+        
+        match = re.fullmatch(r"/v1/files/([^/]+)/content", path)
+        if match:
+            content = self.mock.files.get(match.group(1))
+            if content is None:
+                return self._not_found()
+            return self._send(200, content, "application/octet-stream")
+        
+        match = re.fullmatch(r"/v1/batches/([^/]+)", path)
+        if match and match.group(1) in self.mock.batches:
+            return self._send(200, self.mock.openai_batch(self.mock.batches[match.group(1)]))
+        
+        match = re.fullmatch(r"/v1/messages/batches/([^/]+)(/results)?", path)
+        if match and match.group(1) in self.mock.batches:
+            batch = self.mock.batches[match.group(1)]
+            if match.group(2):
+                return self._send(200, self.mock.anthropic_results(batch), "application/x-jsonl")
+            return self._send(200, self.mock.anthropic_batch(batch))
+        
+        self._not_found()
+
+
+def parse_latency_options(options: List[str]) -> Dict[str, str]:
+    """Latency specs by model from "[model=]spec" options (no model means every model)"""
+    latency = {}
+    for option in options:
+        model, _, spec = option.rpartition("=")
+        parse_latency(spec)
+        latency[model or "*"] = spec
+    return latency
+
+
+def serve(server: MockLLMServer) -> None:
+    """Serve in the foreground until interrupted, printing the variables to export"""
+    print(f"Mock LLM server listening on {server.url}")
+    for name, value in server.env().items():
+        print(f"  export {name}={value}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+def main() -> None:
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI and Anthropic APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument(
+        "--batch-delay", type=float, default=5.0, help="Seconds until a submitted batch ends"
+    )
+    parser.add_argument(
+        "--first-token-delay", type=float, default=0.0, help="Seconds before a stream's first piece"
+    )
+    parser.add_argument(
+        "--token-delay", type=float, default=0.0, help="Seconds between streamed pieces"
+    )
+    parser.add_argument(
+        "--latency", action="append", default=[],
+        help="Reply latency as [model=]spec, e.g. lognormal:0.8,0.5 (see parse_latency)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for sampled latencies")
+    args = parser.parse_args()
+    
+    serve(MockLLMServer(
+        host=args.host,
+        port=args.port,
+        batch_delay=args.batch_delay,
+        first_token_delay=args.first_token_delay,
+        token_delay=args.token_delay,
+        latency=parse_latency_options(args.latency),
+        seed=args.seed,
+    ))
+
+
+if __name__ == "__main__":
+    main()
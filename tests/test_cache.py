@@ -0,0 +1,158 @@
+"""
+Tests for the persistent response and judge cache
+"""
+
+import json
+import os
+import time
+
+from domainbench.core.cache import DiskCache, cache_key
+from domainbench.core.config import ModelConfig, ProviderType
+from domainbench.core.engine import BenchmarkEngine
+from domainbench.testing.loadtest import load_test_config
+
+
+MESSAGES = [
+    {"role": "system", "content": "You are a waiter."},
+    {"role": "user", "content": "Menu?"},
+]
+
+
+def _age(cache, key, seconds):
+    """Push an entry's mtime into the past"""
+    path = cache._path(key)
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_cache_key_is_stable_and_content_addressed():
+    key = cache_key("openai", "gpt-4o", MESSAGES, 0.2, None, 42)
+    assert key == cache_key("openai", "gpt-4o", [dict(m) for m in MESSAGES], 0.2, None, 42)
+    assert len(key) == 64
+    
+    # Dict key order does not matter; every request field does
+    reordered = [{"content": m["content"], "role": m["role"]} for m in MESSAGES]
+    assert cache_key("openai", "gpt-4o", reordered, 0.2, None, 42) == key
+    assert cache_key("openai", "gpt-4o", MESSAGES, 0.3, None, 42) != key
+    assert cache_key("openai", "gpt-4o", MESSAGES, 0.2, 256, 42) != key
+    assert cache_key("openai", "gpt-4o", MESSAGES, 0.2, None, 7) != key
+    assert cache_key("openai", "gpt-4o-mini", MESSAGES, 0.2, None, 42) != key
+
+
+def test_engine_response_key_ignores_alias_and_rate_limits(tmp_path):
+    config = load_test_config(1, str(tmp_path / "results"), mode="threads")
+    config.cache.enabled = True
+    config.cache.directory = str(tmp_path / "cache")
+    engine = BenchmarkEngine(config)
+    engine.response_cache = DiskCache(config.cache.directory)
+    
+    model = ModelConfig(provider=ProviderType.OPENAI, model="gpt-4o", alias="a")
+    same = ModelConfig(provider=ProviderType.OPENAI, model="gpt-4o", alias="b", rpm=10)
+    hotter = ModelConfig(provider=ProviderType.OPENAI, model="gpt-4o", temperature=0.9)
+    
+    key = engine._response_cache_key(model, MESSAGES)
+    assert engine._response_cache_key(same, MESSAGES) == key
+    assert engine._response_cache_key(hotter, MESSAGES) != key
+    
+    engine.response_cache = None
+    assert engine._response_cache_key(model, MESSAGES) is None
+
+
+def test_get_put_round_trip_and_stats(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    key = cache_key("x")
+    assert cache.get(key) is None
+    
+    cache.put(key, {"content": "hello", "usage": {"total_tokens": 12}})
+    assert cache.get(key)["content"] == "hello"
+    assert cache._path(key).parent.name == key[:2]
+    assert list(tmp_path.glob("*/*.tmp")) == []
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "hit_ratio": 0.5,
+        "writes": 1,
+        "saved_tokens": 12,
+    }
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    key = cache_key("x")
+    cache.put(key, {"content": "hello"})
+    cache._path(key).write_text("{not json")
+    assert cache.get(key) is None
+
+
+def test_expired_entries_miss_and_are_evicted(tmp_path):
+    cache = DiskCache(str(tmp_path), max_age_days=1)
+    old, fresh = cache_key("old"), cache_key("fresh")
+    cache.put(old, {"content": "old"})
+    cache.put(fresh, {"content": "fresh"})
+    _age(cache, old, 2 * 86400)
+    
+    assert cache.get(old) is None
+    assert cache.get(fresh)["content"] == "fresh"
+    assert cache.evict() == 1
+    assert not cache._path(old).exists()
+    assert cache._path(fresh).exists()
+
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_size_mb=2500 / (1024 * 1024))
+    keys = [cache_key(i) for i in range(4)]
+    for i, key in enumerate(keys):
+        cache.put(key, {"content": "x" * 1000})
+        _age(cache, key, 100 - i)  # keys[0] is the oldest
+    
+    # A hit refreshes the mtime, so keys[0] becomes the most recently used
+    assert cache.get(keys[0]) is not None
+    
+    assert cache.evict() == 2
+    assert [cache._path(key).exists() for key in keys] == [True, False, False, True]
+
+
+def test_read_only_never_writes_touches_or_evicts(tmp_path):
+    writer = DiskCache(str(tmp_path))
+    key = cache_key("committed")
+    writer.put(key, {"content": "hello"})
+    _age(writer, key, 10 * 86400)
+    mtime = writer._path(key).stat().st_mtime
+    
+    cache = DiskCache(str(tmp_path), read_only=True, max_size_mb=0.000001)
+    assert cache.get(key)["content"] == "hello"
+    assert writer._path(key).stat().st_mtime == mtime
+    
+    cache.put(cache_key("new"), {"content": "new"})
+    assert not cache._path(cache_key("new")).exists()
+    assert cache.stats()["writes"] == 0
+    
+    assert cache.evict() == 0
+    assert writer._path(key).exists()
+
+
+def test_second_run_is_served_from_the_cache(tmp_path):
+    from domainbench.domains.builtin.restaurant_waiter import generate_test_cases
+    
+    dataset = tmp_path / "dataset.jsonl"
+    with open(dataset, "w", encoding="utf-8") as f:
+        for item in generate_test_cases(5, 42):
+            f.write(json.dumps(item) + "\n")
+    
+    def run():
+        config = load_test_config(1, str(tmp_path / "results"), mode="threads")
+        config.settings.seed = 42
+        config.cache.enabled = True
+        config.cache.judge = True
+        config.cache.directory = str(tmp_path / "cache")
+        config.output.checkpoint = False
+        return BenchmarkEngine(config).run(str(dataset), verbose=False)["summary"]["cache"]
+    
+    first = run()
+    assert first["responses"]["hits"] == 0
+    assert first["responses"]["writes"] == 10
+    
+    second = run()
+    assert second["responses"]["hits"] == 10
+    assert second["responses"]["writes"] == 0
+    assert second["judge"]["hits"] == first["judge"]["writes"]
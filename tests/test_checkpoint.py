@@ -0,0 +1,183 @@
+"""
+Tests for the checkpoint journal and resuming interrupted runs
+"""
+
+import json
+
+import pytest
+
+from domainbench.core.checkpoint import CheckpointJournal, CheckpointMismatchError
+from domainbench.core.config import ModelConfig, ProviderType
+from domainbench.core.engine import BenchmarkEngine
+from domainbench.testing.loadtest import load_test_config
+
+
+CASES = 10
+
+
+def _write_dataset(path, cases=CASES):
+    from domainbench.domains.builtin.restaurant_waiter import generate_test_cases
+    
+    with open(path, "w", encoding="utf-8") as f:
+        for i, item in enumerate(generate_test_cases(cases, 42)):
+            f.write(json.dumps({**item, "id": f"case_{i}"}) + "\n")
+
+
+def _config(output_dir):
+    config = load_test_config(1, str(output_dir), mode="threads")
+    config.output.formats = ["jsonl"]
+    return config
+
+
+def _interrupted_run(tmp_path, fail_from=6):
+    """Run until case fail_from raises, leaving a checkpoint behind"""
+    dataset = tmp_path / "dataset.jsonl"
+    _write_dataset(dataset)
+    engine = BenchmarkEngine(_config(tmp_path / "results"))
+    run_case = engine._run_case
+    
+    def crash(idx, test_case):
+        if idx >= fail_from:
+            raise RuntimeError("simulated crash")
+        return run_case(idx, test_case)
+    
+    engine._run_case = crash
+    with pytest.raises(RuntimeError):
+        engine.run(str(dataset), verbose=False)
+    return engine.run_dir, dataset
+
+
+def _result(test_id):
+    return {"test_id": test_id, "capability": "chat_completion", "responses": {}, "comparisons": []}
+
+
+def test_torn_final_line_is_ignored(tmp_path):
+    journal = CheckpointJournal.create(str(tmp_path), "bench", {}, __file__)
+    journal.append(_result("a"))
+    journal.append(_result("b"))
+    journal.close()
+    with open(journal.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"result": {"test_id": "c", "capa')
+    
+    assert set(journal.load()) == {("a", "chat_completion"), ("b", "chat_completion")}
+    
+    # The next append terminates the torn line instead of merging with it
+    journal.append(_result("d"))
+    journal.close()
+    assert set(journal.load()) == {
+        ("a", "chat_completion"), ("b", "chat_completion"), ("d", "chat_completion"),
+    }
+
+
+def test_fsyncs_are_grouped(tmp_path, monkeypatch):
+    from domainbench.core import checkpoint
+    
+    synced = []
+    monkeypatch.setattr(checkpoint.os, "fsync", synced.append)
+    journal = CheckpointJournal.create(str(tmp_path), "bench", {}, __file__)
+    journal.fsync_every = 4
+    journal.fsync_interval = 3600
+    for i in range(10):
+        journal.append(_result(f"case_{i}"))
+    assert len(synced) == 2
+    
+    # Every line is already readable; close syncs the remainder
+    assert len(journal.load()) == 10
+    journal.close()
+    assert len(synced) == 3
+
+
+def test_directory_without_manifest_is_refused(tmp_path):
+    with pytest.raises(ValueError, match="Not a checkpoint directory"):
+        BenchmarkEngine.from_checkpoint(str(tmp_path))
+
+
+def test_incomplete_manifest_is_refused(tmp_path):
+    (tmp_path / "manifest.json").write_text(json.dumps({"benchmark_id": "bench"}))
+    with pytest.raises(ValueError, match="missing config, dataset_path"):
+        BenchmarkEngine.from_checkpoint(str(tmp_path))
+
+
+def test_changed_dataset_is_refused(tmp_path):
+    run_dir, dataset = _interrupted_run(tmp_path)
+    _write_dataset(dataset, cases=CASES + 1)
+    
+    engine, dataset_path = BenchmarkEngine.from_checkpoint(run_dir)
+    with pytest.raises(CheckpointMismatchError, match="Dataset"):
+        engine.run(dataset_path, verbose=False)
+
+
+def test_changed_config_is_refused(tmp_path):
+    run_dir, dataset = _interrupted_run(tmp_path)
+    config = _config(tmp_path / "results")
+    config.models.append(ModelConfig(provider=ProviderType.SIMULATED, model="m9", alias="sim-9"))
+    
+    engine, dataset_path = BenchmarkEngine.from_checkpoint(run_dir, config=config)
+    with pytest.raises(CheckpointMismatchError, match="models"):
+        engine.run(dataset_path, verbose=False)
+
+
+def test_changed_judge_strategy_is_refused(tmp_path):
+    run_dir, dataset = _interrupted_run(tmp_path)
+    config = _config(tmp_path / "results")
+    config.judge.strategy = "single"
+    
+    engine, dataset_path = BenchmarkEngine.from_checkpoint(run_dir, config=config)
+    with pytest.raises(CheckpointMismatchError, match="judge.strategy"):
+        engine.run(dataset_path, verbose=False)
+
+
+def test_resume_with_changed_concurrency_is_allowed(tmp_path):
+    run_dir, dataset = _interrupted_run(tmp_path)
+    config = _config(tmp_path / "results")
+    config.settings.parallel_execution = True
+    config.settings.max_workers = 4
+    config.settings.retry.max_retries = 1
+    for model in [*config.models, config.judge]:
+        model.rpm = 100000
+        model.max_concurrency = 2
+    
+    engine, dataset_path = BenchmarkEngine.from_checkpoint(run_dir, config=config)
+    results = engine.run(dataset_path, verbose=False)
+    assert results["summary"]["total_test_cases"] == CASES
+
+
+def test_cli_resume_applies_overrides_before_validation(tmp_path):
+    from typer.testing import CliRunner
+    
+    from domainbench.cli import app
+    
+    run_dir, dataset = _interrupted_run(tmp_path)
+    runner = CliRunner()
+    
+    refused = runner.invoke(app, ["run", "--resume", run_dir, "--judge-strategy", "single"])
+    assert refused.exit_code == 1
+    assert "Cannot resume" in refused.output
+    
+    resumed = runner.invoke(app, ["run", "--resume", run_dir, "--workers", "4"])
+    assert resumed.exit_code == 0, resumed.output
+    assert CheckpointJournal(run_dir).read_manifest()["completed"]
+
+
+def test_resumed_run_records_each_test_once(tmp_path):
+    run_dir, dataset = _interrupted_run(tmp_path)
+    journaled = CheckpointJournal(run_dir).load()
+    assert len(journaled) == 6
+    
+    engine, dataset_path = BenchmarkEngine.from_checkpoint(run_dir)
+    engine.config.output.keep_results_in_memory = True
+    results = engine.run(dataset_path, verbose=False)
+    
+    test_ids = [result["test_id"] for result in results["detailed_results"]]
+    assert sorted(test_ids) == sorted(f"case_{i}" for i in range(CASES))
+    
+    # Only the missing cases were run and journaled
+    journal_lines = (tmp_path / "results" / "runs").glob("*/journal.jsonl")
+    entries = [json.loads(line) for path in journal_lines for line in path.read_text().splitlines()]
+    assert sorted(e["result"]["test_id"] for e in entries) == sorted(test_ids)
+    
+    with open(engine.output_paths[0], encoding="utf-8") as f:
+        streamed = [json.loads(line) for line in f]
+    streamed_ids = [r["test_id"] for r in streamed if r.get("type") == "result"]
+    assert sorted(streamed_ids) == sorted(test_ids)
+    assert CheckpointJournal(run_dir).read_manifest()["completed"]
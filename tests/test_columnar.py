@@ -0,0 +1,102 @@
+"""
+Tests for the Parquet / Arrow IPC export of detailed results
+"""
+
+import pytest
+
+from domainbench.core.columnar import ColumnarSink, flatten_result, result_schema
+
+pa = pytest.importorskip("pyarrow")
+
+
+HEADER = {"benchmark_id": "bench", "benchmark_name": "Columnar", "timestamp": "2025-01-01T00:00:00"}
+
+
+def _comparison(model_a, model_b, winner, reason):
+    return {"model_a": model_a, "model_b": model_b, "winner_model": winner, "reasons": [reason]}
+
+
+def _result(test_id, capability, category, comparisons, models=("a", "b")):
+    return {
+        "test_id": test_id,
+        "capability": capability,
+        "category": category,
+        "responses": {
+            model: {"response": "text", "latency_ms": 10.0, "tokens": 5, "retries": 0}
+            for model in models
+        },
+        "comparisons": comparisons,
+    }
+
+
+RESULTS = [
+    _result("1", "chat", "menu", [_comparison("a", "b", "a", "clearer")]),
+    _result("2", "tools", "orders", [_comparison("a", "b", "tie", "same")]),
+    _result("3", "chat", "menu", [_comparison("a", "b", "b", "friendlier")]),
+    _result("4", "chat", "allergies", [_comparison("a", "b", "a", "safer")]),
+    _result("5", "tools", "orders", [_comparison("a", "b", "b", "correct call")]),
+]
+
+
+def _read(path, fmt):
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        
+        parquet = pq.ParquetFile(str(path))
+        groups = [parquet.read_row_group(i) for i in range(parquet.num_row_groups)]
+        return parquet.schema_arrow, groups
+    with pa.ipc.open_file(str(path)) as reader:
+        batches = [reader.get_batch(i) for i in range(reader.num_record_batches)]
+        return reader.schema, [pa.Table.from_batches([batch]) for batch in batches]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_round_trip_keeps_schema_and_one_category_per_row_group(tmp_path, fmt):
+    path = tmp_path / f"results.{fmt}"
+    sink = ColumnarSink(str(path), fmt=fmt, row_group_size=3)
+    sink.open(HEADER)
+    for result in RESULTS:
+        sink.write(result)
+    assert sink.close({}) == str(path)
+    
+    schema, groups = _read(path, fmt)
+    assert schema.remove_metadata().equals(result_schema())
+    assert schema.metadata[b"benchmark_id"] == b"bench"
+    
+    for group in groups:
+        keys = zip(group.column("capability").to_pylist(), group.column("category").to_pylist())
+        assert len(set(keys)) == 1
+    
+    rows = [row for group in groups for row in group.to_pylist()]
+    assert len(rows) == 2 * len(RESULTS)
+    by_key = {(row["test_id"], row["model"]): row for row in rows}
+    assert by_key[("1", "a")]["winner"] == "a"
+    assert (by_key[("1", "a")]["wins"], by_key[("1", "b")]["losses"]) == (1, 1)
+    assert by_key[("2", "b")]["winner"] == "tie"
+    assert by_key[("2", "b")]["ties"] == 1
+    assert by_key[("3", "a")]["judge_reasons"] == ["friendlier"]
+    assert by_key[("5", "b")]["winner"] == "b"
+
+
+def test_winner_is_the_model_with_the_most_wins():
+    comparisons = [
+        _comparison("a", "b", "a", "x"),
+        _comparison("a", "c", "a", "y"),
+        _comparison("b", "c", "c", "z"),
+    ]
+    rows = flatten_result(_result("1", "chat", "menu", comparisons, models=("a", "b", "c")))
+    assert {row["winner"] for row in rows} == {"a"}
+    records = [(row["wins"], row["ties"], row["losses"]) for row in rows]
+    assert records == [(2, 0, 0), (0, 0, 2), (1, 0, 1)]
+    assert rows[0]["judge_reasons"] == ["x", "y"]
+
+
+def test_shared_top_wins_is_a_tie():
+    comparisons = [
+        _comparison("a", "b", "a", "x"),
+        _comparison("b", "c", "b", "y"),
+        _comparison("a", "c", "tie", "z"),
+    ]
+    rows = flatten_result(_result("1", "chat", "menu", comparisons, models=("a", "b", "c")))
+    assert {row["winner"] for row in rows} == {"tie"}
+    assert [row["ties"] for row in rows] == [1, 0, 1]
@@ -0,0 +1,108 @@
+"""
+Tests for pricing, spend tracking and the run budget
+"""
+
+import json
+
+import pytest
+
+from domainbench.core.cost import CostStats, PriceTable
+from domainbench.core.engine import BenchmarkEngine
+from domainbench.core.planner import CaseCostEstimator, plan_run
+from domainbench.testing.loadtest import load_test_config
+
+
+# USD per million tokens for every simulated model and the judge
+SIMULATED_PRICES = {
+    "simulated/m": {"input": 1.0, "output": 4.0},
+    "simulated/judge": {"input": 2.0, "output": 8.0},
+}
+
+
+def _write_dataset(path, cases=12):
+    from domainbench.domains.builtin.restaurant_waiter import generate_test_cases
+    
+    with open(path, "w", encoding="utf-8") as f:
+        for item in generate_test_cases(cases, 42):
+            f.write(json.dumps(item) + "\n")
+
+
+def _config(tmp_path, workers=4, mode="threads"):
+    config = load_test_config(workers, str(tmp_path / "results"), mode=mode)
+    config.output.checkpoint = False
+    config.metrics.prices = SIMULATED_PRICES
+    return config
+
+
+def test_in_flight_cases_are_charged_at_their_estimate_before_any_finish():
+    stats = CostStats("v1", budget=1.0)
+    for _ in range(3):
+        assert stats.allows(0.3)
+        stats.schedule(0.3)
+    # Nothing has been spent, but three cases at $0.30 are already in flight
+    assert stats.total == 0.0
+    assert not stats.allows(0.3)
+    
+    # Once cases finish, their observed average takes over
+    stats.record({"responses": {"a": {"cost_usd": 0.1}}, "comparisons": []})
+    stats.finished = 1
+    assert stats.allows(0.3)
+    
+    assert CostStats("v1").allows(100.0)
+
+
+def test_estimate_matches_the_plan(tmp_path):
+    dataset = tmp_path / "dataset.jsonl"
+    _write_dataset(dataset, cases=5)
+    config = _config(tmp_path)
+    
+    estimate = CaseCostEstimator(config, PriceTable(config.metrics.prices))
+    with open(dataset, encoding="utf-8") as f:
+        total = sum(estimate(idx, json.loads(line)) for idx, line in enumerate(f))
+    assert total > 0
+    assert total == pytest.approx(plan_run(config, str(dataset))["total"]["cost_usd"], abs=1e-4)
+    
+    # Unpriced roles count as free
+    config.metrics.prices = {"simulated/judge": SIMULATED_PRICES["simulated/judge"]}
+    judge_only = CaseCostEstimator(config, PriceTable(config.metrics.prices))
+    with open(dataset, encoding="utf-8") as f:
+        case = json.loads(f.readline())
+    assert 0 < judge_only(0, case) < estimate(0, case)
+
+
+@pytest.mark.parametrize("mode", ["threads", "async"])
+def test_budget_holds_before_the_first_case_finishes(tmp_path, mode):
+    dataset = tmp_path / "dataset.jsonl"
+    _write_dataset(dataset)
+    config = _config(tmp_path, mode=mode)
+    
+    with open(dataset, encoding="utf-8") as f:
+        case = json.loads(f.readline())
+    per_case = CaseCostEstimator(config, PriceTable(config.metrics.prices))(0, case)
+    config.settings.budget = 2.5 * per_case
+    
+    engine = BenchmarkEngine(config)
+    if mode == "async":
+        import asyncio
+        
+        results = asyncio.run(engine.arun(str(dataset), verbose=False))
+    else:
+        results = engine.run(str(dataset), verbose=False)
+    budget = results["summary"]["cost"]["budget"]
+    
+    # With 4 workers, up to 8 cases used to be pulled before any cost was known
+    assert budget["stopped"]
+    assert budget["cases_run"] == 2
+    assert engine.cost_stats.scheduled == budget["cases_run"]
+
+
+def test_budget_refuses_unpriced_models(tmp_path):
+    config = _config(tmp_path)
+    config.metrics.prices = {"simulated/m": SIMULATED_PRICES["simulated/m"]}
+    config.settings.budget = 1.0
+    with pytest.raises(ValueError, match="simulated/judge"):
+        BenchmarkEngine(config).setup()
+    
+    # Without a budget, unpriced models are only listed in the summary
+    config.settings.budget = None
+    BenchmarkEngine(config).setup()
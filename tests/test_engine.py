@@ -0,0 +1,39 @@
+"""
+Tests for the benchmark engine's run lifecycle
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from domainbench.core.engine import BenchmarkEngine
+from domainbench.providers.clients import ClientRegistry
+from domainbench.testing.loadtest import load_test_config
+
+
+def test_async_pools_are_closed_when_a_run_fails(tmp_path, monkeypatch):
+    from domainbench.domains.builtin.restaurant_waiter import generate_test_cases
+    
+    dataset = tmp_path / "dataset.jsonl"
+    with open(dataset, "w", encoding="utf-8") as f:
+        for item in generate_test_cases(3, 42):
+            f.write(json.dumps(item) + "\n")
+    
+    closed = []
+    
+    async def aclose(self):
+        closed.append(self)
+    
+    def fail(*args):
+        raise RuntimeError("sink failed")
+    
+    monkeypatch.setattr(ClientRegistry, "aclose", aclose)
+    config = load_test_config(2, str(tmp_path / "results"))
+    config.output.checkpoint = False
+    engine = BenchmarkEngine(config)
+    monkeypatch.setattr(engine, "_record_result", fail)
+    
+    with pytest.raises(RuntimeError, match="sink failed"):
+        asyncio.run(engine.arun(str(dataset), verbose=False))
+    assert closed == [engine.clients]
@@ -0,0 +1,116 @@
+"""
+Tests for the judge evaluator's sync and async paths
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import domainbench.core  # noqa: F401 - loaded before the providers package, as the CLI does
+from domainbench.core.evaluator import JudgeEvaluator
+from domainbench.providers.base import BaseProvider
+
+
+def _verdict(winner, score_a=7, score_b=5):
+    return {"winner": winner, "score_A": score_a, "score_B": score_b, "reasons": [f"{winner} wins"]}
+
+
+class ScriptedJudge(BaseProvider):
+    """Answers judge calls with the queued outputs in order"""
+    
+    name = "scripted"
+    
+    def __init__(self, outputs):
+        super().__init__()
+        self.outputs = list(outputs)
+        self.calls = []
+    
+    def _next(self, messages):
+        self.calls.append(len(messages))
+        return {"content": self.outputs.pop(0), "usage": {"total_tokens": 10}, "retries": 1}
+    
+    def chat_completion(self, model, messages, temperature=0.2, max_tokens=None, **kwargs):
+        return self._next(messages)
+    
+    async def achat_completion(self, model, messages, temperature=0.2, max_tokens=None, **kwargs):
+        return self._next(messages)
+
+
+def _evaluate(judge, use_async, strategy="swap"):
+    evaluator = JudgeEvaluator(judge, "judge", strategy=strategy)
+    if use_async:
+        return asyncio.run(evaluator.aevaluate_pair(["Menu?"], "first", "second"))
+    return evaluator.evaluate_pair(["Menu?"], "first", "second")
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_nudges_until_the_judge_returns_json(use_async):
+    judge = ScriptedJudge(["not json", json.dumps(_verdict("A")), json.dumps(_verdict("B"))])
+    result = _evaluate(judge, use_async)
+    
+    # The nudge resends the conversation with the bad output and a follow-up
+    assert judge.calls == [1, 3, 1]
+    assert result["winner"] == "A"
+    assert result["retries"] == 3
+    assert result["usage"]["total_tokens"] == 30
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_unparseable_output_falls_back_to_a_tie(use_async):
+    judge = ScriptedJudge(["nope"] * 6)
+    result = _evaluate(judge, use_async)
+    assert result["winner"] == "tie"
+    assert "not parseable" in result["reasons"][0]
+    assert judge.outputs == []
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_single_strategy_reads_both_orderings_from_one_call(use_async):
+    dual = {
+        "comparison_1": {"winner": "A", "score_A": 8, "score_B": 4},
+        "comparison_2": {"winner": "B", "score_A": 3, "score_B": 9},
+        "reasons": ["first is clearer"],
+    }
+    judge = ScriptedJudge(["```json\n" + json.dumps(dual) + "\n```"])
+    result = _evaluate(judge, use_async, strategy="single")
+    assert judge.calls == [1]
+    assert result["winner"] == "A"
+    assert (result["score_A"], result["score_B"]) == (8.5, 3.5)
+    assert result["reasons"] == ["first is clearer"]
+
+
+def test_fan_out_runs_swap_concurrently_and_says_so(tmp_path):
+    from domainbench.core.engine import BenchmarkEngine
+    from domainbench.core.evaluator import resolve_judge_strategy
+    from domainbench.domains.builtin.restaurant_waiter import generate_test_cases
+    from domainbench.testing.loadtest import load_test_config
+    
+    assert resolve_judge_strategy("swap", fan_out=True) == "concurrent"
+    assert resolve_judge_strategy("swap", fan_out=False) == "swap"
+    assert resolve_judge_strategy("single", fan_out=True) == "single"
+    
+    dataset = tmp_path / "dataset.jsonl"
+    with open(dataset, "w", encoding="utf-8") as f:
+        for item in generate_test_cases(3, 42):
+            f.write(json.dumps(item) + "\n")
+    
+    config = load_test_config(4, str(tmp_path / "results"), models=3, mode="threads")
+    config.output.checkpoint = False
+    engine = BenchmarkEngine(config)
+    engine.setup()
+    # Up to models x workers pairs are judged at once, each handing off one ordering
+    assert engine.evaluator.max_workers == 12
+    
+    judge = engine.run(str(dataset), verbose=False)["summary"]["judge"]
+    assert judge["strategy"] == "concurrent"
+    assert judge["requested_strategy"] == "swap"
+    assert list(judge["methods"]) == ["concurrent"]
+    
+    config.settings.fan_out = False
+    engine = BenchmarkEngine(config)
+    engine.setup()
+    assert engine.evaluator.max_workers == 4
+    judge = engine.run(str(dataset), verbose=False)["summary"]["judge"]
+    assert judge["strategy"] == "swap"
+    assert "requested_strategy" not in judge
@@ -0,0 +1,122 @@
+"""
+Tests for streaming datasets with offsets, shards and the line-count index
+"""
+
+import json
+import os
+
+import pytest
+
+from domainbench.domains import loader
+from domainbench.domains.loader import (
+    dataset_index_path, dataset_range, iter_dataset, load_dataset_index, parse_shard
+)
+
+
+def _write(path, count, blank_every=0):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({"id": f"case_{i}"}) + "\n")
+            if blank_every and i % blank_every == 0:
+                f.write("\n")
+
+
+@pytest.fixture
+def small_stride(monkeypatch):
+    """Index every 4th item so seeks land mid-block in small files"""
+    monkeypatch.setattr(loader, "INDEX_STRIDE", 4)
+
+
+def test_parse_shard():
+    assert parse_shard("0/4") == (0, 4)
+    assert parse_shard("3/4") == (3, 4)
+    for bad in ("4/4", "-1/4", "1/0", "a/b", "1"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+
+def test_shards_partition_the_selection_contiguously(tmp_path):
+    path = tmp_path / "data.jsonl"
+    _write(path, 103)
+    
+    for offset in (0, 10):
+        ranges = [dataset_range(str(path), offset, shard=(i, 4)) for i in range(4)]
+        assert ranges[0][0] == offset
+        assert ranges[-1][1] == 103
+        assert all(stop == start for (_, stop), (start, _) in zip(ranges, ranges[1:]))
+        sizes = [stop - start for start, stop in ranges]
+        assert max(sizes) - min(sizes) <= 1
+
+
+def test_max_items_caps_the_shard_and_offset_is_clamped(tmp_path):
+    path = tmp_path / "data.jsonl"
+    _write(path, 100)
+    assert dataset_range(str(path), 0, max_items=10, shard="1/2") == (50, 60)
+    assert dataset_range(str(path), 500) == (100, 100)
+    assert list(iter_dataset(str(path), offset=500)) == []
+
+
+def test_offset_seeks_to_the_right_item(tmp_path, small_stride):
+    path = tmp_path / "data.jsonl"
+    _write(path, 30, blank_every=3)
+    
+    for offset in (0, 1, 3, 4, 5, 17, 29):
+        items = list(iter_dataset(str(path), offset=offset, max_items=3, with_index=True))
+        expected = list(range(offset, min(offset + 3, 30)))
+        assert [n for n, _ in items] == expected
+        assert [item["id"] for _, item in items] == [f"case_{n}" for n in expected]
+
+
+def test_shards_yield_every_item_exactly_once(tmp_path, small_stride):
+    path = tmp_path / "data.jsonl"
+    _write(path, 37, blank_every=5)
+    
+    ids = [item["id"] for i in range(3) for item in iter_dataset(str(path), shard=f"{i}/3")]
+    assert ids == [f"case_{n}" for n in range(37)]
+
+
+def test_index_is_never_written_next_to_the_dataset(tmp_path):
+    path = tmp_path / "data.jsonl"
+    _write(path, 10)
+    assert load_dataset_index(str(path))["items"] == 10
+    assert sorted(os.listdir(tmp_path)) == ["data.jsonl"]
+
+
+def test_index_dir_persists_the_index(tmp_path):
+    path = tmp_path / "data" / "data.jsonl"
+    path.parent.mkdir()
+    _write(path, 10)
+    index_dir = tmp_path / "indexes"
+    
+    assert dataset_range(str(path), shard="0/2", index_dir=str(index_dir)) == (0, 5)
+    stored = json.loads(dataset_index_path(str(path), str(index_dir)).read_text())
+    assert stored["items"] == 10
+    assert sorted(os.listdir(path.parent)) == ["data.jsonl"]
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    path = tmp_path / "data.jsonl"
+    index_dir = tmp_path / "indexes"
+    _write(path, 10)
+    assert load_dataset_index(str(path), str(index_dir))["items"] == 10
+    
+    _write(path, 25)
+    os.utime(path, ns=(0, 1))
+    assert load_dataset_index(str(path), str(index_dir))["items"] == 25
+    assert json.loads(dataset_index_path(str(path), str(index_dir)).read_text())["items"] == 25
+    
+    # A stale persisted index from another process is ignored too
+    loader._index_memo.clear()
+    index_path = dataset_index_path(str(path), str(index_dir))
+    index_path.write_text(
+        json.dumps({**json.loads(index_path.read_text()), "size": 1, "items": 999})
+    )
+    assert load_dataset_index(str(path), str(index_dir))["items"] == 25
+
+
+def test_unwritable_index_dir_still_returns_the_index(tmp_path):
+    path = tmp_path / "data.jsonl"
+    _write(path, 10)
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    assert load_dataset_index(str(path), str(blocker / "indexes"))["items"] == 10
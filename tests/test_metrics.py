@@ -0,0 +1,148 @@
+"""
+Tests for the streaming latency metrics and their per-model/per-category aggregation
+"""
+
+import json
+
+import pytest
+
+import domainbench.core  # noqa: F401 - loaded before the providers package, as the CLI does
+from domainbench.core.config import RetryConfig
+from domainbench.core.metrics import StreamStats, stream_metrics
+from domainbench.providers.base import BaseProvider, StreamTimer
+from domainbench.providers.ratelimit import RateLimiterRegistry, RateLimitedProvider
+from domainbench.providers.retry import RetryingProvider
+
+
+def _record(ttft, itl_mean=10.0, itl_p95=20.0, throughput=50.0):
+    return {
+        "ttft_ms": ttft,
+        "itl_mean_ms": itl_mean,
+        "itl_p95_ms": itl_p95,
+        "decode_tokens_per_sec": throughput,
+    }
+
+
+def test_stream_metrics_from_chunk_timings():
+    metrics = stream_metrics(
+        {"ttft_ms": 120.0, "gaps_ms": [10.0, 20.0, 30.0, 40.0], "chunks": 5}, 11
+    )
+    assert metrics["ttft_ms"] == 120.0
+    assert metrics["itl_mean_ms"] == 25.0
+    assert metrics["itl_p95_ms"] == pytest.approx(38.5)
+    # 10 tokens after the first over 100 ms of decoding
+    assert metrics["decode_tokens_per_sec"] == 100.0
+    
+    # Chunks stand in for tokens without usage; a single chunk has no decode phase
+    unmetered = stream_metrics({"ttft_ms": 5.0, "gaps_ms": [50.0], "chunks": 2}, None)
+    assert unmetered["decode_tokens_per_sec"] == 20.0
+    single = stream_metrics({"ttft_ms": 5.0, "gaps_ms": [], "chunks": 1}, 1)
+    assert (single["itl_mean_ms"], single["decode_tokens_per_sec"]) == (None, None)
+
+
+def test_stream_stats_aggregate_per_model_and_per_category():
+    stats = StreamStats()
+    for i in range(1, 11):
+        stats.record("a", "menu", _record(10.0 * i, itl_mean=10.0))
+        stats.record("a", "allergies", _record(100.0 + 10.0 * i, itl_mean=30.0))
+    stats.record("b", "menu", _record(50.0, throughput=80.0))
+    # Cache hits carry no stream timings
+    stats.record("b", "menu", {"latency_ms": 0.0})
+    
+    summary = stats.summary()
+    a = summary["models"]["a"]
+    assert a["responses"] == 20
+    assert a["ttft_ms_mean"] == pytest.approx(105.0, rel=0.01)
+    assert a["ttft_ms_p95"] == pytest.approx(190.0, rel=0.02)
+    assert a["itl_ms_mean"] == pytest.approx(20.0, rel=0.01)
+    assert summary["models"]["b"]["responses"] == 1
+    assert summary["models"]["b"]["decode_tokens_per_sec"] == pytest.approx(80.0, rel=0.01)
+    
+    menu = summary["by_category"]["menu"]
+    assert set(menu) == {"a", "b"}
+    assert menu["a"]["responses"] == 10
+    assert menu["a"]["ttft_ms_mean"] == pytest.approx(55.0, rel=0.01)
+    assert menu["a"]["itl_ms_mean"] == pytest.approx(10.0, rel=0.01)
+    allergies = summary["by_category"]["allergies"]
+    assert list(allergies) == ["a"]
+    assert allergies["a"]["ttft_ms_mean"] == pytest.approx(155.0, rel=0.01)
+    assert allergies["a"]["ttft_ms_p95"] == pytest.approx(190.0, rel=0.02)
+
+
+def test_stream_stats_without_streamed_responses_is_empty():
+    stats = StreamStats()
+    stats.record("a", "menu", {"latency_ms": 12.0})
+    assert stats.summary() is None
+
+
+class FlakyStream(BaseProvider):
+    """Streams two chunks once its first connection has failed"""
+    
+    name = "stream"
+    
+    def __init__(self):
+        super().__init__()
+        self.failed = False
+    
+    def chat_completion(self, model, messages, temperature=0.2, max_tokens=None, **kwargs):
+        raise NotImplementedError
+    
+    def stream_chat_completion(self, model, messages, temperature=0.2, max_tokens=None, **kwargs):
+        if not self.failed:
+            self.failed = True
+            raise ConnectionResetError()
+        timer = StreamTimer()
+        for text in ("Hello ", "there"):
+            timer.chunk(text)
+        return {"content": "Hello there", "usage": {}, "stream": timer.result()}
+
+
+def test_ttft_is_measured_from_the_answering_request_not_the_queue():
+    registry = RateLimiterRegistry()
+    registry.configure("stream", "m", rpm=300)  # one request per 0.2 s once the burst is spent
+    limiter = registry.get("stream", "m")
+    limiter.requests.reserve(limiter.requests.capacity - 1)
+    provider = RetryingProvider(
+        RateLimitedProvider(FlakyStream(), registry),
+        RetryConfig(initial_backoff=0.05, jitter=False),
+    )
+    
+    response = provider.stream_chat_completion("m", [{"role": "user", "content": "hi"}])
+    assert response["retries"] == 1
+    assert response["queue_seconds"] >= 0.1
+    assert response["stream"]["ttft_ms"] < 50
+    assert response["stream"]["ttft_ms"] <= response["latency_seconds"] * 1000
+
+
+def test_engine_reports_streaming_per_model_and_category(tmp_path):
+    from domainbench.core.engine import BenchmarkEngine
+    from domainbench.domains.builtin.restaurant_waiter import generate_test_cases
+    from domainbench.testing.loadtest import load_test_config
+    
+    cases = generate_test_cases(6, 42)
+    dataset = tmp_path / "dataset.jsonl"
+    with open(dataset, "w", encoding="utf-8") as f:
+        for item in cases:
+            f.write(json.dumps(item) + "\n")
+    
+    config = load_test_config(
+        1, str(tmp_path / "results"), profile="instant,latency=0.02", mode="threads"
+    )
+    config.settings.stream = True
+    config.output.checkpoint = False
+    results = BenchmarkEngine(config).run(str(dataset), verbose=False)
+    streaming = results["summary"]["streaming"]
+    
+    responses = len(cases) * len(config.capabilities)
+    assert set(streaming["models"]) == {"sim-0", "sim-1"}
+    for model, stats in streaming["models"].items():
+        assert stats["responses"] == responses
+        assert 0 < stats["ttft_ms_mean"] < 20
+        by_category = [group[model]["responses"] for group in streaming["by_category"].values()]
+        assert sum(by_category) == responses
+    
+    categories = {case.get("category", "unknown") for case in cases}
+    assert set(streaming["by_category"]) == categories
+    for result in results["detailed_results"]:
+        for response in result["responses"].values():
+            assert response["ttft_ms"] <= response["latency_ms"]
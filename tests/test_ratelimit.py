@@ -0,0 +1,271 @@
+"""
+Tests for the token-bucket rate limiter and concurrency caps
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import domainbench.core  # noqa: F401 - loaded before the providers package, as the CLI does
+from domainbench.providers import ratelimit
+from domainbench.providers.base import BaseProvider
+from domainbench.providers.ratelimit import (
+    ConcurrencyLimiter, RateLimiter, RateLimiterRegistry, RateLimitedProvider, TokenBucket
+)
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to (or when something sleeps on it)"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+    
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+    
+    async def asleep(self, seconds: float) -> None:
+        self.sleep(seconds)
+
+
+class EchoProvider(BaseProvider):
+    """Provider answering instantly, tracking how many calls overlap"""
+    
+    name = "echo"
+    
+    def __init__(self, total_tokens: int = 10, hold: float = 0.0):
+        super().__init__()
+        self.total_tokens = total_tokens
+        self.hold = hold
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+    
+    def _enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+    
+    def _exit(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+    
+    def chat_completion(self, model, messages, temperature=0.2, max_tokens=None, **kwargs):
+        self._enter()
+        if self.hold:
+            time.sleep(self.hold)
+        self._exit()
+        return {"content": "ok", "usage": {"total_tokens": self.total_tokens}}
+    
+    async def achat_completion(self, model, messages, temperature=0.2, max_tokens=None, **kwargs):
+        self._enter()
+        if self.hold:
+            await asyncio.sleep(self.hold)
+        self._exit()
+        return {"content": "ok", "usage": {"total_tokens": self.total_tokens}}
+
+
+def test_bucket_allows_a_full_burst_then_waits():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock)  # 1 token per second, burst of 60
+    
+    assert [bucket.reserve(1) for _ in range(60)] == [0.0] * 60
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    # Later callers queue behind the debt already taken
+    assert bucket.reserve(1) == pytest.approx(2.0)
+
+
+def test_bucket_refills_continuously_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(120, clock)  # 2 tokens per second
+    bucket.reserve(120)
+    
+    clock.advance(5)
+    assert bucket.reserve(10) == 0.0
+    assert bucket.reserve(1) == pytest.approx(0.5)
+    
+    clock.advance(3600)
+    bucket._refill()
+    assert bucket.tokens == bucket.capacity
+
+
+def test_bucket_caps_oversized_requests_and_refunds():
+    clock = FakeClock()
+    bucket = TokenBucket(100, clock)
+    
+    # A single request larger than the capacity waits for a full bucket, not forever
+    assert bucket.reserve(500) == 0.0
+    assert bucket.reserve(100) == pytest.approx(60.0)
+    
+    bucket.refund(100)
+    assert bucket.tokens == pytest.approx(0.0)
+
+
+def test_rate_limiter_sleeps_for_the_slower_budget(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "sleep", clock.sleep)
+    limiter = RateLimiter(rpm=60, tpm=600, clock=clock)
+    
+    limiter.acquire(600)
+    assert clock.sleeps == []
+    limiter.acquire(60)  # RPM is free, TPM needs 6 s of refill
+    assert clock.sleeps == [pytest.approx(6.0)]
+    assert limiter.wait_seconds == pytest.approx(6.0)
+
+
+def test_rate_limiter_reconciles_estimated_tokens():
+    clock = FakeClock()
+    limiter = RateLimiter(tpm=1000, clock=clock)
+    limiter.acquire(800)
+    limiter.reconcile(800, 200)
+    assert limiter.tokens.tokens == pytest.approx(800)
+
+
+def test_async_acquire_waits_without_blocking(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", clock.asleep)
+    limiter = RateLimiter(rpm=2, clock=clock)
+    
+    async def run():
+        for _ in range(3):
+            await limiter.aacquire(1)
+    
+    asyncio.run(run())
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+
+def test_registry_shares_limiters_and_keeps_the_tighter_limit():
+    registry = RateLimiterRegistry(clock=FakeClock())
+    registry.configure("openai", "gpt", rpm=100)
+    registry.configure("openai", "gpt", rpm=50, tpm=1000)
+    registry.configure_concurrency("openai", "gpt", 8)
+    registry.configure_concurrency("openai", "gpt", 4)
+    
+    limiter = registry.get("openai", "gpt")
+    assert (limiter.rpm, limiter.tpm) == (50, 1000)
+    assert registry.get("openai", "gpt") is limiter
+    assert registry.get_concurrency("openai", "gpt").limit == 4
+    assert registry.get("openai", "other") is None
+
+
+def test_concurrency_limiter_caps_threads():
+    provider = EchoProvider(hold=0.02)
+    registry = RateLimiterRegistry()
+    registry.configure_concurrency("echo", "m", 2)
+    limited = RateLimitedProvider(provider, registry)
+    
+    threads = [
+        threading.Thread(
+            target=limited.chat_completion, args=("m", [{"role": "user", "content": "hi"}])
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert provider.peak == 2
+
+
+def test_concurrency_limiter_caps_async_tasks():
+    provider = EchoProvider(hold=0.01)
+    registry = RateLimiterRegistry()
+    registry.configure_concurrency("echo", "m", 3)
+    limited = RateLimitedProvider(provider, registry)
+    
+    async def run():
+        messages = [{"role": "user", "content": "hi"}]
+        await asyncio.gather(*[limited.achat_completion("m", messages) for _ in range(10)])
+    
+    asyncio.run(run())
+    assert provider.peak == 3
+
+
+def test_limited_provider_reserves_estimate_and_reconciles(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "sleep", clock.sleep)
+    registry = RateLimiterRegistry(clock=clock)
+    registry.configure("echo", "m", tpm=1000)
+    limited = RateLimitedProvider(EchoProvider(total_tokens=50), registry)
+    
+    messages = [{"role": "user", "content": "x" * 400}]  # ~104 prompt tokens
+    limited.chat_completion("m", messages, max_tokens=100)
+    
+    # Only the 50 tokens actually used stay charged
+    assert registry.get("echo", "m").tokens.tokens == pytest.approx(950)
+    assert clock.sleeps == []
+
+
+def test_concurrency_limit_must_be_positive():
+    with pytest.raises(ValueError):
+        ConcurrencyLimiter(0)
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def _throttled(provider, wait=0.2, spare=0):
+    """Limit echo/m to one request per `wait` s, with its burst spent but for `spare` requests"""
+    registry = RateLimiterRegistry()
+    registry.configure("echo", "m", rpm=int(60 / wait))
+    limiter = registry.get("echo", "m")
+    limiter.requests.reserve(limiter.requests.capacity - spare)
+    return RateLimitedProvider(provider, registry)
+
+
+def test_latency_excludes_rate_limit_queueing():
+    limited = _throttled(EchoProvider(hold=0.02))
+    response = limited.chat_completion("m", [{"role": "user", "content": "hi"}])
+    assert 0.02 <= response["latency_seconds"] < 0.1
+    assert response["queue_seconds"] >= 0.15
+    
+    async def run():
+        limited = _throttled(EchoProvider(hold=0.02))
+        return await limited.achat_completion("m", [{"role": "user", "content": "hi"}])
+    
+    response = asyncio.run(run())
+    assert 0.02 <= response["latency_seconds"] < 0.1
+    assert response["queue_seconds"] >= 0.15
+
+
+def test_engine_latency_excludes_queueing_and_backoff(tmp_path):
+    from domainbench.capabilities import get_capability
+    from domainbench.core.config import RetryConfig
+    from domainbench.core.engine import BenchmarkEngine
+    from domainbench.providers.retry import RetryingProvider
+    from domainbench.testing.loadtest import load_test_config
+    
+    class FlakyEcho(EchoProvider):
+        """Drops its first connection, then answers after `hold` seconds"""
+        
+        failed = False
+        
+        def chat_completion(self, model, messages, temperature=0.2, max_tokens=None, **kwargs):
+            if not self.failed:
+                self.failed = True
+                raise ConnectionResetError()
+            return super().chat_completion(model, messages, temperature, max_tokens, **kwargs)
+    
+    engine = BenchmarkEngine(load_test_config(1, str(tmp_path), mode="threads"))
+    engine.setup()
+    model_config = next(iter(engine.model_configs.values())).model_copy(update={"model": "m"})
+    # The failing attempt goes straight out; the retry then queues for budget
+    provider = RetryingProvider(
+        _throttled(FlakyEcho(hold=0.02), spare=1), RetryConfig(initial_backoff=0.02, jitter=False)
+    )
+    test_case = {"id": "a", "turns": ["Is the soup vegan?"]}
+    
+    capability = get_capability("chat_completion")
+    record = engine._generate_response(provider, model_config, capability, test_case)
+    assert record["retries"] == 1
+    assert record["backoff_ms"] == pytest.approx(20.0)
+    assert record["queue_ms"] >= 150
+    assert 20 <= record["latency_ms"] < 100
@@ -0,0 +1,187 @@
+"""
+Tests for retry classification, Retry-After parsing and backoff
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+import domainbench.core  # noqa: F401 - loaded before the providers package, as the CLI does
+from domainbench.core.config import RetryConfig
+from domainbench.providers import retry
+from domainbench.providers.base import BaseProvider
+from domainbench.providers.retry import (
+    RetryingProvider,
+    RetryStats,
+    is_retryable,
+    retry_after_seconds,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class APIError(Exception):
+    """SDK-style error carrying an HTTP response"""
+    
+    def __init__(self, status_code=None, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = FakeResponse(status_code, headers)
+
+
+class APITimeoutError(Exception):
+    """Matched by class name, like the SDKs' transport errors"""
+
+
+class FlakyProvider(BaseProvider):
+    """Raises the queued errors in order, then succeeds"""
+    
+    name = "flaky"
+    
+    def __init__(self, errors):
+        super().__init__()
+        self.errors = list(errors)
+        self.calls = 0
+    
+    def _next(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"content": "ok", "usage": {}}
+    
+    def chat_completion(self, model, messages, temperature=0.2, max_tokens=None, **kwargs):
+        return self._next()
+    
+    async def achat_completion(self, model, messages, temperature=0.2, max_tokens=None, **kwargs):
+        return self._next()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of waiting"""
+    recorded = []
+    
+    async def asleep(seconds):
+        recorded.append(seconds)
+    
+    monkeypatch.setattr(retry.time, "sleep", recorded.append)
+    monkeypatch.setattr(retry.asyncio, "sleep", asleep)
+    return recorded
+
+
+@pytest.mark.parametrize("status", [408, 409, 425, 429, 500, 502, 503, 504, 529])
+def test_transient_statuses_are_retryable(status):
+    assert is_retryable(APIError(status))
+
+
+@pytest.mark.parametrize("status", [400, 401, 403, 404, 422])
+def test_client_errors_are_fatal(status):
+    assert not is_retryable(APIError(status))
+
+
+def test_transport_errors_and_wrapped_errors_are_retryable():
+    assert is_retryable(ConnectionResetError())
+    assert is_retryable(TimeoutError())
+    assert is_retryable(APITimeoutError())
+    assert not is_retryable(ValueError("bad json"))
+    
+    # Providers re-raise SDK errors; the cause decides
+    try:
+        try:
+            raise APIError(503)
+        except APIError as e:
+            raise RuntimeError("provider failed") from e
+    except RuntimeError as wrapped:
+        assert is_retryable(wrapped)
+
+
+def test_retry_after_seconds_and_milliseconds():
+    assert retry_after_seconds(APIError(429, {"retry-after": "7"})) == 7.0
+    assert retry_after_seconds(APIError(429, {"retry-after-ms": "1500", "retry-after": "7"})) == 1.5
+    assert retry_after_seconds(APIError(429, {"retry-after": "-3"})) == 0.0
+    assert retry_after_seconds(APIError(429, {"retry-after": "soon"})) is None
+    assert retry_after_seconds(APIError(429)) is None
+    assert retry_after_seconds(ValueError()) is None
+
+
+def test_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = retry_after_seconds(APIError(503, {"retry-after": format_datetime(when, usegmt=True)}))
+    assert 25 <= delay <= 31
+
+
+def test_backoff_grows_exponentially_up_to_the_cap():
+    provider = RetryingProvider(
+        FlakyProvider([]),
+        RetryConfig(initial_backoff=1.0, backoff_multiplier=2.0, max_backoff=5.0, jitter=False),
+    )
+    error = APIError(500)
+    delays = [provider.backoff_delay(attempt, error) for attempt in range(5)]
+    assert delays == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_jitter_stays_within_half_to_full_delay():
+    provider = RetryingProvider(FlakyProvider([]), RetryConfig(initial_backoff=4.0, jitter=True))
+    for _ in range(100):
+        assert 2.0 <= provider.backoff_delay(0, APIError(500)) <= 4.0
+
+
+def test_retry_after_is_preferred_but_capped_at_max_backoff():
+    provider = RetryingProvider(FlakyProvider([]), RetryConfig(max_backoff=60.0))
+    assert provider.backoff_delay(0, APIError(429, {"retry-after": "3"})) == 3.0
+    assert provider.backoff_delay(0, APIError(429, {"retry-after": "86400"})) == 60.0
+
+
+def test_retries_transient_errors_then_succeeds(sleeps):
+    stats = RetryStats()
+    inner = FlakyProvider([APIError(429, {"retry-after": "2"}), APIError(503)])
+    provider = RetryingProvider(
+        inner, RetryConfig(initial_backoff=1.0, jitter=False), stats=stats, provider_key="flaky"
+    )
+    
+    response = provider.chat_completion("m", [])
+    assert inner.calls == 3
+    assert sleeps == [2.0, 2.0]
+    assert response["retries"] == 2
+    assert response["backoff_seconds"] == 4.0
+    assert stats.summary()["flaky/m"] == {
+        "calls": 1,
+        "retries": 2,
+        "backoff_seconds": 4.0,
+        "failures": 0,
+    }
+
+
+def test_fatal_errors_are_raised_without_retrying(sleeps):
+    inner = FlakyProvider([APIError(401)])
+    provider = RetryingProvider(inner, RetryConfig())
+    with pytest.raises(APIError):
+        provider.chat_completion("m", [])
+    assert inner.calls == 1
+    assert sleeps == []
+
+
+def test_gives_up_after_max_retries(sleeps):
+    stats = RetryStats()
+    inner = FlakyProvider([APIError(500)] * 5)
+    provider = RetryingProvider(inner, RetryConfig(max_retries=2, jitter=False), stats=stats)
+    with pytest.raises(APIError):
+        provider.chat_completion("m", [])
+    assert inner.calls == 3
+    assert len(sleeps) == 2
+    assert stats.summary()["flaky/m"]["failures"] == 1
+
+
+def test_async_path_retries_with_the_same_policy(sleeps):
+    inner = FlakyProvider([APIError(429, {"retry-after": "600"})])
+    provider = RetryingProvider(inner, RetryConfig(max_backoff=30.0))
+    
+    response = asyncio.run(provider.achat_completion("m", []))
+    assert response["retries"] == 1
+    assert sleeps == [30.0]
@@ -0,0 +1,83 @@
+"""
+Tests for streaming results to the output formats
+"""
+
+import json
+import sqlite3
+
+from domainbench.core.config import OutputConfig
+from domainbench.core.engine import BenchmarkEngine
+from domainbench.core.sinks import strip_raw_responses
+from domainbench.testing.loadtest import load_test_config
+
+
+def _write_dataset(path, cases=4):
+    from domainbench.domains.builtin.restaurant_waiter import generate_test_cases
+    
+    with open(path, "w", encoding="utf-8") as f:
+        for item in generate_test_cases(cases, 42):
+            f.write(json.dumps(item) + "\n")
+
+
+def _run(tmp_path, **output):
+    dataset = tmp_path / "dataset.jsonl"
+    _write_dataset(dataset)
+    config = load_test_config(1, str(tmp_path / "results"), mode="threads")
+    config.output = OutputConfig(directory=str(tmp_path / "results"), checkpoint=False, **output)
+    engine = BenchmarkEngine(config)
+    return engine, engine.run(str(dataset), verbose=False)
+
+
+def test_strip_raw_responses_keeps_everything_but_the_text():
+    result = {
+        "test_id": "a",
+        "responses": {"m": {"response": "hello", "latency_ms": 5.0, "tokens": 3}},
+        "comparisons": [{"winner": "m"}],
+    }
+    stripped = strip_raw_responses(result)
+    assert stripped["responses"] == {"m": {"latency_ms": 5.0, "tokens": 3}}
+    assert stripped["comparisons"] == result["comparisons"]
+    assert result["responses"]["m"]["response"] == "hello"
+
+
+def test_library_runs_return_detailed_results(tmp_path):
+    _, results = _run(tmp_path, formats=["jsonl"])
+    assert len(results["detailed_results"]) == 4
+    for result in results["detailed_results"]:
+        assert all("response" in r for r in result["responses"].values())
+
+
+def test_results_are_persisted_without_raw_responses(tmp_path):
+    store = tmp_path / "results.db"
+    engine, results = _run(
+        tmp_path, formats=["jsonl"], include_raw_responses=False, store=str(store)
+    )
+    
+    with open(engine.output_paths[0], encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    streamed = [line for line in lines if "test_id" in line]
+    assert len(streamed) == 4
+    for result in streamed + results["detailed_results"]:
+        assert result["responses"]
+        assert all("response" not in r and "latency_ms" in r for r in result["responses"].values())
+    
+    with sqlite3.connect(store) as db:
+        assert db.execute("SELECT COUNT(DISTINCT test_id) FROM cases").fetchone()[0] == 4
+
+
+def test_streamed_summary_includes_tracing(tmp_path):
+    trace = tmp_path / "trace.json"
+    dataset = tmp_path / "dataset.jsonl"
+    _write_dataset(dataset)
+    config = load_test_config(1, str(tmp_path / "results"), mode="threads")
+    config.output.formats = ["json"]
+    config.output.checkpoint = False
+    config.tracing.chrome_trace = str(trace)
+    engine = BenchmarkEngine(config)
+    engine.run(str(dataset), verbose=False)
+    
+    assert engine.output_paths[-1] == str(trace)
+    with open(engine.output_paths[0], encoding="utf-8") as f:
+        document = json.load(f)
+    assert document["summary"]["tracing"]["spans"] > 0
+    assert document["summary"]["tracing"]["chrome_trace"] == str(trace)
@@ -0,0 +1,111 @@
+"""
+Tests for the SQLite result store and streaming runs into it
+"""
+
+from domainbench.core.store import ResultStore, StoreSink
+
+
+HEADER = {
+    "benchmark_id": "bench_1",
+    "benchmark_name": "Waiter",
+    "timestamp": "2025-01-01T00:00:00",
+    "config": {"domain": "restaurant_waiter"},
+}
+
+
+def _result(i, winner="a"):
+    return {
+        "test_id": f"case_{i}",
+        "category": "menu",
+        "capability": "chat",
+        "responses": {
+            "a": {"latency_ms": 100.0, "tokens": 5},
+            "b": {"latency_ms": 300.0, "tokens": 7},
+        },
+        "comparisons": [{"model_a": "a", "model_b": "b", "winner_model": winner, "reasons": []}],
+    }
+
+
+def _footer(results):
+    wins = sum(1 for r in results if r["comparisons"][0]["winner_model"] == "a")
+    return {
+        "duration_seconds": 1.0,
+        "summary": {
+            "total_test_cases": len(results),
+            "overall_winner": "a",
+            "models": {
+                "a": {"total_wins": wins, "total_ties": 0, "total_losses": len(results) - wins},
+                "b": {"total_wins": len(results) - wins, "total_ties": 0, "total_losses": wins},
+            },
+        },
+    }
+
+
+def _counts(path):
+    with ResultStore(str(path)) as store:
+        runs = store.conn.execute("SELECT COUNT(*), SUM(complete) FROM runs").fetchone()
+        cases = store.conn.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+    return runs[0], runs[1], cases
+
+
+def test_sink_commits_periodically_while_streaming(tmp_path):
+    path = tmp_path / "store.db"
+    sink = StoreSink(str(path), commit_every=2)
+    sink.open(HEADER)
+    for i in range(5):
+        sink.write(_result(i))
+    
+    # A second connection sees the committed batches, but not the pending result
+    assert _counts(path) == (1, 0, 8)
+    with ResultStore(str(path)) as store:
+        assert store.runs() == []
+        assert store.model_history("a") == []
+    
+    sink.close(_footer([_result(i) for i in range(5)]))
+    assert _counts(path) == (1, 1, 10)
+
+
+def test_resumed_run_replaces_the_interrupted_copy(tmp_path):
+    path = tmp_path / "store.db"
+    interrupted = StoreSink(str(path), commit_every=1)
+    interrupted.open(HEADER)
+    for i in range(3):
+        interrupted.write(_result(i))
+    interrupted._store.close()
+    assert _counts(path) == (1, 0, 6)
+    
+    # The resumed run streams the journaled results again, then the rest
+    results = [_result(i, winner="a" if i % 2 else "b") for i in range(6)]
+    resumed = StoreSink(str(path), commit_every=1)
+    resumed.open(HEADER)
+    for result in results:
+        resumed.write(result)
+    resumed.close(_footer(results))
+    
+    assert _counts(path) == (1, 1, 12)
+    with ResultStore(str(path)) as store:
+        [run] = store.runs()
+        assert run["benchmark_id"] == "bench_1"
+        assert run["total_test_cases"] == 6
+        assert store.model_history("a")[0]["wins"] == 3
+
+
+def test_incomplete_runs_are_left_out_of_queries(tmp_path):
+    path = tmp_path / "store.db"
+    sink = StoreSink(str(path))
+    sink.open(HEADER)
+    sink.write(_result(0))
+    sink.close(_footer([_result(0)]))
+    
+    with ResultStore(str(path)) as store:
+        assert store.latency_by_model(["a", "b"]) == {
+            "a": {"latency_ms": 100.0, "responses": 1},
+            "b": {"latency_ms": 300.0, "responses": 1},
+        }
+        assert len(store.model_history("a", category="menu")) == 1
+        
+        store.conn.execute("UPDATE runs SET complete = 0")
+        assert store.latency_by_model(["a", "b"]) == {}
+        assert store.runs() == []
+        assert store.model_history("a") == []
+        assert store.model_history("a", category="menu") == []
@@ -0,0 +1,176 @@
+"""
+Tests for pairwise scheduling, adaptive stopping and ratings
+"""
+
+import math
+import random
+
+import pytest
+
+from domainbench.core.config import AdaptiveConfig
+from domainbench.core.tournament import PairScheduler, Tournament, wilson_interval
+
+
+MODELS = ["a", "b", "c", "d"]
+
+
+@pytest.mark.parametrize(
+    "successes, n, expected",
+    [
+        (5, 10, (0.2366, 0.7634)),
+        (0, 10, (0.0, 0.2775)),
+        (10, 10, (0.7225, 1.0)),
+        (50, 100, (0.4038, 0.5962)),
+    ],
+)
+def test_wilson_interval_known_values(successes, n, expected):
+    low, high = wilson_interval(successes, n, 0.95)
+    assert low == pytest.approx(expected[0], abs=1e-4)
+    assert high == pytest.approx(expected[1], abs=1e-4)
+
+
+def test_wilson_interval_without_observations_is_uninformative():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_wilson_interval_narrows_with_confidence():
+    low_90, high_90 = wilson_interval(7, 10, 0.90)
+    low_99, high_99 = wilson_interval(7, 10, 0.99)
+    assert low_99 < low_90 < 0.7 < high_90 < high_99
+
+
+def test_bradley_terry_orders_models_by_strength():
+    tournament = Tournament(["strong", "middle", "weak"])
+    for _ in range(8):
+        tournament.record("strong", "middle", "A")
+        tournament.record("middle", "weak", "A")
+        tournament.record("strong", "weak", "A")
+    for _ in range(2):
+        tournament.record("strong", "middle", "B")
+        tournament.record("middle", "weak", "B")
+    
+    ratings = tournament.bradley_terry()
+    assert ratings["strong"] > ratings["middle"] > ratings["weak"]
+
+
+def test_bradley_terry_keeps_undefeated_model_finite():
+    tournament = Tournament(["champion", "b", "c"])
+    for _ in range(20):
+        tournament.record("champion", "b", "A")
+        tournament.record("c", "champion", "B")
+    tournament.record("b", "c", "tie")
+    
+    ratings = tournament.bradley_terry()
+    assert all(math.isfinite(r) for r in ratings.values())
+    assert ratings["champion"] == max(ratings.values())
+    # Strengths are normalized to a geometric mean of 1, i.e. a mean rating of 1000
+    assert sum(ratings.values()) / len(ratings) == pytest.approx(1000.0, abs=0.5)
+
+
+def test_sampled_pairs_are_deterministic_per_case():
+    scheduler = PairScheduler(MODELS, schedule="sampled", pairs_per_case=2, seed=7)
+    again = PairScheduler(MODELS, schedule="sampled", pairs_per_case=2, seed=7)
+    
+    picks = {}
+    for case_id in (f"case_{i}" for i in range(20)):
+        pairs = scheduler.pairs_for(case_id, "chat_completion", "general")
+        assert pairs == scheduler.pairs_for(case_id, "chat_completion", "general")
+        assert pairs == again.pairs_for(case_id, "chat_completion", "general")
+        assert len(pairs) == 2
+        assert set(pairs) <= set(scheduler.all_pairs)
+        picks[case_id] = tuple(pairs)
+    
+    # Different cases draw different pairs
+    assert len(set(picks.values())) > 1
+
+
+def test_round_robin_schedules_every_pair():
+    scheduler = PairScheduler(MODELS)
+    assert len(scheduler.pairs_for("case_0", "chat_completion", "general")) == 6
+
+
+def test_pair_settles_after_min_comparisons_of_lopsided_verdicts():
+    adaptive = AdaptiveConfig(enabled=True, confidence=0.95, min_comparisons=10)
+    scheduler = PairScheduler(["a", "b", "c"], adaptive=adaptive)
+    
+    for i in range(9):
+        scheduler.observe("a", "b", "general", "A")
+        assert ("a", "b") in scheduler.pairs_for(f"case_{i}", "chat_completion", "general")
+    
+    scheduler.observe("a", "b", "general", "A")
+    pairs = scheduler.pairs_for("case_10", "chat_completion", "general")
+    assert ("a", "b") not in pairs
+    assert pairs == [("a", "c"), ("b", "c")]
+    
+    summary = scheduler.adaptive_summary()
+    assert summary["settled"]["a vs b"]["leader"] == "a"
+    assert summary["settled"]["a vs b"]["comparisons"] == 10
+    assert summary["skipped_comparisons"] == 1
+
+
+def test_even_pair_does_not_settle():
+    adaptive = AdaptiveConfig(enabled=True, min_comparisons=10)
+    scheduler = PairScheduler(["a", "b"], adaptive=adaptive)
+    for i in range(40):
+        scheduler.observe("a", "b", "general", "A" if i % 2 else "B")
+    assert scheduler.pairs_for("case_x", "chat_completion", "general") == [("a", "b")]
+
+
+def test_category_scope_settles_per_category():
+    adaptive = AdaptiveConfig(enabled=True, min_comparisons=5, scope="category")
+    scheduler = PairScheduler(["a", "b"], adaptive=adaptive)
+    for _ in range(10):
+        scheduler.observe("a", "b", "allergies", "B")
+    
+    assert scheduler.pairs_for("case_1", "chat_completion", "allergies") == []
+    assert scheduler.pairs_for("case_1", "chat_completion", "reservations") == [("a", "b")]
+
+
+def test_looks_are_predeclared_and_bonferroni_corrected():
+    adaptive = AdaptiveConfig(enabled=True, confidence=0.95, min_comparisons=10, max_looks=4)
+    scheduler = PairScheduler(["a", "b"], adaptive=adaptive)
+    assert scheduler.looks == [10, 20, 40, 80]
+    assert scheduler.look_confidence == pytest.approx(0.9875)
+    
+    # 8 of 10 is not yet settled at the first look
+    for winner in ["A"] * 8 + ["B"] * 2:
+        scheduler.observe("a", "b", "general", winner)
+    assert scheduler.pairs_for("case_10", "chat_completion", "general") == [("a", "b")]
+    
+    # 14 of 16 would settle if checked, but 16 is not a look
+    for _ in range(6):
+        scheduler.observe("a", "b", "general", "A")
+    assert scheduler.pairs_for("case_16", "chat_completion", "general") == [("a", "b")]
+    
+    for _ in range(4):
+        scheduler.observe("a", "b", "general", "A")
+    assert scheduler.pairs_for("case_20", "chat_completion", "general") == []
+    assert scheduler.adaptive_summary()["settled"]["a vs b"]["comparisons"] == 20
+
+
+def test_even_pairs_rarely_settle_across_all_looks():
+    """Under the null, the false-settle rate stays within 1 - confidence despite repeated looks"""
+    adaptive = AdaptiveConfig(enabled=True, confidence=0.9, min_comparisons=10, max_looks=5)
+    rng = random.Random(3)
+    trials = 400
+    settled = 0
+    for _ in range(trials):
+        scheduler = PairScheduler(["a", "b"], adaptive=adaptive)
+        for _ in range(scheduler.looks[-1]):
+            scheduler.observe("a", "b", "general", "A" if rng.random() < 0.5 else "B")
+        settled += bool(scheduler.adaptive_summary()["settled"])
+    assert settled / trials <= 0.1
+
+
+def test_sampled_pairing_requires_pairs_per_case():
+    with pytest.raises(ValueError, match="pairs_per_case"):
+        PairScheduler(MODELS, schedule="sampled")
+    with pytest.raises(ValueError, match="pairs_per_case"):
+        PairScheduler(MODELS, schedule="sampled", pairs_per_case=0)
+
+
+def test_invalid_adaptive_settings_are_refused():
+    with pytest.raises(ValueError, match="confidence"):
+        PairScheduler(MODELS, adaptive=AdaptiveConfig(enabled=True, confidence=1.0))
+    with pytest.raises(ValueError, match="max_looks"):
+        PairScheduler(MODELS, adaptive=AdaptiveConfig(enabled=True, max_looks=0))